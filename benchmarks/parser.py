@@ -0,0 +1,59 @@
+"""
+Microbenchmark for parse_response, which runs for every line the device sends. Reports the cost per line for
+typical lines:
+
+    python -m benchmarks.parser --output parser.json
+"""
+
+import argparse
+import json
+import platform
+import timeit
+
+from custom_components.yamaha_dsp.yamaha.response import parse_response
+
+from .protocol import git_revision
+
+LINES = {
+    "ok_get": "OK get MTX:Index_47 0 0 -1200\n",
+    "ok_set": 'OK set MTX:Index_47 0 0 -1200 "-12.00"\n',
+    "notify_set": 'NOTIFY set MTX:Index_47 0 0 -1200 "-12.00"\n',
+    "notify_meter": "NOTIFY mtr MTX:Index_60 level 71 71 70 6F 6E 6D 6C 6B\n",
+    "devinfo": 'OK devinfo devicename "Cafe and lobby"\n',
+    "error": "ERROR get UnknownAddress\n",
+}
+
+
+def measure(number: int, repeat: int) -> dict[str, float]:
+    results = {}
+
+    for name, line in LINES.items():
+        # The best of the repeats is the least disturbed by everything else running on the machine
+        best = min(timeit.repeat(lambda line=line: parse_response(line), number=number, repeat=repeat))
+        results[name] = best / number * 1e9
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cost of parsing device responses")
+    parser.add_argument("--number", type=int, default=20_000, help="lines parsed per measurement")
+    parser.add_argument("--repeat", type=int, default=15, help="measurements per line, the best one is reported")
+    parser.add_argument("--output", help="file to write the results to, defaults to stdout")
+    args = parser.parse_args()
+
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "ns_per_line": measure(args.number, args.repeat),
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Benchmarks for the protocol layer, run against the fake RCP server so that the numbers only depend on the code
+and the simulated network. Results are written as JSON so that runs can be compared between commits:
+
+    python -m benchmarks.protocol --output before.json
+    python -m benchmarks.protocol --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+
+from datetime import UTC, datetime
+
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.device import YamahaDspDevice
+from custom_components.yamaha_dsp.yamaha.scheduler import CommandPriority
+from tests.yamaha.fake_server import FakeRcpServer
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    # Milliseconds, which is what we reason about when picking timeouts and scan intervals
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    quantiles = statistics.quantiles(samples_ms, n=100, method="inclusive")
+
+    return {
+        "count": len(samples_ms),
+        "min_ms": samples_ms[0],
+        "p50_ms": quantiles[49],
+        "p90_ms": quantiles[89],
+        "p99_ms": quantiles[98],
+        "max_ms": samples_ms[-1],
+        "mean_ms": statistics.fmean(samples_ms),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class ProtocolBenchmark:
+    def __init__(self, args: argparse.Namespace):
+        self._args = args
+        self._server = FakeRcpServer(latency=args.latency, jitter=args.jitter, seed=args.seed)
+        self._device: YamahaDspDevice | None = None
+        self._parameters = [f"MTX:Index_{index}" for index in range(1, args.entities + 1)]
+
+        for parameter in self._parameters:
+            self._server.add_fader(parameter, value=-2000)
+
+    async def run(self) -> dict:
+        await self._server.start()
+        self._device = YamahaDspDevice(
+            self._server.host, self._server.port, timeout=self._args.timeout, pipeline_window=self._args.window
+        )
+
+        try:
+            connect_started = time.perf_counter()
+            self._device.start()
+            await self.wait_until_connected()
+            connect_time = time.perf_counter() - connect_started
+
+            return {
+                "connect_ms": connect_time * 1000,
+                "round_trip": await self.round_trip(),
+                "throughput": await self.throughput(),
+                "product_information": await self.product_information(),
+                "poll": await self.poll(),
+                "interactive_during_poll": await self.interactive_during_poll(),
+                "reconnect": await self.reconnect(),
+            }
+        finally:
+            await self._device.stop()
+            await self._server.stop()
+
+    async def wait_until_connected(self):
+        while not self._device.connected:
+            await asyncio.sleep(0.001)
+
+    async def round_trip(self) -> dict:
+        # One command at a time, so this is the latency of a single command
+        samples = []
+        for i in range(self._args.commands):
+            started = time.perf_counter()
+            await self._device.query_parameter_raw(self._parameters[i % len(self._parameters)])
+            samples.append(time.perf_counter() - started)
+
+        return percentiles(samples)
+
+    async def throughput(self) -> dict:
+        # As many commands in flight as the callers can produce, like several entities being updated at once
+        completed = 0
+        deadline = time.perf_counter() + self._args.duration
+
+        async def worker(worker_index: int):
+            nonlocal completed
+            while time.perf_counter() < deadline:
+                await self._device.query_parameter_raw(self._parameters[worker_index % len(self._parameters)])
+                completed += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[worker(i) for i in range(self._args.concurrency)])
+        elapsed = time.perf_counter() - started
+
+        return {
+            "concurrency": self._args.concurrency,
+            "commands": completed,
+            "commands_per_second": completed / elapsed,
+        }
+
+    async def product_information(self) -> dict:
+        samples = []
+        for _ in range(self._args.repeats):
+            started = time.perf_counter()
+            await self._device.query_product_information()
+            samples.append(time.perf_counter() - started)
+
+        return percentiles(samples)
+
+    async def poll(self) -> dict:
+        # What the coordinator does on every scan interval
+        parameters = [(ParameterValueType.NORMALIZED, parameter) for parameter in self._parameters]
+
+        samples = []
+        for _ in range(self._args.repeats):
+            started = time.perf_counter()
+            await self._device.query_parameters(parameters)
+            samples.append(time.perf_counter() - started)
+
+        return {"entities": len(parameters), **percentiles(samples)}
+
+    async def interactive_during_poll(self) -> dict:
+        # A user pressing mute while the coordinator polls, the write shouldn't wait for the whole poll
+        parameters = [(ParameterValueType.NORMALIZED, parameter) for parameter in self._parameters]
+
+        samples = []
+        for i in range(self._args.repeats):
+            poll = asyncio.create_task(self._device.query_parameters(parameters, CommandPriority.BACKGROUND))
+            await asyncio.sleep(0)
+
+            started = time.perf_counter()
+            await self._device.set_parameter_raw(self._parameters[0], "0", "0", str(-1000 - i))
+            samples.append(time.perf_counter() - started)
+            await poll
+
+        return {"entities": len(parameters), **percentiles(samples)}
+
+    async def reconnect(self) -> dict:
+        # Time from the connection being reset until a command succeeds again
+        samples = []
+        failed_commands = 0
+
+        for _ in range(self._args.reconnects):
+            self._server.reset_connections()
+            started = time.perf_counter()
+
+            while True:
+                try:
+                    await self._device.query_parameter_raw(self._parameters[0])
+                    break
+                except RuntimeError:
+                    failed_commands += 1
+                    await self.wait_until_connected()
+
+            samples.append(time.perf_counter() - started)
+
+        return {"failed_commands": failed_commands, **percentiles(samples)}
+
+
+def compare(results: dict, baseline: dict, prefix: str = ""):
+    for key, value in results.items():
+        baseline_value = baseline.get(key)
+        if isinstance(value, dict) and isinstance(baseline_value, dict):
+            compare(value, baseline_value, f"{prefix}{key}.")
+        elif isinstance(value, float) and isinstance(baseline_value, int | float) and baseline_value:
+            change = (value - baseline_value) / baseline_value * 100
+            print(f"{prefix + key:<40} {baseline_value:>12.3f} {value:>12.3f} {change:>+8.1f}%")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Yamaha DSP protocol layer against a fake device")
+    parser.add_argument("--latency", type=float, default=0.002, help="simulated one-way reply latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0005, help="random +/- seconds added to the latency")
+    parser.add_argument("--window", type=int, default=8, help="pipeline window of the device")
+    parser.add_argument("--timeout", type=float, default=5, help="command timeout of the device")
+    parser.add_argument("--entities", type=int, default=50, help="number of parameters to poll")
+    parser.add_argument("--commands", type=int, default=500, help="commands for the round-trip benchmark")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent callers in the throughput benchmark")
+    parser.add_argument("--duration", type=float, default=3, help="seconds to run the throughput benchmark for")
+    parser.add_argument("--repeats", type=int, default=20, help="repeats of the product information and poll runs")
+    parser.add_argument("--reconnects", type=int, default=5, help="number of forced connection resets")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="file to write the results to, defaults to stdout")
+    parser.add_argument("--compare", help="results of an earlier run to compare with")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": await ProtocolBenchmark(args).run(),
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        print(f"{'':<40} {baseline['revision'] or 'baseline':>12} {results['revision'] or 'current':>12}")
+        compare(results["results"], baseline["results"])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
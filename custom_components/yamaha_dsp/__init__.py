@@ -2,6 +2,7 @@ import json
 import logging
 import re
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 from enum import Enum
 
@@ -9,10 +10,30 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.device_registry import DeviceInfo
-
-from custom_components.yamaha_dsp.const import DOMAIN
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
+
+from custom_components.yamaha_dsp.const import (
+    DEFAULT_KEEPALIVE_INTERVAL,
+    DEFAULT_METER_UPDATE_INTERVAL,
+    DEFAULT_PIPELINE_WINDOW,
+    DEFAULT_POLL_BUDGET,
+    DEFAULT_SIGNAL_THRESHOLD_DB,
+    DOMAIN,
+    OPTION_IMPORTED_CONFIGURATION,
+    SIGNAL_CONFIGURATION_UPDATED,
+)
+from custom_components.yamaha_dsp.coordinator import YamahaDspCoordinator, YamahaDspMeterCoordinator
+from custom_components.yamaha_dsp.registry import ParameterRegistry, ParameterRole
+from custom_components.yamaha_dsp.services import async_setup_services
+from custom_components.yamaha_dsp.storage import YamahaDspStore
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
 from custom_components.yamaha_dsp.yamaha.device import ProductInformation, YamahaDspDevice
+from custom_components.yamaha_dsp.yamaha.fader import FADER_10DB, FADER_CURVES, FaderCurve
+from custom_components.yamaha_dsp.yamaha.meter import METER_CHANNELS
+from custom_components.yamaha_dsp.yamaha.response import ResponseError
 
 
 @dataclass
@@ -22,6 +43,13 @@ class SpeakerConfiguration:
     index_volume: int
     index_mute: int
     available_inputs: list[str]
+    fader: FaderCurve = FADER_10DB
+
+
+@dataclass
+class SpeakerGroupConfiguration:
+    name: str
+    speakers: list[SpeakerConfiguration]
 
 
 @dataclass
@@ -29,6 +57,7 @@ class SourceConfiguration:
     name: str
     index_volume: int
     index_mute: int
+    fader: FaderCurve = FADER_10DB
 
 
 @dataclass
@@ -50,29 +79,73 @@ class RouterConfiguration:
     sources: list[RouterSourceConfiguration]
 
 
+@dataclass
+class SceneParameterConfiguration:
+    index: int
+    value: str
+    value_type: ParameterValueType
+
+
+@dataclass
+class SceneConfiguration:
+    name: str
+    parameters: list[SceneParameterConfiguration]
+
+
+@dataclass
+class MeterConfiguration:
+    name: str
+    index: int
+    # Channels of the meter that belong to the zone, numbered from 1
+    channels: list[int]
+    signal_threshold: float
+
+
 @dataclass
 class DspConfiguration:
     speakers: [SpeakerConfiguration]
+    speaker_groups: [SpeakerGroupConfiguration]
     sources: [SourceConfiguration]
     routes: [RouteConfiguration]
     routers: [RouterConfiguration]
+    scenes: [SceneConfiguration]
+    meters: [MeterConfiguration]
+    meter_update_interval: float
+    poll_budget: float
+    # Compiled from everything above
+    registry: ParameterRegistry
 
     def __init__(self):
         self.speakers = []
+        self.speaker_groups = []
         self.sources = []
         self.routes = []
         self.routers = []
+        self.scenes = []
+        self.meters = []
+        self.meter_update_interval = DEFAULT_METER_UPDATE_INTERVAL
+        self.poll_budget = DEFAULT_POLL_BUDGET
+        self.registry = ParameterRegistry()
 
 
 class EntityType(Enum):
     SPEAKER = "speaker"
+    SPEAKER_GROUP = "speaker_group"
     SOURCE = "source"
     ROUTE = "route"
     ROUTER = "router"
+    METER = "meter"
 
 
-PLATFORMS: list[Platform] = [Platform.MEDIA_PLAYER, Platform.SWITCH, Platform.SELECT]
+PLATFORMS: list[Platform] = [
+    Platform.MEDIA_PLAYER,
+    Platform.SWITCH,
+    Platform.SELECT,
+    Platform.SENSOR,
+    Platform.BINARY_SENSOR,
+]
 UNIQUE_ID_REGEXP = re.compile(r"[\s+]")
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 logger = logging.getLogger(__name__)
 
@@ -84,11 +157,18 @@ def create_unique_id(name: str, entity_type: EntityType) -> str:
     return id
 
 
+def configured_items(options, option: str) -> Iterator[dict]:
+    # Entities entered one by one are JSON strings, imported ones are stored as they are
+    for item in options.get(option) or []:
+        yield json.loads(item)
+
+    yield from (options.get(OPTION_IMPORTED_CONFIGURATION) or {}).get(option) or []
+
+
 def create_dsp_configuration(options) -> DspConfiguration:
     dsp_configuration = DspConfiguration()
 
-    for speaker_configuration in options.get("speaker_configuration") or []:
-        parsed = json.loads(speaker_configuration)
+    for parsed in configured_items(options, "speaker_configuration"):
         dsp_configuration.speakers.append(
             SpeakerConfiguration(
                 parsed["name"],
@@ -96,21 +176,35 @@ def create_dsp_configuration(options) -> DspConfiguration:
                 parsed["index_volume"],
                 parsed["index_mute"],
                 parsed.get("sources") or options["default_speaker_sources"],
+                create_fader(parsed),
             )
         )
 
-    for source_configuration in options.get("source_configuration") or []:
-        parsed = json.loads(source_configuration)
+    speakers_by_name = {speaker.name: speaker for speaker in dsp_configuration.speakers}
+    for parsed in configured_items(options, "speaker_group_configuration"):
+        if unknown := [name for name in parsed["speakers"] if name not in speakers_by_name]:
+            raise ValueError(f"Speaker group '{parsed['name']}' refers to unknown speakers {unknown}")
+        if not parsed["speakers"]:
+            raise ValueError(f"Speaker group '{parsed['name']}' must contain at least one speaker")
+
+        dsp_configuration.speaker_groups.append(
+            SpeakerGroupConfiguration(
+                parsed["name"],
+                [speakers_by_name[name] for name in parsed["speakers"]],
+            )
+        )
+
+    for parsed in configured_items(options, "source_configuration"):
         dsp_configuration.sources.append(
             SourceConfiguration(
                 parsed["name"],
                 parsed["index_volume"],
                 parsed["index_mute"],
+                create_fader(parsed),
             )
         )
 
-    for route_configuration in options.get("route_configuration") or []:
-        parsed = json.loads(route_configuration)
+    for parsed in configured_items(options, "route_configuration"):
         dsp_configuration.routes.append(
             RouteConfiguration(
                 parsed["name"],
@@ -118,8 +212,7 @@ def create_dsp_configuration(options) -> DspConfiguration:
             )
         )
 
-    for router_configuration in options.get("router_configuration") or []:
-        parsed = json.loads(router_configuration)
+    for parsed in configured_items(options, "router_configuration"):
         sources: list[RouterSourceConfiguration] = []
         seen_labels: set[str] = set()
 
@@ -142,54 +235,193 @@ def create_dsp_configuration(options) -> DspConfiguration:
             )
         )
 
+    for scene_configuration in options.get("scene_configuration") or []:
+        parsed = json.loads(scene_configuration)
+        dsp_configuration.scenes.append(
+            SceneConfiguration(
+                parsed["name"], [create_scene_parameter(parameter) for parameter in parsed["parameters"]]
+            )
+        )
+
+    for parsed in configured_items(options, "meter_configuration"):
+        channels = [int(channel) for channel in parsed.get("channels") or range(1, METER_CHANNELS + 1)]
+        if any(channel < 1 or channel > METER_CHANNELS for channel in channels):
+            raise ValueError(f"Meter '{parsed['name']}' has channels outside 1-{METER_CHANNELS}")
+
+        dsp_configuration.meters.append(
+            MeterConfiguration(
+                parsed["name"],
+                int(parsed["index"]),
+                channels,
+                float(parsed.get("signal_threshold", DEFAULT_SIGNAL_THRESHOLD_DB)),
+            )
+        )
+
+    if (meter_update_interval := options.get("meter_update_interval")) is not None:
+        dsp_configuration.meter_update_interval = float(meter_update_interval)
+    if (poll_budget := options.get("poll_budget")) is not None:
+        dsp_configuration.poll_budget = float(poll_budget)
+
+    compile_registry(dsp_configuration)
+
     return dsp_configuration
 
 
+def compile_registry(dsp_configuration: DspConfiguration):
+    registry = dsp_configuration.registry
+
+    for speaker in dsp_configuration.speakers:
+        registry.add_entity(
+            create_unique_id(speaker.name, EntityType.SPEAKER),
+            [
+                (speaker.index_volume, ParameterRole.LEVEL),
+                (speaker.index_mute, ParameterRole.MUTE),
+                (speaker.index_source, ParameterRole.SOURCE),
+            ],
+        )
+        registry.source_map(speaker.available_inputs)
+
+    for speaker_group in dsp_configuration.speaker_groups:
+        registry.add_entity(
+            create_unique_id(speaker_group.name, EntityType.SPEAKER_GROUP),
+            [
+                (index, role)
+                for speaker in speaker_group.speakers
+                for index, role in (
+                    (speaker.index_volume, ParameterRole.LEVEL),
+                    (speaker.index_mute, ParameterRole.MUTE),
+                )
+            ],
+        )
+
+    for source in dsp_configuration.sources:
+        registry.add_entity(
+            create_unique_id(source.name, EntityType.SOURCE),
+            [(source.index_volume, ParameterRole.LEVEL), (source.index_mute, ParameterRole.MUTE)],
+        )
+
+    for route in dsp_configuration.routes:
+        registry.add_entity(create_unique_id(route.name, EntityType.ROUTE), [(route.index_mute, ParameterRole.MUTE)])
+
+    for router in dsp_configuration.routers:
+        registry.add_entity(
+            create_unique_id(router.name, EntityType.ROUTER), [(router.index_source, ParameterRole.SOURCE)]
+        )
+
+    for meter in dsp_configuration.meters:
+        registry.add_entity(create_unique_id(meter.name, EntityType.METER), [(meter.index, ParameterRole.METER)])
+
+
+def create_fader(parsed: dict) -> FaderCurve:
+    # Most levels in the DSP go up to +10 dB, but e.g. some input channels only go up to 0 dB
+    fader = str(parsed.get("fader", "10db")).lower()
+    if fader not in FADER_CURVES:
+        raise ValueError(f"Unknown fader '{fader}' in '{parsed['name']}', expected one of {', '.join(FADER_CURVES)}")
+
+    return FADER_CURVES[fader]
+
+
+def create_scene_parameter(parsed: dict) -> SceneParameterConfiguration:
+    # e.g. {"index": 47, "value": 700, "type": "normalized"}, raw values unless stated otherwise
+    try:
+        value_type = ParameterValueType[parsed.get("type", "raw").upper()]
+    except KeyError:
+        raise ValueError(f"Invalid parameter type '{parsed['type']}', expected raw or normalized") from None
+
+    return SceneParameterConfiguration(int(parsed["index"]), str(parsed["value"]), value_type)
+
+
 @dataclass
 class RuntimeData:
     device: YamahaDspDevice
     product_information: ProductInformation
     device_info: DeviceInfo
     dsp_configuration: DspConfiguration
+    coordinator: YamahaDspCoordinator
+    store: YamahaDspStore
+    meter_coordinator: YamahaDspMeterCoordinator
+
+
+def create_device_info(product_information: ProductInformation) -> DeviceInfo:
+    return DeviceInfo(
+        identifiers={(DOMAIN, product_information.serial_number)},
+        manufacturer="Yamaha",
+        model=product_information.product_name,
+        model_id=product_information.device_id,
+        serial_number=product_information.serial_number,
+        sw_version=product_information.firmware_version,
+    )
+
+
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    # Services aren't tied to a config entry, so that they exist even while the device is unavailable
+    async_setup_services(hass)
+
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Create device
     if "host" in entry.data and "port" in entry.data:
-        device = YamahaDspDevice(entry.data["host"], entry.data["port"])
+        device = YamahaDspDevice(
+            entry.data["host"],
+            entry.data["port"],
+            pipeline_window=DEFAULT_PIPELINE_WINDOW,
+            keepalive_interval=DEFAULT_KEEPALIVE_INTERVAL,
+        )
     else:
         raise KeyError("Config entry is missing required parameters")
 
-    # Verify that we can connect, store device handle and product/device information
+    # Build the DSP configuration based on the configuration given by the option flow
     try:
-        await device.connect()
-        product_information = await device.query_product_information()
-        device_info = DeviceInfo(
-            identifiers={(DOMAIN, product_information.serial_number)},
-            manufacturer="Yamaha",
-            model=product_information.product_name,
-            model_id=product_information.device_id,
-            serial_number=product_information.serial_number,
-            sw_version=product_information.firmware_version,
-        )
-
-        # Build the DSP configuration based on the configuration given by the option flow
         dsp_configuration = create_dsp_configuration(entry.options)
-
-        entry.runtime_data = RuntimeData(device, product_information, device_info, dsp_configuration)
-    except ConnectionError as e:
-        raise ConfigEntryNotReady("Unable to connect") from e
     except json.JSONDecodeError as e:
         raise ConfigEntryError() from e
     except ValueError as e:
         raise ConfigEntryError() from e
 
+    store = YamahaDspStore(hass, entry.entry_id)
+    stored_state = await store.async_load()
+
+    # The device only has to be reachable during setup the first time, after that we know what it is
+    product_information = stored_state.product_information
+    if product_information is None:
+        try:
+            await device.connect()
+            product_information = await device.query_product_information()
+        except (OSError, RuntimeError, ResponseError) as e:
+            await device.stop()
+            raise ConfigEntryNotReady("Unable to connect") from e
+
+        store.async_save_product_information(product_information)
+
+    device_info = create_device_info(product_information)
+
+    # Poll every configured parameter in one batch, shared by all entities. Until the first poll has completed,
+    # entities show the values stored during the previous run.
+    coordinator = YamahaDspCoordinator(hass, entry, device, dsp_configuration, store)
+    coordinator.async_restore(stored_state.parameters)
+
+    # Meters are streamed by the device and only summarized into entity states every now and then
+    meter_coordinator = YamahaDspMeterCoordinator(hass, entry, device, dsp_configuration)
+
+    entry.runtime_data = RuntimeData(
+        device, product_information, device_info, dsp_configuration, coordinator, store, meter_coordinator
+    )
+
     # Register a listener for option updates
     entry.async_on_unload(entry.add_update_listener(entry_update_listener))
 
     logger.info(f"Initializing entry with runtime data: {entry.runtime_data}")
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Connect in the background and keep reconnecting, a slow or rebooting device shouldn't hold up Home Assistant.
+    # The coordinator polls every time the connection has been established.
+    entry.async_on_unload(device.add_connection_listener(coordinator.async_handle_connection_change))
+    # Parameters that change are polled more often, parameters the device sends NOTIFY messages about only rarely
+    entry.async_on_unload(device.add_parameter_listener(coordinator.async_handle_parameter_change))
+    device.start()
+
     return True
 
 
@@ -198,11 +430,31 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # "Task was destroyed but it is pending" error
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         runtime_data: RuntimeData = entry.runtime_data
-        await runtime_data.device.disconnect()
+        await runtime_data.device.stop()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    await YamahaDspStore(hass, entry.entry_id).async_remove()
+
+
 async def entry_update_listener(hass: HomeAssistant, config_entry: ConfigEntry):
-    # Reload the entry when options have been changed
-    await hass.config_entries.async_reload(config_entry.entry_id)
+    try:
+        dsp_configuration = create_dsp_configuration(config_entry.options)
+    except (KeyError, TypeError, ValueError) as e:
+        # Reload, so that the entry fails to set up just like it would after a restart, e.g. a speaker without an
+        # index or an index that isn't a number
+        logger.error(f"Invalid DSP configuration: {e}")
+        await hass.config_entries.async_reload(config_entry.entry_id)
+        return
+
+    # Apply the new configuration without reconnecting. The platforms only replace the entities whose
+    # configuration changed, and a poll fetches the values of any new parameters.
+    runtime_data: RuntimeData = config_entry.runtime_data
+    runtime_data.dsp_configuration = dsp_configuration
+    runtime_data.coordinator.set_dsp_configuration(dsp_configuration)
+    runtime_data.meter_coordinator.set_dsp_configuration(dsp_configuration)
+    async_dispatcher_send(hass, SIGNAL_CONFIGURATION_UPDATED.format(config_entry.entry_id), dsp_configuration)
+
+    await runtime_data.coordinator.async_refresh()
@@ -0,0 +1,88 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+
+from custom_components.yamaha_dsp import (
+    DspConfiguration,
+    EntityType,
+    MeterConfiguration,
+    RuntimeData,
+    create_unique_id,
+)
+from custom_components.yamaha_dsp.coordinator import YamahaDspMeterCoordinator
+from custom_components.yamaha_dsp.entity import ConfiguredEntities, YamahaDspMeterEntity
+from custom_components.yamaha_dsp.yamaha.meter import MeterSummary
+
+
+@dataclass(frozen=True, kw_only=True)
+class MeterBinarySensorEntityDescription(BinarySensorEntityDescription):
+    is_on_fn: Callable[[MeterSummary, MeterConfiguration], bool]
+
+
+METER_BINARY_SENSORS = (
+    MeterBinarySensorEntityDescription(
+        key="signal",
+        name="signal",
+        device_class=BinarySensorDeviceClass.SOUND,
+        is_on_fn=lambda summary, config: summary.peak_db >= config.signal_threshold,
+    ),
+    MeterBinarySensorEntityDescription(
+        key="clipping",
+        name="clipping",
+        icon="mdi:alert-octagon-outline",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        is_on_fn=lambda summary, _config: summary.clipping,
+    ),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
+    # Extract stored runtime data
+    runtime_data: RuntimeData = entry.runtime_data
+    meter_coordinator = runtime_data.meter_coordinator
+    device_info = runtime_data.device_info
+
+    # Add signal and clipping indicators for each meter
+    def create_entities(dsp_configuration: DspConfiguration) -> list[MeterBinarySensorEntity]:
+        return [
+            MeterBinarySensorEntity(description, config, meter_coordinator, device_info)
+            for config in dsp_configuration.meters
+            for description in METER_BINARY_SENSORS
+        ]
+
+    ConfiguredEntities(async_add_entities, create_entities).async_setup(hass, entry, runtime_data.dsp_configuration)
+
+
+class MeterBinarySensorEntity(YamahaDspMeterEntity, BinarySensorEntity):
+    entity_description: MeterBinarySensorEntityDescription
+
+    def __init__(
+        self,
+        description: MeterBinarySensorEntityDescription,
+        config: MeterConfiguration,
+        coordinator: YamahaDspMeterCoordinator,
+        device_info: DeviceInfo,
+    ):
+        super().__init__(config, coordinator, device_info)
+        self.entity_description = description
+
+    @property
+    def name(self) -> str:
+        return f"{self._config.name} {self.entity_description.name}"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{create_unique_id(self._config.name, EntityType.METER)}_{self.entity_description.key}"
+
+    @property
+    def is_on(self) -> bool | None:
+        summary = self.summary
+
+        return self.entity_description.is_on_fn(summary, self._config) if summary is not None else None
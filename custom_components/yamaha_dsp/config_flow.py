@@ -4,20 +4,37 @@ from typing import Any
 
 import voluptuous as vol
 
+from homeassistant.components.file_upload import process_uploaded_file
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
 from homeassistant.helpers import selector
-from homeassistant.helpers.selector import TextSelectorConfig
+from homeassistant.helpers.selector import (
+    FileSelectorConfig,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    TextSelectorConfig,
+)
 
+from custom_components.yamaha_dsp import create_dsp_configuration
 from custom_components.yamaha_dsp.const import (
     CONF_HOST,
     CONF_PORT,
+    DEFAULT_METER_UPDATE_INTERVAL,
+    DEFAULT_POLL_BUDGET,
     DOMAIN,
     OPTION_DEFAULT_SPEAKER_SOURCES,
+    OPTION_IMPORT_FILE,
+    OPTION_IMPORTED_CONFIGURATION,
+    OPTION_METER_CONFIGURATION,
+    OPTION_METER_UPDATE_INTERVAL,
+    OPTION_POLL_BUDGET,
     OPTION_ROUTE_CONFIGURATION,
     OPTION_ROUTER_CONFIGURATION,
+    OPTION_SCENE_CONFIGURATION,
     OPTION_SOURCE_CONFIGURATION,
     OPTION_SPEAKER_CONFIGURATION,
+    OPTION_SPEAKER_GROUP_CONFIGURATION,
 )
+from custom_components.yamaha_dsp.importer import ImportResult, ImportRowError, decode_import, parse_import
 from custom_components.yamaha_dsp.yamaha.device import YamahaDspDevice
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
@@ -72,18 +89,29 @@ class YamahaDspOptionsFlow(OptionsFlow):
         self._config_entry = config_entry
 
     async def async_step_init(self, user_input: dict[str, Any] | None = None):
+        return self.async_show_menu(step_id="init", menu_options=["configure", "import_configuration"])
+
+    async def async_step_configure(self, user_input: dict[str, Any] | None = None):
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # Keep options that aren't part of the form, e.g. the imported configuration
+            return self.async_create_entry(title="", data=self._config_entry.options | user_input)
 
         # Load existing values, use defaults if not defined
         default_speaker_sources = self._config_entry.options.get(OPTION_DEFAULT_SPEAKER_SOURCES) or []
         speaker_configuration = self._config_entry.options.get(OPTION_SPEAKER_CONFIGURATION) or []
+        speaker_group_configuration = self._config_entry.options.get(OPTION_SPEAKER_GROUP_CONFIGURATION) or []
         source_configuration = self._config_entry.options.get(OPTION_SOURCE_CONFIGURATION) or []
         route_configuration = self._config_entry.options.get(OPTION_ROUTE_CONFIGURATION) or []
         router_configuration = self._config_entry.options.get(OPTION_ROUTER_CONFIGURATION) or []
+        scene_configuration = self._config_entry.options.get(OPTION_SCENE_CONFIGURATION) or []
+        meter_configuration = self._config_entry.options.get(OPTION_METER_CONFIGURATION) or []
+        meter_update_interval = self._config_entry.options.get(
+            OPTION_METER_UPDATE_INTERVAL, DEFAULT_METER_UPDATE_INTERVAL
+        )
+        poll_budget = self._config_entry.options.get(OPTION_POLL_BUDGET, DEFAULT_POLL_BUDGET)
 
         return self.async_show_form(
-            step_id="init",
+            step_id="configure",
             data_schema=vol.Schema(
                 {
                     vol.Optional(
@@ -92,6 +120,9 @@ class YamahaDspOptionsFlow(OptionsFlow):
                     vol.Optional(OPTION_SPEAKER_CONFIGURATION, default=speaker_configuration): selector.TextSelector(
                         TextSelectorConfig(multiline=True, multiple=True)
                     ),
+                    vol.Optional(
+                        OPTION_SPEAKER_GROUP_CONFIGURATION, default=speaker_group_configuration
+                    ): selector.TextSelector(TextSelectorConfig(multiline=True, multiple=True)),
                     vol.Optional(OPTION_SOURCE_CONFIGURATION, default=source_configuration): selector.TextSelector(
                         TextSelectorConfig(multiline=True, multiple=True)
                     ),
@@ -101,6 +132,66 @@ class YamahaDspOptionsFlow(OptionsFlow):
                     vol.Optional(OPTION_ROUTER_CONFIGURATION, default=router_configuration): selector.TextSelector(
                         TextSelectorConfig(multiline=True, multiple=True)
                     ),
+                    vol.Optional(OPTION_SCENE_CONFIGURATION, default=scene_configuration): selector.TextSelector(
+                        TextSelectorConfig(multiline=True, multiple=True)
+                    ),
+                    vol.Optional(OPTION_METER_CONFIGURATION, default=meter_configuration): selector.TextSelector(
+                        TextSelectorConfig(multiline=True, multiple=True)
+                    ),
+                    vol.Optional(OPTION_METER_UPDATE_INTERVAL, default=meter_update_interval): selector.NumberSelector(
+                        NumberSelectorConfig(
+                            min=1, max=60, step=1, unit_of_measurement="s", mode=NumberSelectorMode.BOX
+                        )
+                    ),
+                    vol.Optional(OPTION_POLL_BUDGET, default=poll_budget): selector.NumberSelector(
+                        NumberSelectorConfig(
+                            min=1, max=100, step=1, unit_of_measurement="commands/s", mode=NumberSelectorMode.BOX
+                        )
+                    ),
                 }
             ),
         )
+
+    async def async_step_import_configuration(self, user_input: dict[str, Any] | None = None):
+        errors: dict[str, str] = {}
+        import_errors = ""
+
+        if user_input is not None:
+            result = await self.hass.async_add_executor_job(read_import_file, self.hass, user_input[OPTION_IMPORT_FILE])
+            # The imported entities replace the previously imported ones, in one piece
+            options = self._config_entry.options | {OPTION_IMPORTED_CONFIGURATION: result.configuration}
+
+            if not result.errors:
+                # Catch what only shows up when the rows are combined, e.g. duplicate names or unknown group members
+                try:
+                    create_dsp_configuration(options)
+                except (KeyError, ValueError) as e:
+                    result.errors.append(ImportRowError(None, str(e)))
+
+            if result.errors:
+                errors["base"] = "invalid_import"
+                import_errors = result.format_errors()
+            else:
+                logger.info(f"Imported {result.rows} rows")
+                return self.async_create_entry(title="", data=options)
+
+        return self.async_show_form(
+            step_id="import_configuration",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(OPTION_IMPORT_FILE): selector.FileSelector(FileSelectorConfig(accept=".csv,.json")),
+                }
+            ),
+            errors=errors,
+            description_placeholders={"errors": import_errors},
+        )
+
+
+def read_import_file(hass, file_id: str) -> ImportResult:
+    try:
+        with process_uploaded_file(hass, file_id) as file_path:
+            content = decode_import(file_path.read_bytes())
+    except (OSError, UnicodeDecodeError) as e:
+        return ImportResult(errors=[ImportRowError(None, f"Unable to read the file: {e}")])
+
+    return parse_import(content)
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 DOMAIN = "yamaha_dsp"
 
 CONF_HOST = "host"
@@ -5,6 +7,56 @@ CONF_PORT = "port"
 
 OPTION_DEFAULT_SPEAKER_SOURCES = "default_speaker_sources"
 OPTION_SPEAKER_CONFIGURATION = "speaker_configuration"
+OPTION_SPEAKER_GROUP_CONFIGURATION = "speaker_group_configuration"
 OPTION_SOURCE_CONFIGURATION = "source_configuration"
 OPTION_ROUTE_CONFIGURATION = "route_configuration"
 OPTION_ROUTER_CONFIGURATION = "router_configuration"
+OPTION_SCENE_CONFIGURATION = "scene_configuration"
+OPTION_METER_CONFIGURATION = "meter_configuration"
+OPTION_METER_UPDATE_INTERVAL = "meter_update_interval"
+OPTION_POLL_BUDGET = "poll_budget"
+# Entities imported from a file, stored already parsed, by the option they would otherwise be configured in
+OPTION_IMPORTED_CONFIGURATION = "imported_configuration"
+OPTION_IMPORT_FILE = "import_file"
+
+# Seconds between polls of a parameter until it's known whether it changes or not
+DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
+# How often the coordinator checks which parameters are due to be polled
+POLL_TICK = timedelta(seconds=5)
+# Parameter queries per second that polling may use on average
+DEFAULT_POLL_BUDGET = 5
+
+# Seconds between meter updates in Home Assistant. The device sends meters far more often, in between updates they
+# are only buffered.
+DEFAULT_METER_UPDATE_INTERVAL = 5
+# Seconds between the meter values the device is asked to send
+METER_INTERVAL = 0.1
+# Meters are considered to have a signal when their peak is at or above this many dBFS, unless configured otherwise
+DEFAULT_SIGNAL_THRESHOLD_DB = -60
+
+# Sent with the new DspConfiguration when the options of a config entry change, formatted with the entry ID
+SIGNAL_CONFIGURATION_UPDATED = f"{DOMAIN}_configuration_updated_{{}}"
+
+# How many commands may be in flight on the connection at once
+DEFAULT_PIPELINE_WINDOW = 8
+
+# Seconds of silence on the connection after which the device is probed, so that dead links are found early
+DEFAULT_KEEPALIVE_INTERVAL = 10
+
+# Volume up/down changes the level by this many dB, which sounds the same at any volume unlike a fixed fraction
+VOLUME_STEP_DB = 1.0
+
+SERVICE_FADE_VOLUME = "fade_volume"
+ATTR_DURATION = "duration"
+# Longest fade the fade_volume service accepts, in seconds
+MAX_FADE_DURATION = 3600
+
+SERVICE_APPLY_PARAMETERS = "apply_parameters"
+SERVICE_SNAPSHOT = "snapshot"
+SERVICE_RESTORE_SNAPSHOT = "restore_snapshot"
+SERVICE_DELETE_SNAPSHOT = "delete_snapshot"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_SCENE = "scene"
+ATTR_PARAMETERS = "parameters"
+ATTR_ROLLBACK = "rollback"
+ATTR_NAME = "name"
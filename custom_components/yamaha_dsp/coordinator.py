@@ -0,0 +1,222 @@
+import logging
+import math
+import time
+
+from collections.abc import Callable
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from custom_components.yamaha_dsp.const import DEFAULT_SCAN_INTERVAL, DOMAIN, METER_INTERVAL, POLL_TICK
+from custom_components.yamaha_dsp.poll_schedule import PollSchedule
+from custom_components.yamaha_dsp.registry import ParameterRegistry, PolledParameter
+from custom_components.yamaha_dsp.storage import YamahaDspStore
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType, create_index_parameter
+from custom_components.yamaha_dsp.yamaha.device import YamahaDspDevice
+from custom_components.yamaha_dsp.yamaha.meter import MeterBuffer, MeterSummary
+from custom_components.yamaha_dsp.yamaha.response import ResponseError
+from custom_components.yamaha_dsp.yamaha.scheduler import CommandPriority
+
+if TYPE_CHECKING:
+    from custom_components.yamaha_dsp import DspConfiguration
+
+# (index, channels) of a configured meter, e.g. (12, (1, 2))
+MeterZone = tuple[int, tuple[int, ...]]
+
+logger = logging.getLogger(__name__)
+
+
+class YamahaDspCoordinator(DataUpdateCoordinator[dict[PolledParameter, str]]):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        device: YamahaDspDevice,
+        dsp_configuration: "DspConfiguration",
+        store: YamahaDspStore,
+    ):
+        super().__init__(
+            hass,
+            logger,
+            config_entry=entry,
+            name=DOMAIN,
+            # Most updates only poll a few parameters, or none at all, and most of those haven't changed
+            update_interval=POLL_TICK,
+            always_update=False,
+        )
+        self.device = device
+        self.registry: ParameterRegistry = dsp_configuration.registry
+        self._polled_parameters = dsp_configuration.registry.polled_parameters
+        self._store = store
+        self.poll_schedule = PollSchedule(DEFAULT_SCAN_INTERVAL.total_seconds(), dsp_configuration.poll_budget)
+        self.poll_schedule.set_parameters(self._polled_parameters, time.monotonic())
+        # Every parameter is polled on the next update, e.g. after connecting, whatever the schedule says
+        self._poll_all = True
+
+    def set_dsp_configuration(self, dsp_configuration: "DspConfiguration"):
+        # Takes effect on the next poll
+        self.registry = dsp_configuration.registry
+        self._polled_parameters = dsp_configuration.registry.polled_parameters
+        self.poll_schedule.budget = dsp_configuration.poll_budget
+        self.poll_schedule.set_parameters(self._polled_parameters, time.monotonic())
+        self._poll_all = True
+
+    def async_restore(self, parameters: dict[PolledParameter, str]):
+        # Entities show the last known values until the device has been polled
+        polled_parameters = set(self._polled_parameters)
+        self.data = {parameter: value for parameter, value in parameters.items() if parameter in polled_parameters}
+
+    @callback
+    def async_handle_connection_change(self, connected: bool):
+        if connected:
+            # Everything may have changed while we were disconnected, refresh all entities in one go
+            self.poll_schedule.reset(time.monotonic())
+            self._poll_all = True
+            self.config_entry.async_create_background_task(
+                self.hass, self._async_handle_connected(), f"{DOMAIN} refresh after connect"
+            )
+        else:
+            # Mark entities unavailable right away instead of on the next poll
+            self.async_set_update_error(UpdateFailed("Connection to the device was lost"))
+
+    @callback
+    def async_handle_parameter_change(self, address: str, pushed: bool):
+        # The cache has already been updated, it tells which types of value the NOTIFY brought
+        state = self.device.parameter_cache.get(address)
+        pushed_types = (
+            {value_type for value_type in ParameterValueType if state.get_value(value_type) is not None}
+            if pushed and state is not None
+            else set()
+        )
+        self.poll_schedule.record_change(address, pushed_types, time.monotonic())
+
+    async def _async_handle_connected(self):
+        try:
+            # Keep the stored product information current, e.g. after a firmware update
+            self._store.async_save_product_information(await self.device.query_product_information())
+        except (RuntimeError, ResponseError) as e:
+            logger.warning(f"Unable to query product information: {e}")
+
+        await self.async_refresh()
+
+    async def _async_update_data(self) -> dict[PolledParameter, str]:
+        if not self.device.connected:
+            raise UpdateFailed("Not connected to the device")
+
+        start = time.monotonic()
+        poll_all, self._poll_all = self._poll_all, False
+        polled_parameters = self._polled_parameters if poll_all else self.poll_schedule.due(start)
+
+        # Parameters that are no longer configured are dropped. The rest keep their values until they're polled,
+        # or are kept current by NOTIFY messages if they're not polled at all.
+        previous = self.data or {}
+        data = {
+            parameter: self._latest_value(parameter, previous[parameter])
+            for parameter in self._polled_parameters
+            if parameter in previous
+        }
+        if not polled_parameters:
+            self._store.async_save_parameters(data)
+            return data
+
+        try:
+            results = await self.device.query_parameters(polled_parameters, CommandPriority.BACKGROUND)
+        except RuntimeError as e:
+            # Try again on the next update
+            self._poll_all = self._poll_all or poll_all
+            raise UpdateFailed(f"Unable to poll the device: {e}") from e
+
+        now = time.monotonic()
+        for polled_parameter, result in zip(polled_parameters, results, strict=True):
+            if isinstance(result, ResponseError):
+                # Most likely a misconfigured index, don't let it make every other entity unavailable
+                logger.warning(f"Unable to query {polled_parameter[1]}: {result}")
+                data.pop(polled_parameter, None)
+            else:
+                data[polled_parameter] = self._latest_value(polled_parameter, result.value)
+                self.poll_schedule.record_poll(polled_parameter, result.value, now)
+
+        logger.debug(
+            f"Polled {len(polled_parameters)}/{len(self._polled_parameters)} parameters in {(now - start) * 1000:.1f} ms"
+        )
+
+        self._store.async_save_parameters(data)
+
+        return data
+
+    def _latest_value(self, polled_parameter: PolledParameter, polled_value: str) -> str:
+        # A set or NOTIFY that arrived after the poll's reply has already updated the cache. Prefer it, so that
+        # the poll doesn't revert an entity to the value from before a change that was just made.
+        value_type, parameter = polled_parameter
+        state = self.device.parameter_cache.get(parameter)
+        value = state.get_value(value_type) if state is not None else None
+
+        return value if value is not None else polled_value
+
+
+class YamahaDspMeterCoordinator(DataUpdateCoordinator[dict[MeterZone, MeterSummary | None]]):
+    """
+    Buffers the meters of the configured zones as the device streams them and summarizes the buffered values once
+    per update interval. Only the summaries reach Home Assistant, never the individual meter values.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        device: YamahaDspDevice,
+        dsp_configuration: "DspConfiguration",
+    ):
+        super().__init__(
+            hass,
+            logger,
+            config_entry=entry,
+            name=f"{DOMAIN} meters",
+            update_interval=timedelta(seconds=dsp_configuration.meter_update_interval),
+            # A silent zone stays silent, there's no need to write the same state over and over again
+            always_update=False,
+        )
+        self.device = device
+        self._zones: list[MeterZone] = []
+        self._buffers: dict[int, MeterBuffer] = {}
+        self._unsubscribes: list[Callable[[], None]] = []
+        self.set_dsp_configuration(dsp_configuration)
+
+    def set_dsp_configuration(self, dsp_configuration: "DspConfiguration"):
+        self._unsubscribe()
+
+        interval = dsp_configuration.meter_update_interval
+        self.update_interval = timedelta(seconds=interval)
+        # Room for twice the frames of an update interval, in case an update is late
+        capacity = 2 * math.ceil(interval / METER_INTERVAL)
+
+        # Zones that share a meter, e.g. the left and right half of a matrix output, share its buffer
+        self._zones = [(meter.index, tuple(meter.channels)) for meter in dsp_configuration.meters]
+        self._buffers = {index: MeterBuffer(capacity) for index, _ in self._zones}
+        self._unsubscribes = [
+            self.device.subscribe_meter(create_index_parameter(index), buffer.append, METER_INTERVAL)
+            for index, buffer in self._buffers.items()
+        ]
+
+    async def async_shutdown(self) -> None:
+        await super().async_shutdown()
+        self._unsubscribe()
+
+    def _unsubscribe(self):
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+
+        self._unsubscribes = []
+
+    async def _async_update_data(self) -> dict[MeterZone, MeterSummary | None]:
+        # Each update covers the frames received since the previous one. A zone without frames, e.g. while
+        # disconnected, has no summary.
+        data = {zone: self._buffers[zone[0]].summary(zone[1]) for zone in self._zones}
+
+        for buffer in self._buffers.values():
+            buffer.clear()
+
+        return data
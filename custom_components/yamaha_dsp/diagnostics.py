@@ -1,11 +1,28 @@
+from dataclasses import asdict
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
+from custom_components.yamaha_dsp import RuntimeData
+
 
 async def async_get_config_entry_diagnostics(_hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
+    runtime_data: RuntimeData = entry.runtime_data
+    coordinator = runtime_data.coordinator
+
     return {
         "entry_data": entry.data,
+        "product_information": asdict(runtime_data.product_information),
+        "connected": runtime_data.device.connected,
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval_seconds": coordinator.update_interval.total_seconds(),
+            "polled_parameters": len(coordinator.data or {}),
+            "configured_parameters": len(coordinator.registry.polled_parameters),
+            "pushed_parameters": coordinator.poll_schedule.pushed_parameters,
+            "poll_budget": coordinator.poll_schedule.budget,
+        },
+        "statistics": runtime_data.device.statistics.as_dict(),
     }
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from custom_components.yamaha_dsp.const import SIGNAL_CONFIGURATION_UPDATED
+from custom_components.yamaha_dsp.coordinator import YamahaDspCoordinator, YamahaDspMeterCoordinator
+from custom_components.yamaha_dsp.yamaha.cache import ParameterKey, ParameterState
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.meter import MeterSummary
+
+if TYPE_CHECKING:
+    from custom_components.yamaha_dsp import DspConfiguration, MeterConfiguration
+
+logger = logging.getLogger(__name__)
+
+
+class YamahaDspEntity(CoordinatorEntity[YamahaDspCoordinator]):
+    # State comes from the coordinator's polls and, in between polls, is pushed to us by the device
+
+    # The part of the DSP configuration the entity was created from, if any
+    _config: Any = None
+
+    def __init__(self, coordinator: YamahaDspCoordinator, device_info: DeviceInfo):
+        super().__init__(coordinator)
+        self._device = coordinator.device
+        self._device_info = device_info
+        self._parameter_handlers: dict[str, tuple[ParameterValueType, Callable[[str], None]]] = {}
+        # The last value given to the handler of each parameter, and whether the entity was last written as available
+        self._applied_values: dict[str, str] = {}
+        self._written_available: bool | None = None
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return self._device_info
+
+    def _register_parameter(self, parameter: str, value_type: ParameterValueType, handler: Callable[[str], None]):
+        self._parameter_handlers[parameter] = (value_type, handler)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        for parameter in self._parameter_handlers:
+            self.async_on_remove(self._device.parameter_cache.subscribe(parameter, self._handle_parameter_update))
+
+        # Apply the values from the first refresh
+        self._apply_coordinator_data()
+
+    def _apply_coordinator_data(self) -> bool:
+        """Hands the polled values that differ from what the entity already has to the handlers, True if any did."""
+        if self.coordinator.data is None:
+            return False
+
+        changed = False
+        for parameter, (value_type, handler) in self._parameter_handlers.items():
+            value = self.coordinator.data.get((value_type, parameter))
+            if value is not None and value != self._applied_values.get(parameter):
+                self._apply_value(parameter, handler, value)
+                changed = True
+
+        return changed
+
+    def _apply_value(self, parameter: str, handler: Callable[[str], None], value: str) -> None:
+        handler(value)
+        self._applied_values[parameter] = value
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Most polls change nothing. With hundreds of entities, writing every state after every poll adds up, so
+        # only entities whose parameters or availability changed are written. Entities without parameters, e.g. the
+        # statistics sensors, have no way of telling whether anything changed.
+        available = self.coordinator.last_update_success
+        changed = self._apply_coordinator_data() or not self._parameter_handlers
+        if changed or available != self._written_available:
+            self._written_available = available
+            self.async_write_ha_state()
+
+    @callback
+    def _handle_parameter_update(self, key: ParameterKey, state: ParameterState) -> None:
+        # The cache was cleared after a reconnect, the coordinator refreshes everything in bulk
+        if state.raw is None and state.normalized is None:
+            return
+
+        parameter = key[0]
+        value_type, handler = self._parameter_handlers[parameter]
+        value = state.get_value(value_type)
+
+        # The parameter changed but we only know its value in the other representation, ask for the one we need
+        if value is None:
+            self.hass.async_create_task(self._async_refresh_parameter(parameter, value_type))
+            return
+
+        self._apply_value(parameter, handler, value)
+        self.async_write_ha_state()
+
+    async def _async_refresh_parameter(self, parameter: str, value_type: ParameterValueType) -> None:
+        try:
+            # The response updates the parameter cache, which in turn calls _handle_parameter_update
+            await self._device.query_parameter(value_type, parameter)
+        except Exception as e:
+            logger.warning(f"Unable to refresh {parameter} for {self.entity_id}: {e}")
+
+
+class YamahaDspMeterEntity(CoordinatorEntity[YamahaDspMeterCoordinator]):
+    # State is a summary of the meter of a zone, refreshed once per meter update interval
+
+    def __init__(self, config: "MeterConfiguration", coordinator: YamahaDspMeterCoordinator, device_info: DeviceInfo):
+        super().__init__(coordinator)
+        self._config = config
+        self._device_info = device_info
+        self._zone = (config.index, tuple(config.channels))
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return self._device_info
+
+    @property
+    def summary(self) -> MeterSummary | None:
+        return self.coordinator.data.get(self._zone) if self.coordinator.data is not None else None
+
+    @property
+    def available(self) -> bool:
+        # No meter values arrived during the last update interval
+        return super().available and self.summary is not None
+
+
+class ConfiguredEntities:
+    """
+    The entities of a platform that are created from the DSP configuration. When the options change, only the
+    entities whose configuration was added, removed or changed are touched, the rest keep running.
+    """
+
+    def __init__(
+        self,
+        async_add_entities: AddEntitiesCallback,
+        create_entities: Callable[["DspConfiguration"], list[YamahaDspEntity | YamahaDspMeterEntity]],
+    ):
+        self._async_add_entities = async_add_entities
+        self._create_entities = create_entities
+        self._entities: dict[str, YamahaDspEntity | YamahaDspMeterEntity] = {}
+
+    def async_setup(self, hass: HomeAssistant, entry: ConfigEntry, dsp_configuration: "DspConfiguration"):
+        self._add(self._create_entities(dsp_configuration))
+
+        entry.async_on_unload(
+            async_dispatcher_connect(hass, SIGNAL_CONFIGURATION_UPDATED.format(entry.entry_id), self.async_update)
+        )
+
+    async def async_update(self, dsp_configuration: "DspConfiguration"):
+        wanted = {entity.unique_id: entity for entity in self._create_entities(dsp_configuration)}
+
+        # Changed entities are replaced, they keep their unique ID and thereby their entity ID and customizations
+        removed = [
+            entity
+            for unique_id, entity in self._entities.items()
+            if unique_id not in wanted or wanted[unique_id]._config != entity._config
+        ]
+        for entity in removed:
+            del self._entities[entity.unique_id]
+
+        await asyncio.gather(*[entity.async_remove() for entity in removed])
+
+        added = [entity for unique_id, entity in wanted.items() if unique_id not in self._entities]
+        self._add(added)
+
+        if removed or added:
+            logger.info(f"Configuration changed, removed {len(removed)} and added {len(added)} entities")
+
+    def _add(self, entities: list[YamahaDspEntity | YamahaDspMeterEntity]):
+        for entity in entities:
+            self._entities[entity.unique_id] = entity
+
+        if entities:
+            self._async_add_entities(entities)
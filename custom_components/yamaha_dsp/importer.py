@@ -0,0 +1,231 @@
+"""
+Import of many entities at once from a CSV or JSON file, with one row per entity. The rows are turned into the same
+structures as the JSON entered in the options, e.g. for CSV:
+
+    type,name,index_source,index_volume,index_mute,index,sources,speakers,channels,signal_threshold
+    speaker,Kitchen,33,47,48,,Spotify;Radio,,,
+    speaker_group,Downstairs,,,,,,Kitchen;Bar,,
+    router,Classroom sink,20019,,,,NONE=0;Mic bus=3,,,
+    meter,Lobby,,,,120,,,1;2,-50
+
+JSON files contain a list of rows with the same keys, where lists may also be given as JSON lists.
+"""
+
+import csv
+import io
+import json
+
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+# How many errors are worth showing, the rest are probably the same mistake over and over
+MAX_REPORTED_ERRORS = 10
+
+
+@dataclass
+class ImportRowError:
+    # None when the error isn't about a single row
+    row: int | None
+    message: str
+
+    def __str__(self) -> str:
+        return f"Row {self.row}: {self.message}" if self.row is not None else self.message
+
+
+@dataclass
+class ImportResult:
+    # Imported entities by the option they would otherwise be configured in, e.g. "speaker_configuration"
+    configuration: dict[str, list[dict]] = field(default_factory=dict)
+    errors: list[ImportRowError] = field(default_factory=list)
+    rows: int = 0
+
+    def format_errors(self) -> str:
+        lines = [str(error) for error in self.errors[:MAX_REPORTED_ERRORS]]
+        if len(self.errors) > MAX_REPORTED_ERRORS:
+            lines.append(f"... and {len(self.errors) - MAX_REPORTED_ERRORS} more")
+
+        return "\n".join(lines)
+
+
+def get_name(row: dict) -> str:
+    if not (name := str(row.get("name") or "").strip()):
+        raise ValueError("name is required")
+
+    return name
+
+
+def get_index(row: dict, key: str) -> int:
+    value = row.get(key)
+    if value is None or str(value).strip() == "":
+        raise ValueError(f"{key} is required")
+
+    try:
+        index = int(value)
+    except ValueError:
+        raise ValueError(f"{key} must be a whole number, got '{value}'") from None
+
+    if index < 1:
+        raise ValueError(f"{key} must be positive, got {index}")
+
+    return index
+
+
+def get_list(row: dict, key: str) -> list[str]:
+    # Lists are separated by semicolons in CSV, which doesn't have lists of its own
+    value = row.get(key)
+    if isinstance(value, list):
+        return [str(item).strip() for item in value]
+
+    return [item.strip() for item in str(value or "").split(";") if item.strip()]
+
+
+def get_router_sources(row: dict) -> list[dict]:
+    value = row.get("sources")
+    if isinstance(value, list) and all(isinstance(source, dict) for source in value):
+        return value
+
+    sources = []
+    for source in get_list(row, "sources"):
+        # e.g. Mic bus=3
+        label, separator, source_value = source.rpartition("=")
+        if not separator or not label.strip():
+            raise ValueError(f"router sources must be given as label=value, got '{source}'")
+        try:
+            sources.append({"label": label.strip(), "value": int(source_value)})
+        except ValueError:
+            raise ValueError(f"router source values must be whole numbers, got '{source_value}'") from None
+
+    return sources
+
+
+def create_speaker(row: dict) -> dict:
+    item = {
+        "name": get_name(row),
+        "index_source": get_index(row, "index_source"),
+        "index_volume": get_index(row, "index_volume"),
+        "index_mute": get_index(row, "index_mute"),
+    }
+    # Without sources of its own, the speaker uses the default speaker sources
+    if sources := get_list(row, "sources"):
+        item["sources"] = sources
+
+    return add_fader(row, item)
+
+
+def add_fader(row: dict, item: dict) -> dict:
+    # The fader is validated along with the rest of the configuration
+    if fader := str(row.get("fader") or "").strip():
+        item["fader"] = fader
+
+    return item
+
+
+def create_speaker_group(row: dict) -> dict:
+    if not (speakers := get_list(row, "speakers")):
+        raise ValueError("speakers is required")
+
+    return {"name": get_name(row), "speakers": speakers}
+
+
+def create_source(row: dict) -> dict:
+    item = {
+        "name": get_name(row),
+        "index_volume": get_index(row, "index_volume"),
+        "index_mute": get_index(row, "index_mute"),
+    }
+
+    return add_fader(row, item)
+
+
+def create_route(row: dict) -> dict:
+    return {"name": get_name(row), "index_mute": get_index(row, "index_mute")}
+
+
+def create_router(row: dict) -> dict:
+    return {"name": get_name(row), "index_source": get_index(row, "index_source"), "sources": get_router_sources(row)}
+
+
+def create_meter(row: dict) -> dict:
+    item: dict[str, Any] = {"name": get_name(row), "index": get_index(row, "index")}
+    if channels := get_list(row, "channels"):
+        item["channels"] = [get_index({"channel": channel}, "channel") for channel in channels]
+    if (threshold := row.get("signal_threshold")) not in (None, ""):
+        try:
+            item["signal_threshold"] = float(threshold)
+        except ValueError:
+            raise ValueError(f"signal_threshold must be a number, got '{threshold}'") from None
+
+    return item
+
+
+# Row type, the option the rows end up in, and how a row is turned into the configuration of an entity
+ROW_TYPES: dict[str, tuple[str, Callable[[dict], dict]]] = {
+    "speaker": ("speaker_configuration", create_speaker),
+    "speaker_group": ("speaker_group_configuration", create_speaker_group),
+    "source": ("source_configuration", create_source),
+    "route": ("route_configuration", create_route),
+    "router": ("router_configuration", create_router),
+    "meter": ("meter_configuration", create_meter),
+}
+
+
+def decode_import(data: bytes) -> str:
+    # Excel saves "CSV UTF-8" with a byte order mark, and plain "CSV" in the Windows code page
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1252")
+
+
+def read_rows(content: str) -> Iterator[tuple[int, dict]]:
+    # Spreadsheet programs like to start their exports with a byte order mark
+    content = content.removeprefix("\ufeff")
+
+    if content.lstrip().startswith(("[", "{")):
+        rows = json.loads(content)
+        if not isinstance(rows, list):
+            raise ValueError("A JSON import must be a list of rows")
+
+        yield from enumerate(rows, 1)
+        return
+
+    reader = csv.DictReader(io.StringIO(content))
+    if not reader.fieldnames or "type" not in reader.fieldnames:
+        raise ValueError("A CSV import must start with a header row that has a type column")
+
+    # Row numbers are line numbers, so that they match what a spreadsheet shows
+    for row in reader:
+        yield reader.line_num, row
+
+
+def parse_import(content: str) -> ImportResult:
+    """Turns the rows of the file into entity configurations. Rows with errors are reported and left out."""
+    result = ImportResult()
+
+    try:
+        for row_number, row in read_rows(content):
+            result.rows += 1
+            if not isinstance(row, dict):
+                result.errors.append(ImportRowError(row_number, "a row must be an object"))
+                continue
+
+            row_type = str(row.get("type") or "").strip().lower()
+            if row_type not in ROW_TYPES:
+                result.errors.append(
+                    ImportRowError(row_number, f"unknown type '{row_type}', expected one of {', '.join(ROW_TYPES)}")
+                )
+                continue
+
+            option, create_item = ROW_TYPES[row_type]
+            try:
+                item = create_item(row)
+            except ValueError as e:
+                result.errors.append(ImportRowError(row_number, str(e)))
+            else:
+                result.configuration.setdefault(option, []).append(item)
+    except (ValueError, csv.Error) as e:
+        # The file as a whole couldn't be read, e.g. invalid JSON
+        result.errors.append(ImportRowError(None, str(e)))
+
+    return result
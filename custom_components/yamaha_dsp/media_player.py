@@ -1,59 +1,120 @@
+import asyncio
 import logging
 
-from bidict import bidict
+from functools import partial
+
+import voluptuous as vol
+
 from homeassistant.components.media_player import (
+    ATTR_MEDIA_VOLUME_LEVEL,
     MediaPlayerDeviceClass,
     MediaPlayerEntity,
     MediaPlayerEntityFeature,
     MediaPlayerState,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.device_registry import DeviceInfo
 
 from custom_components.yamaha_dsp import (
+    DspConfiguration,
     EntityType,
     RuntimeData,
     SourceConfiguration,
     SpeakerConfiguration,
-    YamahaDspDevice,
+    SpeakerGroupConfiguration,
     create_unique_id,
 )
-from custom_components.yamaha_dsp.yamaha.command import create_index_parameter
+from custom_components.yamaha_dsp.const import (
+    ATTR_DURATION,
+    MAX_FADE_DURATION,
+    SERVICE_FADE_VOLUME,
+    VOLUME_STEP_DB,
+)
+from custom_components.yamaha_dsp.coordinator import YamahaDspCoordinator
+from custom_components.yamaha_dsp.entity import ConfiguredEntities, YamahaDspEntity
+from custom_components.yamaha_dsp.yamaha.batch import ParameterWrite
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType, create_index_parameter
+from custom_components.yamaha_dsp.yamaha.fader import FaderCurve
+from custom_components.yamaha_dsp.yamaha.response import ResponseError
 
 logger = logging.getLogger(__name__)
 
 
-async def async_setup_entry(_hass: HomeAssistant, entry, async_add_entities):
+async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     # Extract stored runtime data
     runtime_data: RuntimeData = entry.runtime_data
-    device = runtime_data.device
+    coordinator = runtime_data.coordinator
     device_info = runtime_data.device_info
-    dsp_configuration = runtime_data.dsp_configuration
 
-    # Add entities for each speaker
-    for speaker_configuration in dsp_configuration.speakers:
-        async_add_entities([SpeakerEntity(speaker_configuration, device, device_info)])
+    # Add entities for each speaker, speaker group and source
+    def create_entities(dsp_configuration: DspConfiguration) -> list[YamahaDspEntity]:
+        return [
+            *[SpeakerEntity(config, coordinator, device_info) for config in dsp_configuration.speakers],
+            *[SpeakerGroupEntity(config, coordinator, device_info) for config in dsp_configuration.speaker_groups],
+            *[SourceEntity(config, coordinator, device_info) for config in dsp_configuration.sources],
+        ]
+
+    ConfiguredEntities(async_add_entities, create_entities).async_setup(hass, entry, runtime_data.dsp_configuration)
+
+    # Fades of several entities in the same service call run side by side
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_FADE_VOLUME,
+        {
+            vol.Required(ATTR_MEDIA_VOLUME_LEVEL): cv.small_float,
+            vol.Required(ATTR_DURATION): vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_FADE_DURATION)),
+        },
+        "async_fade_volume",
+    )
+
 
-    # Add entities for each source
-    for source_configuration in dsp_configuration.sources:
-        async_add_entities([SourceEntity(source_configuration, device, device_info)])
+def scale_member_volumes(
+    offsets: dict[str, float | None], target_db: float | None, faders: dict[str, FaderCurve]
+) -> dict[str, int]:
+    """
+    Normalized member volumes for the given group level, with each member at its offset in dB from it. Members that
+    were turned all the way down on their own stay there, and the others don't go below the quietest step.
+    """
+    scaled = {}
+    for parameter, offset in offsets.items():
+        fader = faders[parameter]
+        if target_db is None or offset is None:
+            scaled[parameter] = 0
+        else:
+            scaled[parameter] = fader.normalized_from_db(max(target_db + offset, fader.minimum_raw / 100))
+
+    return scaled
 
 
-class YamahaDspMediaPlayerEntity(MediaPlayerEntity):
-    def __init__(self, device: YamahaDspDevice, device_info: DeviceInfo, index_volume: int, index_mute: int):
-        self._device = device
-        self._device_info = device_info
+class YamahaDspMediaPlayerEntity(YamahaDspEntity, MediaPlayerEntity):
+    def __init__(
+        self,
+        coordinator: YamahaDspCoordinator,
+        device_info: DeviceInfo,
+        index_volume: int,
+        index_mute: int,
+        fader: FaderCurve,
+    ):
+        super().__init__(coordinator, device_info)
 
         self._state = MediaPlayerState.ON
+        self._fader = fader
         self._volume = 0
         self._muted = False
 
         self._volume_param = create_index_parameter(index_volume)
         self._mute_param = create_index_parameter(index_mute)
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        return self._device_info
+        self._register_parameter(self._volume_param, ParameterValueType.NORMALIZED, self._set_volume_from_value)
+        self._register_parameter(self._mute_param, ParameterValueType.RAW, self._set_muted_from_value)
+
+    def _set_volume_from_value(self, value: str) -> None:
+        self._volume = int(value)
+
+    def _set_muted_from_value(self, value: str) -> None:
+        self._muted = not bool(int(value))
 
     @property
     def state(self) -> MediaPlayerState:
@@ -63,43 +124,62 @@ class YamahaDspMediaPlayerEntity(MediaPlayerEntity):
     def volume_level(self) -> float:
         return self._volume / 1000 if self._volume > 0 else 0
 
-    @property
-    def volume_step(self) -> float:
-        return 0.05
-
     @property
     def is_volume_muted(self) -> bool:
         return self._muted
 
-    async def async_update(self) -> None:
-        volume_resp = await self._device.query_parameter_normalized(self._volume_param)
-        self._volume = volume_resp.get_int_value()
-        is_on_resp = await self._device.query_parameter_raw(self._mute_param)
-        self._muted = not is_on_resp.get_bool_value()
+    @property
+    def extra_state_attributes(self) -> dict:
+        # The level is only polled as a normalized value, the dB value is converted locally
+        return {"volume_db": self._fader.db_from_normalized(self._volume)}
 
     async def async_mute_volume(self, mute: bool) -> None:
-        await self._device.set_parameter_raw(self._mute_param, "0", "0", "0" if mute else "1")
+        await self._device.set_parameter_raw(self._mute_param, "0", "0", "0" if mute else "1", coalesce=True)
 
     async def async_set_volume_level(self, volume: float) -> None:
-        await self._device.set_parameter_normalized(self._volume_param, "0", "0", str(int(volume * 1000)))
+        # Setting the volume by hand stops a fade, otherwise the fade would undo it right away
+        self._device.cancel_fade(self._volume_param)
+        await self._device.set_parameter_normalized(
+            self._volume_param, "0", "0", str(int(volume * 1000)), coalesce=True
+        )
+
+    async def async_volume_up(self) -> None:
+        await self._async_step_volume(VOLUME_STEP_DB)
+
+    async def async_volume_down(self) -> None:
+        await self._async_step_volume(-VOLUME_STEP_DB)
+
+    async def async_fade_volume(self, volume_level: float, duration: float) -> None:
+        try:
+            await self._device.fade_parameters([self._volume_param], int(volume_level * 1000), duration, self._fader)
+        except (RuntimeError, ResponseError) as e:
+            raise HomeAssistantError(f"Unable to fade {self.name}: {e}") from e
+
+    async def _async_step_volume(self, step_db: float) -> None:
+        self._device.cancel_fade(self._volume_param)
+        volume = self._fader.step_normalized(self._volume, step_db)
+        await self._device.set_parameter_normalized(self._volume_param, "0", "0", str(volume), coalesce=True)
 
 
 class SpeakerEntity(YamahaDspMediaPlayerEntity):
-    def __init__(self, config: SpeakerConfiguration, device: YamahaDspDevice, device_info: DeviceInfo):
-        super().__init__(device, device_info, config.index_volume, config.index_mute)
+    def __init__(self, config: SpeakerConfiguration, coordinator: YamahaDspCoordinator, device_info: DeviceInfo):
+        super().__init__(coordinator, device_info, config.index_volume, config.index_mute, config.fader)
         self._config = config
 
         self._source = None
-        self._source_bidict = bidict(
-            {i + 1: self._config.available_inputs[i] for i in range(len(self._config.available_inputs))}
-        )
+        self._source_bidict = coordinator.registry.source_map(self._config.available_inputs)
 
         self._source_param = create_index_parameter(self._config.index_source)
+        self._register_parameter(self._source_param, ParameterValueType.RAW, self._set_source_from_value)
+
+    def _set_source_from_value(self, value: str) -> None:
+        self._source = self._source_bidict.get(int(value))
 
     _attr_device_class = MediaPlayerDeviceClass.SPEAKER
     _attr_supported_features = (
         MediaPlayerEntityFeature.VOLUME_MUTE
         | MediaPlayerEntityFeature.VOLUME_SET
+        | MediaPlayerEntityFeature.VOLUME_STEP
         | MediaPlayerEntityFeature.SELECT_SOURCE
     )
 
@@ -119,28 +199,26 @@ class SpeakerEntity(YamahaDspMediaPlayerEntity):
     def source_list(self) -> list[str]:
         return list(self._source_bidict.values())
 
-    async def async_update(self) -> None:
-        await super().async_update()
-
-        source_resp = await self._device.query_parameter_raw(self._source_param)
-        self._source = self._source_bidict.get(source_resp.get_int_value())
-
     async def async_select_source(self, source: str) -> None:
         source_idx = self._source_bidict.inverse.get(source)
         if source_idx is None:
             logger.error(f"Asked to switch to invalid source {source}")
         else:
             logger.debug(f"Switching source on {self.name} to {source} ({source_idx})")
-            await self._device.set_parameter_raw(self._source_param, "0", "0", str(source_idx))
+            await self._device.set_parameter_raw(self._source_param, "0", "0", str(source_idx), coalesce=True)
 
 
 class SourceEntity(YamahaDspMediaPlayerEntity):
-    def __init__(self, config: SourceConfiguration, device: YamahaDspDevice, device_info: DeviceInfo):
-        super().__init__(device, device_info, config.index_volume, config.index_mute)
+    def __init__(self, config: SourceConfiguration, coordinator: YamahaDspCoordinator, device_info: DeviceInfo):
+        super().__init__(coordinator, device_info, config.index_volume, config.index_mute, config.fader)
         self._config = config
 
     _attr_device_class = MediaPlayerDeviceClass.SPEAKER
-    _attr_supported_features = MediaPlayerEntityFeature.VOLUME_MUTE | MediaPlayerEntityFeature.VOLUME_SET
+    _attr_supported_features = (
+        MediaPlayerEntityFeature.VOLUME_MUTE
+        | MediaPlayerEntityFeature.VOLUME_SET
+        | MediaPlayerEntityFeature.VOLUME_STEP
+    )
 
     @property
     def name(self) -> str:
@@ -153,3 +231,193 @@ class SourceEntity(YamahaDspMediaPlayerEntity):
     @property
     def icon(self) -> str:
         return "mdi:volume-source"
+
+
+class SpeakerGroupEntity(YamahaDspEntity, MediaPlayerEntity):
+    """
+    Controls the volume and mute of several speakers at once. The members keep their relative levels, and their
+    parameters are written in one pipelined batch so that large groups change all at once instead of zone by zone.
+
+    The balance is kept as the offset in dB of each member from the level of the group. Only a member changed on its
+    own changes its offset, so turning the group all the way down or below the quietest step of a member doesn't
+    lose the balance.
+    """
+
+    def __init__(self, config: SpeakerGroupConfiguration, coordinator: YamahaDspCoordinator, device_info: DeviceInfo):
+        super().__init__(coordinator, device_info)
+        self._config = config
+
+        self._state = MediaPlayerState.ON
+        # Normalized volume and muted state of each member, by parameter. Members sharing a parameter share an entry.
+        self._volumes: dict[str, int] = {}
+        self._muted: dict[str, bool] = {}
+        self._faders: dict[str, FaderCurve] = {}
+        # Offset of each member from the group level, None when the member was turned all the way down on its own
+        self._offsets: dict[str, float | None] = {}
+        # None when the group is all the way down
+        self._level_db: float | None = None
+        # The volumes the group last wrote, they come back from the device without changing the balance
+        self._written: dict[str, int] = {}
+        self._fades = 0
+        # The volume slider of the group follows the fader of its first speaker
+        self._fader = self._config.speakers[0].fader
+
+        for speaker in self._config.speakers:
+            volume_param = create_index_parameter(speaker.index_volume)
+            mute_param = create_index_parameter(speaker.index_mute)
+            self._volumes[volume_param] = 0
+            self._faders[volume_param] = speaker.fader
+            self._offsets[volume_param] = None
+            self._muted[mute_param] = False
+
+            self._register_parameter(
+                volume_param, ParameterValueType.NORMALIZED, partial(self._set_member_volume_from_value, volume_param)
+            )
+            self._register_parameter(
+                mute_param, ParameterValueType.RAW, partial(self._set_member_muted_from_value, mute_param)
+            )
+
+    def _set_member_volume_from_value(self, parameter: str, value: str) -> None:
+        self._volumes[parameter] = int(value)
+
+        # The steps of a fade are checked once it's over
+        if not self._fades and self._volumes[parameter] != self._written.get(parameter):
+            self._update_offset(parameter)
+
+    def _set_member_muted_from_value(self, parameter: str, value: str) -> None:
+        self._muted[parameter] = not bool(int(value))
+
+    def _update_offset(self, parameter: str) -> None:
+        member_db = self._faders[parameter].db_from_normalized(self._volumes[parameter])
+        if member_db is None:
+            self._offsets[parameter] = None
+        else:
+            if self._level_db is None:
+                # The group is all the way down, the member brings it back up to where the member's offset puts it
+                self._level_db = member_db - (self._offsets[parameter] or 0)
+            self._offsets[parameter] = member_db - self._level_db
+
+        if self._level_db is None:
+            return
+
+        # The group is as loud as its loudest member
+        loudest = max((offset for offset in self._offsets.values() if offset is not None), default=None)
+        if loudest is None:
+            self._level_db = None
+        else:
+            self._level_db += loudest
+            self._offsets = {
+                parameter: offset - loudest if offset is not None else None
+                for parameter, offset in self._offsets.items()
+            }
+
+    def _scale_volumes(self, target_db: float | None) -> dict[str, int]:
+        # Without any member turned up there's no balance to keep, they all follow the group
+        if target_db is not None and all(offset is None for offset in self._offsets.values()):
+            self._offsets = dict.fromkeys(self._offsets, 0.0)
+
+        self._level_db = target_db
+        targets = scale_member_volumes(self._offsets, target_db, self._faders)
+        self._written.update(targets)
+
+        return targets
+
+    _attr_device_class = MediaPlayerDeviceClass.SPEAKER
+    _attr_supported_features = (
+        MediaPlayerEntityFeature.VOLUME_MUTE
+        | MediaPlayerEntityFeature.VOLUME_SET
+        | MediaPlayerEntityFeature.VOLUME_STEP
+    )
+
+    @property
+    def name(self) -> str:
+        return f"{self._config.name} speaker group"
+
+    @property
+    def unique_id(self) -> str:
+        return create_unique_id(self._config.name, EntityType.SPEAKER_GROUP)
+
+    @property
+    def icon(self) -> str:
+        return "mdi:speaker-multiple"
+
+    @property
+    def state(self) -> MediaPlayerState:
+        return self._state
+
+    @property
+    def volume_level(self) -> float:
+        return self._fader.normalized_from_db(self._level_db) / 1000
+
+    @property
+    def is_volume_muted(self) -> bool:
+        return all(self._muted.values())
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return {"volume_db": self._level_db}
+
+    async def async_mute_volume(self, mute: bool) -> None:
+        value = "0" if mute else "1"
+        await self._async_write_members(
+            [ParameterWrite(ParameterValueType.RAW, parameter, value) for parameter in self._muted]
+        )
+
+    async def async_set_volume_level(self, volume: float) -> None:
+        await self._async_set_volume(self._fader.db_from_normalized(int(volume * 1000)))
+
+    async def async_volume_up(self) -> None:
+        await self._async_step_volume(VOLUME_STEP_DB)
+
+    async def async_volume_down(self) -> None:
+        await self._async_step_volume(-VOLUME_STEP_DB)
+
+    async def async_fade_volume(self, volume_level: float, duration: float) -> None:
+        targets = self._scale_volumes(self._fader.db_from_normalized(int(volume_level * 1000)))
+
+        # The fades of the members share the same time slots, so they still move together
+        self._fades += 1
+        try:
+            await asyncio.gather(
+                *[
+                    self._device.fade_parameters([parameter], target, duration, self._faders[parameter])
+                    for parameter, target in targets.items()
+                ]
+            )
+        except (RuntimeError, ResponseError) as e:
+            raise HomeAssistantError(f"Unable to fade {self.name}: {e}") from e
+        finally:
+            self._fades -= 1
+
+            # Members that didn't end up where the fade was headed were changed on their own in the meantime
+            if not self._fades:
+                for parameter, volume in self._volumes.items():
+                    if volume != self._written.get(parameter):
+                        self._update_offset(parameter)
+
+    async def _async_step_volume(self, step_db: float) -> None:
+        volume = self._fader.normalized_from_db(self._level_db)
+        await self._async_set_volume(self._fader.db_from_normalized(self._fader.step_normalized(volume, step_db)))
+
+    async def _async_set_volume(self, target_db: float | None) -> None:
+        for parameter in self._volumes:
+            self._device.cancel_fade(parameter)
+
+        # Members that are already at their level are left alone
+        targets = self._scale_volumes(target_db)
+        await self._async_write_members(
+            [
+                ParameterWrite(ParameterValueType.NORMALIZED, parameter, str(target))
+                for parameter, target in targets.items()
+                if target != self._volumes[parameter]
+            ]
+        )
+
+    async def _async_write_members(self, writes: list[ParameterWrite]) -> None:
+        results = await self._device.set_parameters(writes, coalesce=True)
+
+        if failed := [result for result in results if not result.success]:
+            details = ", ".join(f"{result.write.parameter}: {result.error}" for result in failed)
+            raise HomeAssistantError(
+                f"Unable to set {len(failed)} of {len(results)} parameters of {self.name} ({details})"
+            )
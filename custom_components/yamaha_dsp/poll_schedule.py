@@ -0,0 +1,122 @@
+import logging
+import math
+
+from collections.abc import Collection
+from dataclasses import dataclass
+
+from custom_components.yamaha_dsp.registry import PolledParameter
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+
+# Seconds between polls of a parameter that has just changed
+POLL_MIN_INTERVAL = 5.0
+# Seconds between polls of a parameter that hasn't changed for a long time
+POLL_MAX_INTERVAL = 300.0
+# Seconds a parameter is polled at the minimum interval after it has last changed
+POLL_ACTIVE_PERIOD = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PollState:
+    interval: float
+    # Monotonic time at which the parameter should be polled next
+    next_poll: float
+    value: str | None = None
+    last_change: float = -math.inf
+    # The device sends a NOTIFY with the polled value when the parameter changes, polls are only a safety net
+    pushed: bool = False
+
+
+class PollSchedule:
+    """
+    Decides which parameters are polled when. Parameters that change are polled often, parameters that stay the same
+    less and less often, and parameters the device has been seen to NOTIFY about only every POLL_MAX_INTERVAL, in
+    case a NOTIFY was missed. Every poll is limited to a budget of commands per second, the most overdue parameters
+    go first.
+    """
+
+    def __init__(self, initial_interval: float, budget: float):
+        self._initial_interval = initial_interval
+        self.budget = budget
+        self._states: dict[PolledParameter, PollState] = {}
+        self._by_address: dict[str, list[PolledParameter]] = {}
+        self._last_poll: float | None = None
+
+    @property
+    def pushed_parameters(self) -> int:
+        return sum(state.pushed for state in self._states.values())
+
+    def set_parameters(self, polled_parameters: list[PolledParameter], now: float):
+        # Parameters that were already polled keep what has been learned about them, new ones are due right away
+        self._states = {
+            parameter: self._states.get(parameter) or PollState(self._initial_interval, now)
+            for parameter in polled_parameters
+        }
+        self._by_address = {}
+        for parameter in polled_parameters:
+            self._by_address.setdefault(parameter[1], []).append(parameter)
+
+    def reset(self, now: float):
+        # Whether the device pushes a parameter has to be confirmed again on every connection
+        for state in self._states.values():
+            state.pushed = False
+            state.next_poll = now
+
+    def due(self, now: float) -> list[PolledParameter]:
+        # The budget covers the time since the previous poll, so that a late poll catches up a little, but a long
+        # pause doesn't turn into a burst
+        elapsed = now - self._last_poll if self._last_poll is not None else POLL_MIN_INTERVAL
+        self._last_poll = now
+        limit = max(1, math.floor(self.budget * min(elapsed, 2 * POLL_MIN_INTERVAL)))
+
+        due = [(state.next_poll, parameter) for parameter, state in self._states.items() if self._is_due(state, now)]
+        due.sort(key=lambda item: item[0])
+        if len(due) > limit:
+            logger.debug(f"{len(due)} parameters are due, polling the {limit} most overdue")
+
+        return [parameter for _, parameter in due[:limit]]
+
+    def record_poll(self, parameter: PolledParameter, value: str, now: float):
+        if (state := self._states.get(parameter)) is None:
+            return
+
+        # Until there's a previous value to compare to, the parameter keeps its initial interval. Pushed parameters
+        # are kept current by the device, whatever the poll finds.
+        if state.pushed:
+            state.interval = POLL_MAX_INTERVAL
+        elif state.value is not None:
+            if value != state.value:
+                state.last_change = now
+
+            if now - state.last_change < POLL_ACTIVE_PERIOD:
+                state.interval = POLL_MIN_INTERVAL
+            else:
+                # Back off further every time the value turns out to be the same
+                state.interval = min(state.interval * 2, POLL_MAX_INTERVAL)
+
+        state.value = value
+        state.next_poll = now + state.interval
+
+    def record_change(self, address: str, pushed_types: Collection[ParameterValueType], now: float):
+        """
+        Called when the device reports a new value for the parameter, either in a NOTIFY or in reply to a set.
+        pushed_types are the types of value a NOTIFY brought, a level polled as a normalized value isn't covered by
+        a NOTIFY that only has its raw value.
+        """
+        for parameter in self._by_address.get(address, []):
+            state = self._states[parameter]
+            state.pushed = state.pushed or parameter[0] in pushed_types
+            state.last_change = now
+
+            if state.pushed:
+                # The value just arrived, there's no need to poll it before the safety poll
+                state.interval = POLL_MAX_INTERVAL
+                state.next_poll = now + POLL_MAX_INTERVAL
+            else:
+                # The value is known to have changed, the next poll shows whether it's still changing
+                state.interval = POLL_MIN_INTERVAL
+                state.next_poll = min(state.next_poll, now + POLL_MIN_INTERVAL)
+
+    def _is_due(self, state: PollState, now: float) -> bool:
+        return state.next_poll <= now
@@ -0,0 +1,73 @@
+import logging
+
+from enum import Enum
+from functools import cached_property
+
+from bidict import bidict
+
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType, create_index_parameter
+
+# (value type, parameter), e.g. (ParameterValueType.NORMALIZED, "MTX:Index_47")
+PolledParameter = tuple[ParameterValueType, str]
+
+logger = logging.getLogger(__name__)
+
+
+class ParameterRole(Enum):
+    LEVEL = "level"
+    MUTE = "mute"
+    SOURCE = "source"
+    METER = "meter"
+
+
+# Roles whose parameters are polled, and the type of value that is polled
+POLLED_ROLES = {
+    ParameterRole.LEVEL: ParameterValueType.NORMALIZED,
+    ParameterRole.MUTE: ParameterValueType.RAW,
+    ParameterRole.SOURCE: ParameterValueType.RAW,
+}
+
+
+class ParameterRegistry:
+    """
+    The parameters used by the configured entities, compiled once per DSP configuration. Catches configuration
+    mistakes that would otherwise only show up as entities fighting over a parameter, or as entities that silently
+    go missing.
+    """
+
+    def __init__(self):
+        self._roles: dict[int, ParameterRole] = {}
+        # The entity that first used each index, for telling which entities clash
+        self._first_users: dict[int, str] = {}
+        self._unique_ids: set[str] = set()
+        self._source_maps: dict[tuple[str, ...], bidict] = {}
+
+    def add_entity(self, unique_id: str, parameters: list[tuple[int, ParameterRole]]):
+        # Entities are identified by their name and type, two entities with the same name would share a unique ID
+        if unique_id in self._unique_ids:
+            raise ValueError(f"Duplicate entity '{unique_id}', names must be unique")
+        self._unique_ids.add(unique_id)
+
+        for index, role in parameters:
+            existing_role = self._roles.setdefault(index, role)
+            other = self._first_users.setdefault(index, unique_id)
+            if existing_role is not role:
+                raise ValueError(
+                    f"Index {index} is used as {role.value} by '{unique_id}' but as {existing_role.value} by '{other}'"
+                )
+
+    @cached_property
+    def polled_parameters(self) -> list[PolledParameter]:
+        # Parameters shared by several entities are only fetched once
+        polled = [(POLLED_ROLES[role], index) for index, role in sorted(self._roles.items()) if role in POLLED_ROLES]
+        logger.debug(f"Polling {len(polled)} unique parameters used by {len(self._unique_ids)} entities")
+
+        return [(value_type, create_index_parameter(index)) for value_type, index in polled]
+
+    def source_map(self, labels: list[str]) -> bidict:
+        # Speakers usually share the default source list, so they share one map of it instead of each having a copy
+        key = tuple(labels)
+        if (source_map := self._source_maps.get(key)) is None:
+            source_map = self._source_maps[key] = bidict({number: label for number, label in enumerate(key, 1)})
+
+        return source_map
@@ -6,38 +6,48 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 
 from custom_components.yamaha_dsp import (
+    DspConfiguration,
     EntityType,
     RouterConfiguration,
     RuntimeData,
-    YamahaDspDevice,
     create_unique_id,
 )
-from custom_components.yamaha_dsp.yamaha.command import create_index_parameter
+from custom_components.yamaha_dsp.coordinator import YamahaDspCoordinator
+from custom_components.yamaha_dsp.entity import ConfiguredEntities, YamahaDspEntity
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType, create_index_parameter
 
 logger = logging.getLogger(__name__)
 
 
-async def async_setup_entry(_hass: HomeAssistant, entry, async_add_entities):
+async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     # Extract stored runtime data
     runtime_data: RuntimeData = entry.runtime_data
-    device = runtime_data.device
+    coordinator = runtime_data.coordinator
     device_info = runtime_data.device_info
-    dsp_configuration = runtime_data.dsp_configuration
 
     # Add entities for each router sink
-    for router_configuration in dsp_configuration.routers:
-        async_add_entities([RouterSelectEntity(router_configuration, device, device_info)])
+    def create_entities(dsp_configuration: DspConfiguration) -> list[RouterSelectEntity]:
+        return [RouterSelectEntity(config, coordinator, device_info) for config in dsp_configuration.routers]
 
+    ConfiguredEntities(async_add_entities, create_entities).async_setup(hass, entry, runtime_data.dsp_configuration)
 
-class RouterSelectEntity(SelectEntity):
-    def __init__(self, config: RouterConfiguration, device: YamahaDspDevice, device_info: DeviceInfo):
+
+class RouterSelectEntity(YamahaDspEntity, SelectEntity):
+    def __init__(self, config: RouterConfiguration, coordinator: YamahaDspCoordinator, device_info: DeviceInfo):
+        super().__init__(coordinator, device_info)
         self._config = config
-        self._device = device
-        self._device_info = device_info
 
         self._source_param = create_index_parameter(self._config.index_source)
         self._source_bidict = bidict({source.value: source.label for source in self._config.sources})
         self._current_option: str | None = None
+        self._register_parameter(self._source_param, ParameterValueType.RAW, self._set_current_option_from_value)
+
+    def _set_current_option_from_value(self, value: str) -> None:
+        source_value = int(value)
+        self._current_option = self._source_bidict.get(source_value)
+
+        if self._current_option is None:
+            logger.warning("Router %s returned unknown source value %s", self._config.name, source_value)
 
     @property
     def name(self) -> str:
@@ -51,10 +61,6 @@ class RouterSelectEntity(SelectEntity):
     def icon(self) -> str:
         return "mdi:router-network"
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        return self._device_info
-
     @property
     def options(self) -> list[str]:
         return list(self._source_bidict.values())
@@ -63,17 +69,9 @@ class RouterSelectEntity(SelectEntity):
     def current_option(self) -> str | None:
         return self._current_option
 
-    async def async_update(self) -> None:
-        source_response = await self._device.query_parameter_raw(self._source_param)
-        source_value = source_response.get_int_value()
-        self._current_option = self._source_bidict.get(source_value)
-
-        if self._current_option is None:
-            logger.warning("Router %s returned unknown source value %s", self._config.name, source_value)
-
     async def async_select_option(self, option: str) -> None:
         source_value = self._source_bidict.inverse.get(option)
         if source_value is None:
             raise ValueError(f"Invalid option '{option}' for router '{self._config.name}'")
 
-        await self._device.set_parameter_raw(self._source_param, "0", "0", str(source_value))
+        await self._device.set_parameter_raw(self._source_param, "0", "0", str(source_value), coalesce=True)
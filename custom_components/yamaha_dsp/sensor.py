@@ -0,0 +1,202 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_track_time_interval
+
+from custom_components.yamaha_dsp import (
+    DspConfiguration,
+    EntityType,
+    MeterConfiguration,
+    RuntimeData,
+    create_unique_id,
+)
+from custom_components.yamaha_dsp.const import POLL_TICK
+from custom_components.yamaha_dsp.coordinator import YamahaDspCoordinator, YamahaDspMeterCoordinator
+from custom_components.yamaha_dsp.entity import ConfiguredEntities, YamahaDspEntity, YamahaDspMeterEntity
+from custom_components.yamaha_dsp.yamaha.meter import MeterSummary
+from custom_components.yamaha_dsp.yamaha.stats import DeviceStatistics
+
+# Meter levels are relative to the full scale of the device
+UNIT_DBFS = "dBFS"
+
+
+@dataclass(frozen=True, kw_only=True)
+class StatisticsSensorEntityDescription(SensorEntityDescription):
+    value_fn: Callable[[DeviceStatistics], float | int | None]
+
+
+STATISTICS_SENSORS = (
+    StatisticsSensorEntityDescription(
+        key="command_latency_mean",
+        name="Command latency",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda statistics: statistics.latency.mean_ms,
+    ),
+    StatisticsSensorEntityDescription(
+        key="command_latency_p95",
+        name="Command latency (95th percentile)",
+        icon="mdi:timer-alert-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda statistics: statistics.latency.percentile_ms(95),
+    ),
+    StatisticsSensorEntityDescription(
+        key="command_timeouts",
+        name="Command timeouts",
+        icon="mdi:timer-off-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda statistics: statistics.timeouts,
+    ),
+    StatisticsSensorEntityDescription(
+        key="error_responses",
+        name="Error responses",
+        icon="mdi:alert-circle-outline",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda statistics: statistics.errors,
+    ),
+    StatisticsSensorEntityDescription(
+        key="reconnects",
+        name="Reconnects",
+        icon="mdi:lan-disconnect",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda statistics: statistics.reconnects,
+    ),
+    StatisticsSensorEntityDescription(
+        key="commands_in_flight",
+        name="Commands in flight",
+        icon="mdi:tray-full",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda statistics: statistics.in_flight,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MeterSensorEntityDescription(SensorEntityDescription):
+    value_fn: Callable[[MeterSummary], float]
+
+
+METER_SENSORS = (
+    MeterSensorEntityDescription(
+        key="peak",
+        name="peak level",
+        icon="mdi:waveform",
+        native_unit_of_measurement=UNIT_DBFS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda summary: summary.peak_db,
+    ),
+    MeterSensorEntityDescription(
+        key="rms",
+        name="RMS level",
+        icon="mdi:sine-wave",
+        native_unit_of_measurement=UNIT_DBFS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda summary: summary.rms_db,
+    ),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
+    # Extract stored runtime data
+    runtime_data: RuntimeData = entry.runtime_data
+    coordinator = runtime_data.coordinator
+    device_info = runtime_data.device_info
+    serial_number = runtime_data.product_information.serial_number
+
+    async_add_entities(
+        [
+            StatisticsSensorEntity(description, coordinator, device_info, serial_number)
+            for description in STATISTICS_SENSORS
+        ]
+    )
+
+    # Add level sensors for each meter
+    meter_coordinator = runtime_data.meter_coordinator
+
+    def create_entities(dsp_configuration: DspConfiguration) -> list[MeterSensorEntity]:
+        return [
+            MeterSensorEntity(description, config, meter_coordinator, device_info)
+            for config in dsp_configuration.meters
+            for description in METER_SENSORS
+        ]
+
+    ConfiguredEntities(async_add_entities, create_entities).async_setup(hass, entry, runtime_data.dsp_configuration)
+
+
+class StatisticsSensorEntity(YamahaDspEntity, SensorEntity):
+    # Diagnostics for the connection to the device, refreshed every poll tick
+    entity_description: StatisticsSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        description: StatisticsSensorEntityDescription,
+        coordinator: YamahaDspCoordinator,
+        device_info: DeviceInfo,
+        serial_number: str,
+    ):
+        super().__init__(coordinator, device_info)
+        self.entity_description = description
+        self._attr_unique_id = f"{serial_number}_{description.key}"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        # The coordinator only tells its entities about polls that changed a value, the statistics change regardless
+        self.async_on_remove(async_track_time_interval(self.hass, self._async_refresh, POLL_TICK))
+
+    @callback
+    def _async_refresh(self, _now) -> None:
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        # The statistics are interesting precisely when the device isn't responding
+        return True
+
+    @property
+    def native_value(self) -> float | int | None:
+        return self.entity_description.value_fn(self._device.statistics)
+
+
+class MeterSensorEntity(YamahaDspMeterEntity, SensorEntity):
+    entity_description: MeterSensorEntityDescription
+
+    def __init__(
+        self,
+        description: MeterSensorEntityDescription,
+        config: MeterConfiguration,
+        coordinator: YamahaDspMeterCoordinator,
+        device_info: DeviceInfo,
+    ):
+        super().__init__(config, coordinator, device_info)
+        self.entity_description = description
+
+    @property
+    def name(self) -> str:
+        return f"{self._config.name} {self.entity_description.name}"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{create_unique_id(self._config.name, EntityType.METER)}_{self.entity_description.key}"
+
+    @property
+    def native_value(self) -> float | None:
+        summary = self.summary
+
+        return self.entity_description.value_fn(summary) if summary is not None else None
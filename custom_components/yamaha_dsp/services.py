@@ -0,0 +1,187 @@
+import logging
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from custom_components.yamaha_dsp.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_NAME,
+    ATTR_PARAMETERS,
+    ATTR_ROLLBACK,
+    ATTR_SCENE,
+    DOMAIN,
+    SERVICE_APPLY_PARAMETERS,
+    SERVICE_DELETE_SNAPSHOT,
+    SERVICE_RESTORE_SNAPSHOT,
+    SERVICE_SNAPSHOT,
+)
+from custom_components.yamaha_dsp.yamaha.batch import ParameterWrite, ParameterWriteResult
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType, create_index_parameter
+
+if TYPE_CHECKING:
+    from custom_components.yamaha_dsp import RuntimeData, SceneParameterConfiguration
+
+logger = logging.getLogger(__name__)
+
+PARAMETER_SCHEMA = vol.Schema(
+    {
+        vol.Required("index"): vol.Coerce(int),
+        vol.Required("value"): vol.Coerce(str),
+        vol.Optional("type", default="raw"): vol.In(["raw", "normalized"]),
+    }
+)
+
+APPLY_PARAMETERS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+            vol.Exclusive(ATTR_SCENE, "parameters"): cv.string,
+            vol.Exclusive(ATTR_PARAMETERS, "parameters"): vol.All(cv.ensure_list, [PARAMETER_SCHEMA]),
+            vol.Optional(ATTR_ROLLBACK, default=False): cv.boolean,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_SCENE, ATTR_PARAMETERS),
+)
+
+SNAPSHOT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_NAME): cv.string,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant):
+    async def async_apply_parameters(call: ServiceCall) -> ServiceResponse:
+        entry = get_loaded_entry(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        runtime_data: RuntimeData = entry.runtime_data
+
+        if (scene_name := call.data.get(ATTR_SCENE)) is not None:
+            writes = create_scene_writes(runtime_data, scene_name)
+        else:
+            writes = [
+                ParameterWrite(
+                    ParameterValueType[parameter["type"].upper()],
+                    create_index_parameter(parameter["index"]),
+                    parameter["value"],
+                )
+                for parameter in call.data[ATTR_PARAMETERS]
+            ]
+
+        try:
+            results = await runtime_data.device.apply_parameters(writes, call.data[ATTR_ROLLBACK])
+        except RuntimeError as e:
+            raise HomeAssistantError(f"Unable to apply parameters: {e}") from e
+
+        return handle_write_results(call, results)
+
+    async def async_snapshot(call: ServiceCall):
+        entry = get_loaded_entry(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        runtime_data: RuntimeData = entry.runtime_data
+
+        # Raw values, normalized ones aren't exact enough to restore a level precisely
+        parameters = sorted({parameter for _, parameter in runtime_data.dsp_configuration.registry.polled_parameters})
+
+        try:
+            values = await runtime_data.device.query_parameters_raw(parameters)
+        except RuntimeError as e:
+            raise HomeAssistantError(f"Unable to take snapshot: {e}") from e
+
+        logger.debug(f"Took snapshot {call.data[ATTR_NAME]} of {len(values)} parameters")
+        runtime_data.store.async_save_snapshot(call.data[ATTR_NAME], values)
+
+    async def async_restore_snapshot(call: ServiceCall) -> ServiceResponse:
+        entry = get_loaded_entry(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        runtime_data: RuntimeData = entry.runtime_data
+
+        if (values := runtime_data.store.snapshots.get(call.data[ATTR_NAME])) is None:
+            raise ServiceValidationError(f"Unknown snapshot '{call.data[ATTR_NAME]}'")
+
+        writes = [ParameterWrite(ParameterValueType.RAW, parameter, value) for parameter, value in values.items()]
+
+        try:
+            # Only what changed since the snapshot is written
+            results = await runtime_data.device.apply_changed_parameters(writes)
+        except RuntimeError as e:
+            raise HomeAssistantError(f"Unable to restore snapshot: {e}") from e
+
+        return handle_write_results(call, results)
+
+    async def async_delete_snapshot(call: ServiceCall):
+        entry = get_loaded_entry(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+        runtime_data: RuntimeData = entry.runtime_data
+
+        if not runtime_data.store.async_delete_snapshot(call.data[ATTR_NAME]):
+            raise ServiceValidationError(f"Unknown snapshot '{call.data[ATTR_NAME]}'")
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_PARAMETERS,
+        async_apply_parameters,
+        schema=APPLY_PARAMETERS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_SNAPSHOT, async_snapshot, schema=SNAPSHOT_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE_SNAPSHOT,
+        async_restore_snapshot,
+        schema=SNAPSHOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_DELETE_SNAPSHOT, async_delete_snapshot, schema=SNAPSHOT_SCHEMA)
+
+
+def handle_write_results(call: ServiceCall, results: list[ParameterWriteResult]) -> ServiceResponse:
+    failed = [result for result in results if not result.success]
+    logger.debug(f"Applied {len(results) - len(failed)}/{len(results)} parameters")
+
+    # Callers that don't look at the response would never notice a partial failure
+    if failed and not call.return_response:
+        details = ", ".join(f"{result.write.parameter}: {result.error}" for result in failed)
+        raise HomeAssistantError(f"Unable to apply {len(failed)} of {len(results)} parameters ({details})")
+
+    return {"results": [result_as_dict(result) for result in results]}
+
+
+def get_loaded_entry(hass: HomeAssistant, entry_id: str | None) -> ConfigEntry:
+    # The config entry can be left out when there's only one device
+    entries = [entry for entry in hass.config_entries.async_entries(DOMAIN) if entry.state is ConfigEntryState.LOADED]
+    if entry_id is not None:
+        entries = [entry for entry in entries if entry.entry_id == entry_id]
+    elif len(entries) > 1:
+        raise ServiceValidationError("There are several devices, specify which one with config_entry_id")
+
+    if not entries:
+        raise ServiceValidationError("No loaded Yamaha DSP config entry found")
+
+    return entries[0]
+
+
+def create_scene_writes(runtime_data: "RuntimeData", scene_name: str) -> list[ParameterWrite]:
+    for scene in runtime_data.dsp_configuration.scenes:
+        if scene.name == scene_name:
+            return [create_scene_write(parameter) for parameter in scene.parameters]
+
+    raise ServiceValidationError(f"Unknown scene '{scene_name}'")
+
+
+def create_scene_write(parameter: "SceneParameterConfiguration") -> ParameterWrite:
+    return ParameterWrite(parameter.value_type, create_index_parameter(parameter.index), parameter.value)
+
+
+def result_as_dict(result: ParameterWriteResult) -> dict:
+    return {
+        "parameter": result.write.parameter,
+        "type": result.write.value_type.name.lower(),
+        "value": result.response.value if result.response is not None else result.write.value,
+        "success": result.success,
+        "error": str(result.error) if result.error is not None else None,
+        "rolled_back": result.rolled_back,
+    }
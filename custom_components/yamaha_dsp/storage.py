@@ -0,0 +1,99 @@
+import logging
+
+from dataclasses import asdict, dataclass, field
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from custom_components.yamaha_dsp.const import DOMAIN
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.device import ProductInformation
+
+STORAGE_VERSION = 1
+# Parameters change all the time, there's no need to write them to disk more often than this
+STORAGE_SAVE_DELAY = 60
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredState:
+    product_information: ProductInformation | None = None
+    # Last known value of each polled parameter, keyed like the coordinator data
+    parameters: dict[tuple[ParameterValueType, str], str] = field(default_factory=dict)
+    # Named snapshots of the raw values of every configured parameter
+    snapshots: dict[str, dict[str, str]] = field(default_factory=dict)
+
+
+class YamahaDspStore:
+    """Product information and the last known parameter values of a config entry, so that setup doesn't have to
+    wait for the device."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        self._store: Store[dict] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._state = StoredState()
+
+    async def async_load(self) -> StoredState:
+        data = await self._store.async_load()
+        if data is None:
+            return self._state
+
+        try:
+            if (product_information := data.get("product_information")) is not None:
+                self._state.product_information = ProductInformation(**product_information)
+
+            self._state.parameters = {
+                (ParameterValueType[value_type], parameter): value
+                for value_type, parameter, value in data.get("parameters", [])
+            }
+
+            self._state.snapshots = {
+                name: {parameter: str(value) for parameter, value in values.items()}
+                for name, values in data.get("snapshots", {}).items()
+            }
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            # Nothing in here is essential, start over rather than failing setup
+            logger.warning(f"Ignoring invalid stored state: {e}")
+            self._state = StoredState()
+
+        return self._state
+
+    def async_save_product_information(self, product_information: ProductInformation):
+        if product_information != self._state.product_information:
+            self._state.product_information = product_information
+            self._store.async_delay_save(self._data_to_save)
+
+    def async_save_parameters(self, parameters: dict[tuple[ParameterValueType, str], str]):
+        if parameters != self._state.parameters:
+            self._state.parameters = dict(parameters)
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @property
+    def snapshots(self) -> dict[str, dict[str, str]]:
+        return self._state.snapshots
+
+    def async_save_snapshot(self, name: str, values: dict[str, str]):
+        # Snapshots are taken on purpose, save right away rather than with the parameters
+        self._state.snapshots[name] = dict(values)
+        self._store.async_delay_save(self._data_to_save)
+
+    def async_delete_snapshot(self, name: str) -> bool:
+        if self._state.snapshots.pop(name, None) is None:
+            return False
+
+        self._store.async_delay_save(self._data_to_save)
+        return True
+
+    async def async_remove(self):
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict:
+        product_information = self._state.product_information
+
+        return {
+            "product_information": asdict(product_information) if product_information else None,
+            "parameters": [
+                [value_type.name, parameter, value] for (value_type, parameter), value in self._state.parameters.items()
+            ],
+            "snapshots": self._state.snapshots,
+        }
@@ -7,38 +7,44 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 
 from custom_components.yamaha_dsp import (
+    DspConfiguration,
     EntityType,
     RouteConfiguration,
     RuntimeData,
-    YamahaDspDevice,
     create_unique_id,
 )
-from custom_components.yamaha_dsp.yamaha.command import create_index_parameter
+from custom_components.yamaha_dsp.coordinator import YamahaDspCoordinator
+from custom_components.yamaha_dsp.entity import ConfiguredEntities, YamahaDspEntity
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType, create_index_parameter
 
 logger = logging.getLogger(__name__)
 
 
-async def async_setup_entry(_hass: HomeAssistant, entry, async_add_entities):
+async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     # Extract stored runtime data
     runtime_data: RuntimeData = entry.runtime_data
-    device = runtime_data.device
+    coordinator = runtime_data.coordinator
     device_info = runtime_data.device_info
-    dsp_configuration = runtime_data.dsp_configuration
 
     # Add entities for each route
-    for route_configuration in dsp_configuration.routes:
-        async_add_entities([RouteSwitchEntity(route_configuration, device, device_info)])
+    def create_entities(dsp_configuration: DspConfiguration) -> list[RouteSwitchEntity]:
+        return [RouteSwitchEntity(config, coordinator, device_info) for config in dsp_configuration.routes]
 
+    ConfiguredEntities(async_add_entities, create_entities).async_setup(hass, entry, runtime_data.dsp_configuration)
 
-class RouteSwitchEntity(SwitchEntity):
-    def __init__(self, config: RouteConfiguration, device: YamahaDspDevice, device_info: DeviceInfo):
+
+class RouteSwitchEntity(YamahaDspEntity, SwitchEntity):
+    def __init__(self, config: RouteConfiguration, coordinator: YamahaDspCoordinator, device_info: DeviceInfo):
+        super().__init__(coordinator, device_info)
         self._config = config
-        self._device = device
-        self._device_info = device_info
 
         self._switch_state = False
 
         self._mute_param = create_index_parameter(self._config.index_mute)
+        self._register_parameter(self._mute_param, ParameterValueType.RAW, self._set_switch_state_from_value)
+
+    def _set_switch_state_from_value(self, value: str) -> None:
+        self._switch_state = bool(int(value))
 
     _attr_device_class = SwitchDeviceClass.SWITCH
 
@@ -54,18 +60,10 @@ class RouteSwitchEntity(SwitchEntity):
     def icon(self) -> str:
         return "mdi:arrow-decision"
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        return self._device_info
-
     @property
     def is_on(self) -> bool:
         return self._switch_state
 
-    async def async_update(self) -> None:
-        param = await self._device.query_parameter_raw(self._mute_param)
-        self._switch_state = param.get_bool_value()
-
     async def async_turn_on(self, **kwargs: Any) -> None:
         await self._device.set_parameter_raw(self._mute_param, "0", "0", "1")
 
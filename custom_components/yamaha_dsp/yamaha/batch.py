@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.response import OkResponse
+
+
+@dataclass
+class ParameterWrite:
+    value_type: ParameterValueType
+    parameter: str
+    value: str
+
+
+@dataclass
+class ParameterWriteResult:
+    write: ParameterWrite
+    response: OkResponse | None = None
+    error: Exception | None = None
+    # The write succeeded but was undone because another write in the same batch failed
+    rolled_back: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
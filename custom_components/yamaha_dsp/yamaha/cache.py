@@ -0,0 +1,92 @@
+import logging
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+
+# (address, x, y), e.g. ("MTX:Index_47", "0", "0")
+ParameterKey = tuple[str, str, str]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ParameterState:
+    raw: str | None = None
+    normalized: str | None = None
+    text: str | None = None
+
+    def get_value(self, value_type: ParameterValueType) -> str | None:
+        return self.raw if value_type is ParameterValueType.RAW else self.normalized
+
+
+ParameterCallback = Callable[[ParameterKey, ParameterState], None]
+
+
+class ParameterCache:
+    """Last known parameter values, fed by query responses and NOTIFY messages from the device."""
+
+    def __init__(self):
+        self._states: dict[ParameterKey, ParameterState] = {}
+        self._subscribers: dict[ParameterKey, list[ParameterCallback]] = {}
+
+    def get(self, address: str, x: str = "0", y: str = "0") -> ParameterState | None:
+        return self._states.get((address, x, y))
+
+    def update(self, key: ParameterKey, value_type: ParameterValueType, value: str, text: str | None = None):
+        state = self._states.setdefault(key, ParameterState())
+        changed = False
+
+        # A new value in one representation makes the other one stale, even if the previous value of this
+        # representation wasn't known, e.g. a raw NOTIFY for a parameter that has only been polled normalized
+        if value_type is ParameterValueType.RAW:
+            if state.raw != value:
+                state.normalized = None
+                state.raw = value
+                changed = True
+        else:
+            if state.normalized != value:
+                state.raw = None
+                state.normalized = value
+                changed = True
+
+        if text is not None and state.text != text:
+            state.text = text
+            changed = True
+
+        if changed:
+            self._notify(key, state)
+
+    def invalidate(self):
+        # Forget everything we know, e.g. after a reconnect when notifications may have been missed.
+        # Subscribers get an empty state so that they know to query the device again.
+        self._states.clear()
+
+        for key in list(self._subscribers):
+            self._notify(key, ParameterState())
+
+    def subscribe(self, address: str, callback: ParameterCallback, x: str = "0", y: str = "0") -> Callable[[], None]:
+        key = (address, x, y)
+        self._subscribers.setdefault(key, []).append(callback)
+
+        return lambda: self.unsubscribe(address, callback, x, y)
+
+    def unsubscribe(self, address: str, callback: ParameterCallback, x: str = "0", y: str = "0"):
+        key = (address, x, y)
+        callbacks = self._subscribers.get(key)
+
+        if callbacks is None or callback not in callbacks:
+            return
+
+        callbacks.remove(callback)
+        if not callbacks:
+            del self._subscribers[key]
+
+    def _notify(self, key: ParameterKey, state: ParameterState):
+        # Copy the list, callbacks may unsubscribe themselves
+        for callback in list(self._subscribers.get(key, [])):
+            try:
+                callback(key, state)
+            except Exception:
+                logger.exception(f"Parameter subscriber for {key} raised an exception")
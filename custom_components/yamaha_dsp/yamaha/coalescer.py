@@ -0,0 +1,67 @@
+import asyncio
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from custom_components.yamaha_dsp.yamaha.response import OkResponse
+from custom_components.yamaha_dsp.yamaha.scheduler import CommandPriority
+
+# (address, x, y) of the parameter being written
+WriteKey = tuple[str, str, str]
+
+
+@dataclass
+class QueuedWrite:
+    command: str
+    priority: CommandPriority
+    result: asyncio.Future[OkResponse]
+
+
+class WriteCoalescer:
+    """
+    Latest-wins writes per parameter. While a write to a parameter is in flight, later writes replace the
+    queued value instead of piling up, so only the newest value is sent next. Callers whose value was
+    replaced get the response of the write that replaced it.
+    """
+
+    def __init__(self, run_command: Callable[[str, CommandPriority], Awaitable[OkResponse]]):
+        self._run_command = run_command
+        self._queued: dict[WriteKey, QueuedWrite] = {}
+        self._writers: dict[WriteKey, asyncio.Task] = {}
+
+    async def write(self, key: WriteKey, command: str, priority: CommandPriority) -> OkResponse:
+        queued = self._queued.get(key)
+
+        if queued is not None:
+            queued.command = command
+            queued.priority = min(queued.priority, priority)
+        else:
+            queued = QueuedWrite(command, priority, asyncio.get_running_loop().create_future())
+            self._queued[key] = queued
+
+            if key not in self._writers:
+                self._writers[key] = asyncio.create_task(self._write_queued(key))
+
+        # Shield the result, it's shared by every caller whose value ended up in this write
+        return await asyncio.shield(queued.result)
+
+    def cancel_all(self):
+        for writer in list(self._writers.values()):
+            writer.cancel()
+
+    async def _write_queued(self, key: WriteKey):
+        queued: QueuedWrite | None = None
+        try:
+            while (queued := self._queued.pop(key, None)) is not None:
+                try:
+                    queued.result.set_result(await self._run_command(queued.command, queued.priority))
+                except Exception as e:
+                    queued.result.set_exception(e)
+        finally:
+            del self._writers[key]
+
+            # Cancelled, e.g. on shutdown. Whoever waits for the write in flight or the one queued after it would
+            # otherwise wait forever.
+            for pending in (queued, self._queued.pop(key, None)):
+                if pending is not None and not pending.result.done():
+                    pending.result.cancel()
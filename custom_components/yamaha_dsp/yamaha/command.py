@@ -8,3 +8,10 @@ class ParameterValueType(Enum):
 
 def create_index_parameter(idx: int) -> str:
     return f"MTX:Index_{idx}"
+
+
+# Commands whose responses (and notifications) carry a parameter value, and the type of that value
+PARAMETER_QUERY_COMMANDS = {"get": ParameterValueType.RAW, "getn": ParameterValueType.NORMALIZED}
+PARAMETER_SET_COMMANDS = {"set": ParameterValueType.RAW, "setn": ParameterValueType.NORMALIZED}
+# Replies to both echo the value of the parameter, for a set the value the device actually accepted
+PARAMETER_VALUE_COMMANDS = PARAMETER_QUERY_COMMANDS | PARAMETER_SET_COMMANDS
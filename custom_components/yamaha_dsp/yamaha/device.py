@@ -1,18 +1,41 @@
 import asyncio
 import logging
+import random
+import socket
 
+from collections.abc import Callable
 from dataclasses import dataclass
 
 from pytelnetdevice import TelnetDevice
 
-from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.batch import ParameterWrite, ParameterWriteResult
+from custom_components.yamaha_dsp.yamaha.cache import ParameterCache
+from custom_components.yamaha_dsp.yamaha.coalescer import WriteCoalescer
+from custom_components.yamaha_dsp.yamaha.command import (
+    PARAMETER_SET_COMMANDS,
+    PARAMETER_VALUE_COMMANDS,
+    ParameterValueType,
+)
+from custom_components.yamaha_dsp.yamaha.fade import FadeEngine
+from custom_components.yamaha_dsp.yamaha.fader import FADER_10DB, FaderCurve
+from custom_components.yamaha_dsp.yamaha.inflight import InFlightTable, PendingCommand
+from custom_components.yamaha_dsp.yamaha.meter import (
+    METER_NOTIFY_PREFIX,
+    METER_RENEW_INTERVAL,
+    MeterKey,
+    MeterListener,
+    MeterSubscriptions,
+)
+from custom_components.yamaha_dsp.yamaha.reader import LineBuffer
 from custom_components.yamaha_dsp.yamaha.response import (
     NotifyResponse,
     OkResponse,
-    Response,
     ResponseError,
+    ValueResponse,
     parse_response,
 )
+from custom_components.yamaha_dsp.yamaha.scheduler import CommandPriority, PriorityWindow
+from custom_components.yamaha_dsp.yamaha.stats import DeviceStatistics
 
 
 @dataclass
@@ -28,116 +51,420 @@ class ProductInformation:
 
 logger = logging.getLogger(__name__)
 
+# Bytes to read from the connection at a time
+READ_CHUNK_SIZE = 65536
+
+# Seconds to wait between reconnection attempts, doubled after every failed attempt
+RECONNECT_MIN_DELAY = 1
+RECONNECT_MAX_DELAY = 60
+
+# Command used to check that an idle connection is still alive
+KEEPALIVE_PROBE = "devstatus runmode"
+# How many missed keepalive intervals it takes before the device drops the connection from its end
+DEVICE_KEEPALIVE_INTERVALS = 3
+TCP_KEEPALIVE_PROBES = 3
+
+ConnectionListener = Callable[[bool], None]
+# Called with the address of a parameter and whether the change was pushed by the device in a NOTIFY
+ParameterListener = Callable[[str, bool], None]
+
+
+def reconnect_delay(attempt: int) -> float:
+    # Exponential backoff with jitter, so that several integrations don't all hammer a rebooting device in sync
+    delay = min(RECONNECT_MIN_DELAY * 2**attempt, RECONNECT_MAX_DELAY)
+
+    return random.uniform(delay / 2, delay)
+
 
 class YamahaDspDevice(TelnetDevice):
-    def __init__(self, host: str, port: int, timeout: int = 5):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float = 5,
+        pipeline_window: int = 1,
+        keepalive_interval: float | None = None,
+    ):
         super().__init__(host, port)
         self._timeout = timeout
         self._response_listener_task: asyncio.Task | None = None
-        self._last_command_response: Response | Exception | None = None
-        self._command_response_received = asyncio.Event()
+
+        # Seconds of silence after which the connection is checked, None to only find out when a command fails
+        self._keepalive_interval = keepalive_interval
+        self._keepalive_task: asyncio.Task | None = None
+        self._last_sent = 0.0
+        self._last_received = 0.0
+        self._parameter_cache = ParameterCache()
+
+        # Commands that have been written but not yet answered. The window limits how many commands can be
+        # in flight at once, 1 means strictly one command per round-trip. Waiting commands are sent in order of
+        # priority.
+        self._in_flight = InFlightTable(abandoned_grace_period=timeout)
+        self._pipeline_window = PriorityWindow(pipeline_window)
+        self._supervisor_task: asyncio.Task | None = None
+        self._connection_lost = asyncio.Event()
+        self._connection_listeners: list[ConnectionListener] = []
+        self._parameter_listeners: list[ParameterListener] = []
+        self._write_coalescer = WriteCoalescer(self._run_command)
+        self._fade_engine = FadeEngine(self._query_fade_level, self._set_fade_level)
+        self._meters_changed = asyncio.Event()
+        self._meters = MeterSubscriptions(self._meters_changed.set)
+        self._meter_task: asyncio.Task | None = None
+        self._statistics = DeviceStatistics()
+
+    @property
+    def parameter_cache(self) -> ParameterCache:
+        return self._parameter_cache
+
+    @property
+    def statistics(self) -> DeviceStatistics:
+        return self._statistics
+
+    @property
+    def connected(self) -> bool:
+        return self._connected and not self._connection_lost.is_set()
+
+    def add_connection_listener(self, listener: ConnectionListener) -> Callable[[], None]:
+        """Calls the listener with True whenever the connection has been (re-)established, False when it's lost."""
+        self._connection_listeners.append(listener)
+
+        return lambda: self._connection_listeners.remove(listener)
+
+    def add_parameter_listener(self, listener: ParameterListener) -> Callable[[], None]:
+        """Calls the listener whenever a parameter is changed, either by a set of ours or by a NOTIFY."""
+        self._parameter_listeners.append(listener)
+
+        return lambda: self._parameter_listeners.remove(listener)
+
+    def start(self):
+        """Starts a task that connects to the device and keeps reconnecting whenever the connection is lost."""
+        if self._supervisor_task is None:
+            self._supervisor_task = asyncio.create_task(self._supervise())
+
+    async def stop(self):
+        self._fade_engine.cancel_all()
+        self._write_coalescer.cancel_all()
+
+        if self._supervisor_task is not None:
+            self._supervisor_task.cancel()
+            self._supervisor_task = None
+
+        if self._connected:
+            await self.disconnect()
+
+    async def _supervise(self):
+        attempt = 0
+
+        while True:
+            if not self._connected:
+                try:
+                    await self.connect()
+                except (OSError, RuntimeError, ResponseError) as e:
+                    # The connection may have been opened even though the handshake failed, e.g. the device answered
+                    # with an error while it's still starting up
+                    if self._connected:
+                        await self.disconnect()
+
+                    delay = reconnect_delay(attempt)
+                    attempt += 1
+                    logger.warning(f"Unable to connect to {self._host}:{self._port}, retrying in {delay:.1f} s: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+
+            attempt = 0
+            self._notify_connection_listeners(True)
+
+            await self._connection_lost.wait()
+            logger.error("Connection to the device was lost, reconnecting")
+            await self.disconnect()
+            self._notify_connection_listeners(False)
+
+    def _notify_connection_listeners(self, connected: bool):
+        for listener in list(self._connection_listeners):
+            try:
+                listener(connected)
+            except Exception:
+                logger.exception("Error in connection listener")
 
     async def after_connect(self):
+        self._connection_lost.clear()
+
         # Start the response listener
         self._response_listener_task = asyncio.create_task(self._response_listener())
 
-        # A handshake must be performed before the device will accept commands
+        # A handshake must be performed before the device will accept commands. Only a connection that got this
+        # far counts as a connect.
         await self._perform_handshake()
+        self._statistics.record_connect()
+
+        if self._keepalive_interval is not None:
+            await self._enable_keepalive()
+
+        # Meters aren't remembered by the device across connections
+        self._meter_task = asyncio.create_task(self._renew_meters())
+
+        # We may have missed notifications while disconnected
+        self._parameter_cache.invalidate()
 
     async def before_disconnect(self):
-        # Cancel the response listener task
-        self._response_listener_task.cancel()
+        # Cancel the response listener and keepalive tasks
+        if self._response_listener_task is not None:
+            self._response_listener_task.cancel()
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if self._meter_task is not None:
+            self._meter_task.cancel()
+            self._meter_task = None
+
+        # Commands waiting for a response won't get one on this connection
+        self._in_flight.fail_all(ConnectionAbortedError("Connection was closed"))
 
     async def _response_listener(self):
+        line_buffer = LineBuffer()
+
         while True:
-            raw_resp = await self._read_until("\n")
+            # The device often sends many lines at once, e.g. during scene recalls. Read everything that is
+            # available and handle all complete lines before waiting for more.
+            try:
+                data = await self._reader.read(READ_CHUNK_SIZE)
+            except OSError as e:
+                logger.debug(f"Reading from the device failed: {e}")
+                data = b""
 
             # Exit the loop if we read nothing, the other layers will
             # handle the underlying error
-            if raw_resp is None:
+            if not data:
+                self._in_flight.fail_all(ConnectionResetError("Connection was reset"))
+                self._connection_lost.set()
                 return
 
-            try:
-                resp = parse_response(raw_resp)
+            self._last_received = asyncio.get_running_loop().time()
 
-                if isinstance(resp, NotifyResponse):
-                    await self._handle_notify_response(resp)
-                else:
-                    self._last_command_response = resp
-                    self._command_response_received.set()
-            except ValueError as e:
-                logger.error(f"Response listener received a response it couldn't handle: {e}")
-                self._last_command_response = e
-                self._command_response_received.set()
-
-    @staticmethod
-    async def _handle_notify_response(response: NotifyResponse):
+            for raw_resp in line_buffer.feed(data):
+                self._handle_response_line(raw_resp)
+
+            self._statistics.record_in_flight(len(self._in_flight))
+
+    def _handle_response_line(self, raw_resp: str):
+        try:
+            # Meters can stream many lines a second, they bypass the parser and the parameter cache
+            if raw_resp.startswith(METER_NOTIFY_PREFIX):
+                self._meters.dispatch(raw_resp)
+                return
+
+            resp = parse_response(raw_resp)
+
+            if isinstance(resp, NotifyResponse):
+                self._handle_notify_response(resp)
+            else:
+                # Update the cache before resolving the command, so that whoever awaits a set sees the new
+                # state as soon as the set returns, without having to read the parameter back
+                if isinstance(resp, OkResponse):
+                    self._update_parameter_cache(resp, PARAMETER_VALUE_COMMANDS)
+                    self._notify_parameter_listeners(resp, False)
+
+                if not self._in_flight.resolve(resp):
+                    logger.warning(f"Received a response that doesn't match any pending command: {raw_resp}")
+        except ValueError as e:
+            # We can't tell which command this was for, so don't guess. The command will time out.
+            logger.error(f"Response listener received a response it couldn't handle: {e}")
+
+    def _handle_notify_response(self, response: NotifyResponse):
         logger.debug(f"Got NOTIFY response: {response.raw_response}")
 
-    async def _send_command(self, command):
+        self._update_parameter_cache(response, PARAMETER_SET_COMMANDS)
+        self._notify_parameter_listeners(response, True)
+
+    def _notify_parameter_listeners(self, response: ValueResponse, pushed: bool):
+        # Only changes count, not the replies to queries
+        parsed = response.parsed_response
+        if len(parsed) < 3 or parsed[1] not in PARAMETER_SET_COMMANDS:
+            return
+
+        for listener in list(self._parameter_listeners):
+            try:
+                listener(parsed[2], pushed)
+            except Exception:
+                logger.exception("Error in parameter listener")
+
+    def _update_parameter_cache(self, response: ValueResponse, commands: dict[str, ParameterValueType]):
+        # e.g. NOTIFY set MTX:Index_47 0 0 -1200 "-12.00", OK getn MTX:Index_47 0 0 700 or
+        # OKm setn MTX:Index_47 0 0 1000 "10.00"
+        parsed = response.parsed_response
+        if len(parsed) < 6 or parsed[1] not in commands:
+            return
+
+        value_type = commands[parsed[1]]
+        text = parsed[6] if len(parsed) > 6 else None
+
+        self._parameter_cache.update((parsed[2], parsed[3], parsed[4]), value_type, parsed[5], text)
+
+    def _send_command(self, command: str) -> PendingCommand:
+        # Register the command before writing it so that a fast response always finds it. Writing is
+        # synchronous, so commands are written in the same order as they are registered.
+        pending = self._in_flight.register(command)
         self._writer.write(f"{command}\n".encode())
-        await self._writer.drain()
+        self._last_sent = asyncio.get_running_loop().time()
+        self._statistics.record_in_flight(len(self._in_flight))
+
+        return pending
+
+    async def _run_command(self, command: str, priority: CommandPriority = CommandPriority.STATE) -> OkResponse:
+        pending: PendingCommand | None = None
+        verb = command.split(" ", 1)[0]
+        loop = asyncio.get_running_loop()
 
-    async def _wait_for_response(self):
-        await self._command_response_received.wait()
+        # Fail fast while the connection is down instead of piling up behind the pipeline window
+        if not self.connected:
+            raise RuntimeError("Not connected")
 
-    async def _run_command(self, command: str) -> OkResponse:
         try:
-            async with self._semaphore:
+            async with self._pipeline_window.slot(priority):
                 logger.debug(f"Sending command: {command}")
                 # Send the command
-                await asyncio.wait_for(self._send_command(command), self._timeout)
+                sent_at = loop.time()
+                pending = self._send_command(command)
+                await asyncio.wait_for(self._writer.drain(), self._timeout)
 
                 # Wait for the response
-                await asyncio.wait_for(self._wait_for_response(), self._timeout)
-                resp = self._last_command_response
-                self._command_response_received.clear()
+                resp = await asyncio.wait_for(asyncio.shield(pending.future), self._timeout)
 
-                if isinstance(resp, OkResponse):
+                is_ok = isinstance(resp, OkResponse)
+                self._statistics.record_response(verb, (loop.time() - sent_at) * 1000, error=not is_ok)
+
+                if is_ok:
                     logger.debug(f"Received response: {resp.raw_response}")
                     return resp
-                elif isinstance(resp, Exception):
-                    raise ResponseError(resp) from resp
                 else:
                     raise ResponseError(resp)
         except TimeoutError:
+            self._statistics.record_timeout(verb)
             raise RuntimeError("Command timed out")
+        except ConnectionAbortedError:
+            self._statistics.record_connection_failure(verb)
+            raise RuntimeError("Connection was closed")
         except (ConnectionResetError, BrokenPipeError):
-            await self.disconnect()
+            self._statistics.record_connection_failure(verb)
+            # Reconnecting is up to the supervisor
+            self._connection_lost.set()
             raise RuntimeError("Connection was reset")
         finally:
-            if not self._connected:
-                logger.error("Connection seems to be broken, will attempt to reconnect")
-                await self.reconnect()
+            # Timed out or cancelled while waiting, make sure a late response can't reach anyone else
+            if pending is not None and not pending.future.done():
+                self._in_flight.abandon(pending)
 
     async def _perform_handshake(self):
         await self._run_command("devstatus runmode")
 
+    async def _enable_keepalive(self):
+        interval = self._keepalive_interval
+
+        # Let the OS detect a dead peer too, in case we're not the ones sending
+        if (sock := self._writer.get_extra_info("socket")) is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            for option, value in (
+                ("TCP_KEEPIDLE", max(1, int(interval))),
+                ("TCP_KEEPINTVL", max(1, int(interval))),
+                ("TCP_KEEPCNT", TCP_KEEPALIVE_PROBES),
+            ):
+                if hasattr(socket, option):
+                    sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+
+        # Have the device drop our session if it stops hearing from us, otherwise a half-open connection can
+        # occupy one of its few connection slots
+        try:
+            await self._run_command(f"scpmode keepalive {int(interval * DEVICE_KEEPALIVE_INTERVALS * 1000)}")
+        except ResponseError as e:
+            logger.debug(f"Device doesn't support keepalive: {e}")
+
+        loop = asyncio.get_running_loop()
+        self._last_sent = self._last_received = loop.time()
+        self._keepalive_task = asyncio.create_task(self._keepalive())
+
+    async def _keepalive(self):
+        loop = asyncio.get_running_loop()
+        interval = self._keepalive_interval
+
+        while True:
+            # Regular traffic proves the link works, only act after a full interval of silence
+            now = loop.time()
+            due = min(self._last_sent, self._last_received) + interval
+            if due > now:
+                await asyncio.sleep(due - now)
+                continue
+
+            if now - self._last_received >= interval:
+                # Nothing heard from the device in a while, make sure it's still there
+                try:
+                    await self._run_command(KEEPALIVE_PROBE, CommandPriority.BACKGROUND)
+                except ResponseError:
+                    pass
+                except RuntimeError as e:
+                    logger.warning(f"Keepalive probe failed, assuming the connection is dead: {e}")
+                    self._connection_lost.set()
+                    return
+            else:
+                # We're hearing from the device, but it needs to hear from us too. A line feed is enough.
+                self._writer.write(b"\n")
+                self._last_sent = now
+
     async def query_product_information(self) -> ProductInformation:
-        protocol_ver_resp = await self._run_command("devinfo protocolver")
-        parameter_set_resp = await self._run_command("devinfo paramsetver")
-        firmware_version_resp = await self._run_command("devinfo version")
-        product_name_resp = await self._run_command("devinfo productname")
-        serial_number_query = await self._run_command("devinfo serialno")
-        device_id_query = await self._run_command("devinfo deviceid")
-        device_name_query = await self._run_command("devinfo devicename")
-
-        return ProductInformation(
-            protocol_ver_resp.value,
-            parameter_set_resp.value,
-            firmware_version_resp.value,
-            product_name_resp.value,
-            serial_number_query.value,
-            device_id_query.value,
-            device_name_query.value,
+        # The queries are independent of each other, so they can all be in flight at once
+        responses = await asyncio.gather(
+            *[
+                self._run_command(f"devinfo {name}", CommandPriority.BACKGROUND)
+                for name in (
+                    "protocolver",
+                    "paramsetver",
+                    "version",
+                    "productname",
+                    "serialno",
+                    "deviceid",
+                    "devicename",
+                )
+            ]
         )
 
+        return ProductInformation(*[response.value for response in responses])
+
     async def _query_parameter(
-        self, value_type: ParameterValueType, option1: str, option2: str = "0", option3: str = "0"
+        self,
+        value_type: ParameterValueType,
+        option1: str,
+        option2: str = "0",
+        option3: str = "0",
+        priority: CommandPriority = CommandPriority.STATE,
     ) -> OkResponse:
         command = "get" if value_type is ParameterValueType.RAW else "getn"
 
-        return await self._run_command(f"{command} {option1} {option2} {option3}")
+        return await self._run_command(f"{command} {option1} {option2} {option3}", priority)
+
+    async def query_parameter(
+        self,
+        value_type: ParameterValueType,
+        option1: str,
+        option2: str = "0",
+        option3: str = "0",
+        priority: CommandPriority = CommandPriority.STATE,
+    ) -> OkResponse:
+        return await self._query_parameter(value_type, option1, option2, option3, priority)
+
+    async def query_parameters(
+        self, parameters: list[tuple[ParameterValueType, str]], priority: CommandPriority = CommandPriority.STATE
+    ) -> list[OkResponse | ResponseError]:
+        # Query many parameters in one go. Error responses are returned in place of the response so that
+        # one bad parameter doesn't hide the values of the others, connection problems are raised.
+        results = await asyncio.gather(
+            *[self._query_parameter(value_type, option1, priority=priority) for value_type, option1 in parameters],
+            return_exceptions=True,
+        )
+
+        for result in results:
+            if isinstance(result, Exception) and not isinstance(result, ResponseError):
+                raise result
+
+        return results
 
     async def query_parameter_raw(self, option1: str, option2: str = "0", option3: str = "0") -> OkResponse:
         return await self._query_parameter(ParameterValueType.RAW, option1, option2, option3)
@@ -146,14 +473,203 @@ class YamahaDspDevice(TelnetDevice):
         return await self._query_parameter(ParameterValueType.NORMALIZED, option1, option2, option3)
 
     async def _set_parameter(
-        self, value_type: ParameterValueType, option1: str, option2: str, option3: str, value: str
+        self,
+        value_type: ParameterValueType,
+        option1: str,
+        option2: str,
+        option3: str,
+        value: str,
+        coalesce: bool,
+        priority: CommandPriority,
     ) -> OkResponse:
         command = "set" if value_type is ParameterValueType.RAW else "setn"
+        command = f"{command} {option1} {option2} {option3} {value}"
+
+        # When coalescing, a write that is still queued behind an in-flight write to the same parameter is
+        # replaced by this one, e.g. when a volume slider is dragged
+        if coalesce:
+            return await self._write_coalescer.write((option1, option2, option3), command, priority)
+
+        return await self._run_command(command, priority)
+
+    async def set_parameter_raw(
+        self,
+        option1: str,
+        option2: str,
+        option3: str,
+        value: str,
+        coalesce: bool = False,
+        priority: CommandPriority = CommandPriority.INTERACTIVE,
+    ) -> OkResponse:
+        return await self._set_parameter(ParameterValueType.RAW, option1, option2, option3, value, coalesce, priority)
+
+    async def set_parameter_normalized(
+        self,
+        option1: str,
+        option2: str,
+        option3: str,
+        value: str,
+        coalesce: bool = False,
+        priority: CommandPriority = CommandPriority.INTERACTIVE,
+    ) -> OkResponse:
+        return await self._set_parameter(
+            ParameterValueType.NORMALIZED, option1, option2, option3, value, coalesce, priority
+        )
+
+    async def apply_parameters(
+        self, writes: list[ParameterWrite], rollback: bool = False
+    ) -> list[ParameterWriteResult]:
+        """
+        Writes the parameters in one pipelined batch, e.g. to set up a room for an event. With rollback, the parameters
+        that were written are restored to their previous values if any of the writes fail.
+        """
+        previous_values = await self._query_current_values(writes) if rollback else []
+        results = await self._write_parameters(writes)
+
+        if rollback and not all(result.success for result in results):
+            # Parameters whose previous value couldn't be read are left as they are
+            restores = [
+                (result, ParameterWrite(result.write.value_type, result.write.parameter, previous_value))
+                for result, previous_value in zip(results, previous_values, strict=True)
+                if result.success and previous_value is not None
+            ]
+
+            restore_results = await self._write_parameters([restore for _, restore in restores])
+            for (result, _), restore_result in zip(restores, restore_results, strict=True):
+                if restore_result.success:
+                    result.rolled_back = True
+                else:
+                    logger.warning(f"Unable to roll back {result.write.parameter}: {restore_result.error}")
+
+        return results
 
-        return await self._run_command(f"{command} {option1} {option2} {option3} {value}")
+    async def set_parameters(self, writes: list[ParameterWrite], coalesce: bool = False) -> list[ParameterWriteResult]:
+        """
+        Writes the parameters side by side in one pipelined batch, so that they all change at practically the same
+        time. With coalesce, writes that are still queued from an earlier batch are replaced, like set_parameter_raw.
+        """
+        return await self._write_parameters(writes, coalesce)
 
-    async def set_parameter_raw(self, option1: str, option2: str, option3: str, value: str) -> OkResponse:
-        return await self._set_parameter(ParameterValueType.RAW, option1, option2, option3, value)
+    async def apply_changed_parameters(self, writes: list[ParameterWrite]) -> list[ParameterWriteResult]:
+        """Like apply_parameters, but parameters that already have the value they would be set to are left alone."""
+        current_values = await self._query_current_values(writes)
 
-    async def set_parameter_normalized(self, option1: str, option2: str, option3: str, value: str) -> OkResponse:
-        return await self._set_parameter(ParameterValueType.NORMALIZED, option1, option2, option3, value)
+        return await self.apply_parameters(
+            [write for write, value in zip(writes, current_values, strict=True) if value != write.value]
+        )
+
+    async def query_parameters_raw(self, parameters: list[str]) -> dict[str, str]:
+        """The raw values of the parameters, read in one batch. Parameters the device doesn't know are left out."""
+        responses = await self.query_parameters([(ParameterValueType.RAW, parameter) for parameter in parameters])
+
+        return {
+            parameter: response.value
+            for parameter, response in zip(parameters, responses, strict=True)
+            if isinstance(response, OkResponse)
+        }
+
+    async def _query_current_values(self, writes: list[ParameterWrite]) -> list[str | None]:
+        # Use what we already know and ask the device about the rest, all in one go
+        values: list[str | None] = []
+        unknown: list[tuple[int, tuple[ParameterValueType, str]]] = []
+
+        for index, write in enumerate(writes):
+            state = self._parameter_cache.get(write.parameter)
+            value = state.get_value(write.value_type) if state is not None else None
+            values.append(value)
+            if value is None:
+                unknown.append((index, (write.value_type, write.parameter)))
+
+        if unknown:
+            responses = await self.query_parameters(
+                [parameter for _, parameter in unknown], CommandPriority.INTERACTIVE
+            )
+            for (index, _), response in zip(unknown, responses, strict=True):
+                if isinstance(response, OkResponse):
+                    values[index] = response.value
+
+        return values
+
+    async def _write_parameters(
+        self, writes: list[ParameterWrite], coalesce: bool = False
+    ) -> list[ParameterWriteResult]:
+        responses = await asyncio.gather(
+            *[
+                self._set_parameter(
+                    write.value_type, write.parameter, "0", "0", write.value, coalesce, CommandPriority.INTERACTIVE
+                )
+                for write in writes
+            ],
+            return_exceptions=True,
+        )
+
+        results = []
+        for write, response in zip(writes, responses, strict=True):
+            if isinstance(response, ResponseError | RuntimeError):
+                results.append(ParameterWriteResult(write, error=response))
+            elif isinstance(response, BaseException):
+                raise response
+            else:
+                results.append(ParameterWriteResult(write, response))
+
+        return results
+
+    async def fade_parameters(
+        self, parameters: list[str], target: int, duration: float, curve: FaderCurve = FADER_10DB
+    ):
+        """Fades the faders to the normalized target level over duration seconds, see FadeEngine."""
+        await self._fade_engine.fade(parameters, target, duration, curve)
+
+    def cancel_fade(self, parameter: str):
+        self._fade_engine.cancel(parameter)
+
+    async def _query_fade_level(self, parameter: str) -> int:
+        state = self._parameter_cache.get(parameter)
+        if state is not None and state.normalized is not None:
+            return int(state.normalized)
+
+        return int((await self.query_parameter(ParameterValueType.NORMALIZED, parameter)).value)
+
+    async def _set_fade_level(self, parameter: str, value: int) -> OkResponse:
+        # A fade isn't as urgent as a button press, but someone is listening to it
+        return await self.set_parameter_normalized(parameter, "0", "0", str(value), priority=CommandPriority.STATE)
+
+    def subscribe_meter(
+        self, parameter: str, listener: MeterListener, interval: float, meter_type: str = "level"
+    ) -> Callable[[], None]:
+        """
+        Calls the listener with the meter values of every channel of the parameter, as bytes, whenever the device
+        sends them, at most once per interval seconds. The meter is requested for as long as there are listeners,
+        also after reconnecting. Returns a function that unsubscribes the listener.
+        """
+        return self._meters.subscribe((parameter, meter_type), listener, max(1, round(interval * 1000)))
+
+    async def _renew_meters(self):
+        started: set[MeterKey] = set()
+
+        while True:
+            self._meters_changed.clear()
+            intervals = self._meters.intervals
+
+            # Requests have to be repeated for the device to keep sending, whether anything changed or not
+            commands = [f"mtrstop {address} {meter_type}" for address, meter_type in started - intervals.keys()]
+            commands += [
+                f"mtrstart {address} {meter_type} {interval}" for (address, meter_type), interval in intervals.items()
+            ]
+            results = await asyncio.gather(
+                *[self._run_command(command, CommandPriority.BACKGROUND) for command in commands],
+                return_exceptions=True,
+            )
+
+            for command, result in zip(commands, results, strict=True):
+                if isinstance(result, ResponseError | RuntimeError):
+                    logger.warning(f"Unable to {command}: {result}")
+                elif isinstance(result, BaseException):
+                    raise result
+
+            started = set(intervals)
+
+            try:
+                await asyncio.wait_for(self._meters_changed.wait(), METER_RENEW_INTERVAL)
+            except TimeoutError:
+                pass
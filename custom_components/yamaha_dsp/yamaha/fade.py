@@ -0,0 +1,158 @@
+import asyncio
+import logging
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from custom_components.yamaha_dsp.yamaha.fader import FADER_10DB, FaderCurve
+
+# Fades never send more than this many commands per second in total, however many faders are fading
+FADE_MAX_COMMANDS_PER_SECOND = 50
+# How often the level of a fading fader is changed when only a few faders are fading
+FADE_MIN_STEP_INTERVAL = 0.05
+# Fades from or to -infinity start or end here, a linear fade in dB from -138 dB would be silent most of the time
+FADE_FLOOR_DB = -60.0
+
+logger = logging.getLogger(__name__)
+
+GetLevel = Callable[[str], Awaitable[int]]
+SetLevel = Callable[[str, int], Awaitable[object]]
+
+
+@dataclass(eq=False)
+class Ramp:
+    start_db: float
+    target_db: float
+    # Normalized value to end with, which may be -infinity
+    target: int
+    started_at: float
+    duration: float
+    done: asyncio.Future[None]
+    curve: FaderCurve
+    value: int | None = None
+
+    def value_at(self, now: float) -> tuple[int, bool]:
+        progress = (now - self.started_at) / self.duration if self.duration > 0 else 1
+        if progress >= 1:
+            return self.target, True
+
+        return self.curve.normalized_from_db(self.start_db + (self.target_db - self.start_db) * progress), False
+
+    def finish(self, error: Exception | None = None):
+        if self.done.done():
+            return
+
+        if error is None:
+            self.done.set_result(None)
+        else:
+            self.done.set_exception(error)
+
+
+class FadeEngine:
+    """
+    Ramps faders to a target level with a paced schedule of level changes. The level changes evenly in dB. All faders
+    that are fading are changed in the same time slots, and a slot only starts once the device has answered the
+    previous one, so fades never queue up more commands than the device can take.
+    """
+
+    def __init__(self, get_level: GetLevel, set_level: SetLevel):
+        self._get_level = get_level
+        self._set_level = set_level
+        self._ramps: dict[str, Ramp] = {}
+        self._task: asyncio.Task | None = None
+
+    def is_fading(self, parameter: str) -> bool:
+        return parameter in self._ramps
+
+    async def fade(self, parameters: list[str], target: int, duration: float, curve: FaderCurve = FADER_10DB):
+        """
+        Fades the parameters to the normalized target level over duration seconds and waits for the fades to finish.
+        A parameter that is already fading is retargeted from its current level. The curve is that of the faders, so
+        that the level changes evenly in dB.
+        """
+        # Fading parameters continue from where they are, the others have to be asked
+        levels = await asyncio.gather(
+            *[self._current_level(parameter) for parameter in parameters],
+        )
+
+        loop = asyncio.get_running_loop()
+        ramps = []
+        for parameter, level in zip(parameters, levels, strict=True):
+            start_db = curve.db_from_normalized(level)
+            target_db = curve.db_from_normalized(target)
+            floor_db = min(FADE_FLOOR_DB, *(db for db in (start_db, target_db) if db is not None))
+
+            ramp = Ramp(
+                start_db if start_db is not None else floor_db,
+                target_db if target_db is not None else floor_db,
+                target,
+                loop.time(),
+                duration,
+                loop.create_future(),
+                curve,
+                level,
+            )
+
+            if (previous := self._ramps.get(parameter)) is not None:
+                previous.finish()
+
+            self._ramps[parameter] = ramp
+            ramps.append(ramp)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        await asyncio.gather(*[asyncio.shield(ramp.done) for ramp in ramps])
+
+    def cancel(self, parameter: str):
+        # The fader stays wherever the fade got to
+        if (ramp := self._ramps.pop(parameter, None)) is not None:
+            ramp.finish()
+
+    def cancel_all(self):
+        for parameter in list(self._ramps):
+            self.cancel(parameter)
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _current_level(self, parameter: str) -> int:
+        if (ramp := self._ramps.get(parameter)) is not None and ramp.value is not None:
+            return ramp.value
+
+        return await self._get_level(parameter)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while self._ramps:
+            slot_started = loop.time()
+            changes: list[tuple[str, Ramp, int, bool]] = []
+
+            for parameter, ramp in list(self._ramps.items()):
+                value, finished = ramp.value_at(slot_started)
+                if finished:
+                    del self._ramps[parameter]
+                if value != ramp.value or finished:
+                    changes.append((parameter, ramp, value, finished))
+
+            results = await asyncio.gather(
+                *[self._set_level(parameter, value) for parameter, _, value, _ in changes],
+                return_exceptions=True,
+            )
+
+            for (parameter, ramp, value, finished), result in zip(changes, results, strict=True):
+                if isinstance(result, Exception):
+                    logger.warning(f"Stopping fade of {parameter}: {result}")
+                    if self._ramps.get(parameter) is ramp:
+                        del self._ramps[parameter]
+                    ramp.finish(result)
+                elif finished:
+                    ramp.finish()
+                else:
+                    ramp.value = value
+
+            # Spread the commands of many simultaneous fades out so that the device can keep up
+            interval = max(FADE_MIN_STEP_INTERVAL, len(self._ramps) / FADE_MAX_COMMANDS_PER_SECOND)
+            await asyncio.sleep(max(slot_started + interval - loop.time(), 0))
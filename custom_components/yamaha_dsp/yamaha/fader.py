@@ -0,0 +1,101 @@
+import bisect
+
+# Raw value of a fader at -infinity, raw values are otherwise in 1/100 dB
+RAW_MINUS_INFINITY = -13801
+# The fader tables in the protocol specification have one entry per normalized value at this resolution
+TABLE_RESOLUTION = 1023
+# Normalized values use this resolution unless it's changed with "scpmode resolution"
+DEFAULT_RESOLUTION = 1000
+
+
+class FaderCurve:
+    """
+    Conversion between the raw, normalized and dB values of a fader, following the tables in section 6.1 of the
+    protocol specification. The tables are piecewise linear, so they're described by the points where the step size
+    changes and expanded into a lookup table once.
+    """
+
+    def __init__(self, breakpoints: tuple[tuple[int, int], ...]):
+        # Raw value of each table position, position 0 is -infinity
+        self._raw_values = [RAW_MINUS_INFINITY]
+
+        for (start, start_raw), (end, end_raw) in zip(breakpoints, breakpoints[1:], strict=False):
+            step = (end_raw - start_raw) // (end - start)
+            self._raw_values.extend(start_raw + step * (position - start) for position in range(start, end))
+
+        self._raw_values.append(breakpoints[-1][1])
+
+    @property
+    def minimum_raw(self) -> int:
+        return self._raw_values[1]
+
+    @property
+    def maximum_raw(self) -> int:
+        return self._raw_values[-1]
+
+    def raw_from_normalized(self, normalized: int, resolution: int = DEFAULT_RESOLUTION) -> int:
+        return self._raw_values[self._position_from_normalized(normalized, resolution)]
+
+    def normalized_from_raw(self, raw: int, resolution: int = DEFAULT_RESOLUTION) -> int:
+        return round(self._position_from_raw(raw) * resolution / TABLE_RESOLUTION)
+
+    def raw_from_db(self, db: float | None) -> int:
+        # Values between the steps of the table are rounded to the nearest step
+        if db is None:
+            return RAW_MINUS_INFINITY
+
+        return self._raw_values[self._position_from_raw(round(db * 100))]
+
+    def normalized_from_db(self, db: float | None, resolution: int = DEFAULT_RESOLUTION) -> int:
+        return self.normalized_from_raw(self.raw_from_db(db), resolution)
+
+    def db_from_normalized(self, normalized: int, resolution: int = DEFAULT_RESOLUTION) -> float | None:
+        return db_from_raw(self.raw_from_normalized(normalized, resolution))
+
+    def step_normalized(self, normalized: int, step_db: float, resolution: int = DEFAULT_RESOLUTION) -> int:
+        """The normalized value step_db away from the given one, for changing the volume in even steps."""
+        raw = self.raw_from_normalized(normalized, resolution)
+        if raw == RAW_MINUS_INFINITY:
+            raw = self.minimum_raw if step_db > 0 else RAW_MINUS_INFINITY
+        else:
+            raw += round(step_db * 100)
+
+        stepped = self.normalized_from_raw(min(raw, self.maximum_raw), resolution) if raw >= self.minimum_raw else 0
+
+        # Near -infinity the table is coarser than the step, move at least one step so that we don't get stuck
+        if stepped == normalized and step_db != 0:
+            stepped += 1 if step_db > 0 else -1
+
+        return min(max(stepped, 0), resolution)
+
+    def _position_from_normalized(self, normalized: int, resolution: int) -> int:
+        normalized = min(max(normalized, 0), resolution)
+
+        return round(normalized * TABLE_RESOLUTION / resolution)
+
+    def _position_from_raw(self, raw: int) -> int:
+        if raw <= RAW_MINUS_INFINITY:
+            return 0
+
+        position = bisect.bisect_left(self._raw_values, raw)
+        if position == len(self._raw_values):
+            return position - 1
+
+        # Pick whichever neighbouring step is closer
+        if raw - self._raw_values[position - 1] < self._raw_values[position] - raw:
+            return position - 1
+
+        return position
+
+
+def db_from_raw(raw: int) -> float | None:
+    return None if raw <= RAW_MINUS_INFINITY else raw / 100
+
+
+# 6.1.1. Fader with "-Infinity to 0dB" range
+FADER_0DB = FaderCurve(((1, -13800), (3, -13400), (35, -10200), (83, -7800), (223, -5000), (423, -3000), (1023, 0)))
+# 6.1.2. Fader with "-Infinity to 10dB" range, e.g. the level of a matrix or output channel
+FADER_10DB = FaderCurve(((1, -13800), (15, -9600), (33, -7800), (223, -4000), (423, -2000), (1023, 1000)))
+
+# The fader of a speaker or source, by the name used in the configuration
+FADER_CURVES = {"0db": FADER_0DB, "10db": FADER_10DB}
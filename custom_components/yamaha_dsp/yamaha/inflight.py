@@ -0,0 +1,130 @@
+import asyncio
+import logging
+
+from collections import deque
+from dataclasses import dataclass
+
+from custom_components.yamaha_dsp.yamaha.command import PARAMETER_VALUE_COMMANDS
+from custom_components.yamaha_dsp.yamaha.response import ErrorResponse, Response
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class PendingCommand:
+    # The command name and the options the device echoes back in its response
+    echoed_options: tuple[str, ...]
+    future: asyncio.Future[Response]
+    abandoned_at: float | None = None
+
+    @property
+    def command_name(self) -> str:
+        return self.echoed_options[0]
+
+    @property
+    def abandoned(self) -> bool:
+        return self.abandoned_at is not None
+
+    def matches(self, response: Response) -> bool:
+        # Responses echo the command and its options, e.g. "OK get MTX:Index_47 0 0 900". Errors only
+        # echo the command name, e.g. "ERROR get UnknownAddress".
+        if isinstance(response, ErrorResponse):
+            return response.command_name == self.command_name
+
+        echoed = response.parsed_response[1 : 1 + len(self.echoed_options)]
+
+        return tuple(echoed) == self.echoed_options
+
+
+def create_pending_command(command: str, future: asyncio.Future[Response]) -> PendingCommand:
+    options = command.split(" ")
+
+    # Parameter commands echo the address and both coordinates, other commands echo at least their first option
+    if options[0] in PARAMETER_VALUE_COMMANDS:
+        echoed_options = options[:4]
+    else:
+        echoed_options = options[:2]
+
+    return PendingCommand(tuple(echoed_options), future)
+
+
+class InFlightTable:
+    """Commands that have been written to the device but not yet answered, in the order they were written."""
+
+    def __init__(self, abandoned_grace_period: float):
+        self._pending: deque[PendingCommand] = deque()
+        self._abandoned_grace_period = abandoned_grace_period
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def register(self, command: str) -> PendingCommand:
+        pending = create_pending_command(command, asyncio.get_running_loop().create_future())
+        self._pending.append(pending)
+
+        return pending
+
+    def abandon(self, pending: PendingCommand):
+        # The caller gave up (timeout or cancellation). Keep the command around for a while so that a late
+        # response is drained here instead of being handed to a newer command for the same parameter.
+        if not pending.future.done():
+            pending.future.cancel()
+
+        if pending in self._pending and not pending.abandoned:
+            pending.abandoned_at = asyncio.get_running_loop().time()
+
+    def resolve(self, response: Response) -> bool:
+        self._expire_abandoned()
+
+        if (matched := self._find(response)) is None:
+            return False
+
+        # The device answers in order, so abandoned commands written before this one will never be answered
+        remaining: deque[PendingCommand] = deque()
+        while self._pending:
+            pending = self._pending.popleft()
+            if pending is matched:
+                break
+            if pending.abandoned:
+                logger.debug(f"Dropping abandoned command {' '.join(pending.echoed_options)}, no response received")
+            else:
+                remaining.append(pending)
+
+        remaining.extend(self._pending)
+        self._pending = remaining
+
+        if matched.abandoned:
+            logger.debug(f"Drained late response to abandoned command: {response.raw_response}")
+        elif not matched.future.done():
+            matched.future.set_result(response)
+
+        return True
+
+    def _find(self, response: Response) -> PendingCommand | None:
+        candidates = (pending for pending in self._pending if pending.matches(response))
+        if not isinstance(response, ErrorResponse):
+            return next(candidates, None)
+
+        # Errors don't echo the address, so the oldest live command with the same name is the one being answered.
+        # Only an abandoned command for the same parameter, still waiting for its late reply, goes before it.
+        candidates = list(candidates)
+        if (live := next((pending for pending in candidates if not pending.abandoned), None)) is None:
+            return candidates[0] if candidates else None
+
+        return next(pending for pending in candidates if pending.echoed_options == live.echoed_options)
+
+    def fail_all(self, exception: Exception):
+        # The connection is gone, nothing that is pending will ever be answered
+        while self._pending:
+            pending = self._pending.popleft()
+            if not pending.future.done():
+                pending.future.set_exception(exception)
+
+    def _expire_abandoned(self):
+        expire_before = asyncio.get_running_loop().time() - self._abandoned_grace_period
+        if any(pending.abandoned_at is not None and pending.abandoned_at < expire_before for pending in self._pending):
+            self._pending = deque(
+                pending
+                for pending in self._pending
+                if pending.abandoned_at is None or pending.abandoned_at >= expire_before
+            )
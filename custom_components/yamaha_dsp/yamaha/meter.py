@@ -0,0 +1,128 @@
+import logging
+import math
+
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+# Meter values are 2-digit hex, in 1 dB steps from -126 dBFS (00) to 0 dBFS (7E). 7F means the signal is clipping.
+METER_FLOOR_DB = -126
+METER_FULL_SCALE = 0x7E
+METER_OVER = 0x7F
+# A meter address carries up to eight channels, e.g. NOTIFY mtr MTX:Index_2 level 71 71 71 71 71 71 69 68
+METER_CHANNELS = 8
+METER_NOTIFY_PREFIX = "NOTIFY mtr "
+
+# The device stops sending a meter 10 seconds after it was requested, so requests are renewed well before that
+METER_RENEW_INTERVAL = 8.0
+
+# (address, meter type), e.g. ("MTX:Index_2", "level")
+MeterKey = tuple[str, str]
+MeterListener = Callable[[bytes], None]
+
+logger = logging.getLogger(__name__)
+
+
+def db_from_meter(value: int) -> float:
+    return min(value, METER_FULL_SCALE) + METER_FLOOR_DB
+
+
+# Linear power of every possible meter value, so that averaging doesn't need a logarithm per value
+POWER_FROM_METER = tuple(10 ** (db_from_meter(value) / 10) for value in range(256))
+
+
+def parse_meter_notify(line: str) -> tuple[MeterKey, bytes]:
+    # NOTIFY mtr MTX:Index_2 level 71 71 71 71 71 71 69 68, one value per channel
+    _, _, address, meter_type, values = line.split(" ", 4)
+
+    return (address, meter_type), bytes.fromhex(values)
+
+
+@dataclass(frozen=True)
+class MeterSummary:
+    peak_db: float
+    # Average power over the frames and channels, in dB
+    rms_db: float
+    clipping: bool
+    frames: int
+
+
+class MeterBuffer:
+    """
+    The most recent frames of a meter in a fixed size ring buffer, one byte per channel. Appending a frame is a
+    single copy, the work of summarizing the frames is only done when the summary is needed.
+    """
+
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._data = bytearray(capacity * METER_CHANNELS)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, frame: bytes):
+        start = self._next * METER_CHANNELS
+        frame = frame[:METER_CHANNELS]
+        self._data[start : start + len(frame)] = frame
+        # Channels the device didn't send are silent
+        self._data[start + len(frame) : start + METER_CHANNELS] = bytes(METER_CHANNELS - len(frame))
+
+        self._next = (self._next + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+    def summary(self, channels: Sequence[int]) -> MeterSummary | None:
+        """Summary of the buffered frames of the given channels, numbered from 1. None if there are no frames."""
+        if not self._count or not channels:
+            return None
+
+        # Until the buffer has wrapped around, the frames are at the start of it
+        values = [
+            self._data[frame * METER_CHANNELS + channel - 1] for frame in range(self._count) for channel in channels
+        ]
+        peak = max(values)
+        power = sum(POWER_FROM_METER[value] for value in values) / len(values)
+
+        return MeterSummary(db_from_meter(peak), 10 * math.log10(power), peak >= METER_OVER, self._count)
+
+
+class MeterSubscriptions:
+    """Who wants which meters, and at which interval. Incoming meter lines are handed straight to the listeners."""
+
+    def __init__(self, on_change: Callable[[], None]):
+        self._listeners: dict[MeterKey, list[tuple[MeterListener, int]]] = {}
+        # Called whenever the set of meters or their intervals may have changed
+        self._on_change = on_change
+
+    @property
+    def intervals(self) -> dict[MeterKey, int]:
+        # Listeners share the meter, the one that wants the most frequent updates decides the interval
+        return {key: min(interval for _, interval in listeners) for key, listeners in self._listeners.items()}
+
+    def subscribe(self, key: MeterKey, listener: MeterListener, interval_ms: int) -> Callable[[], None]:
+        entry = (listener, interval_ms)
+        self._listeners.setdefault(key, []).append(entry)
+        self._on_change()
+
+        def unsubscribe():
+            listeners = self._listeners.get(key, [])
+            if entry in listeners:
+                listeners.remove(entry)
+                if not listeners:
+                    del self._listeners[key]
+                self._on_change()
+
+        return unsubscribe
+
+    def dispatch(self, line: str):
+        key, frame = parse_meter_notify(line)
+
+        for listener, _ in self._listeners.get(key, ()):
+            try:
+                listener(frame)
+            except Exception:
+                logger.exception(f"Error in meter listener for {key[0]} {key[1]}")
@@ -0,0 +1,19 @@
+class LineBuffer:
+    """Splits a stream of chunks into lines. A partial line at the end of a chunk is kept until it's completed."""
+
+    def __init__(self):
+        self._partial = b""
+
+    def feed(self, data: bytes) -> list[str]:
+        data = self._partial + data
+        end = data.rfind(b"\n")
+
+        if end == -1:
+            self._partial = data
+            return []
+
+        self._partial = data[end + 1 :]
+        lines = data[:end].decode(errors="replace").split("\n")
+
+        # Lines may end in CRLF, and a lone line feed is not a response
+        return [line.rstrip("\r") for line in lines if line and line != "\r"]
@@ -1,13 +1,48 @@
 from dataclasses import dataclass
 
 
-@dataclass
+def tokenize(line: str) -> list[str]:
+    """Splits a response line on spaces. Quoted strings, which may contain spaces, become a single token."""
+    quote = line.find('"')
+
+    # Most lines have no quoted strings at all
+    if quote == -1:
+        return line.split(" ")
+
+    # Parameter responses and notifications end with a single quoted string, e.g. set MTX:Index_47 0 0 -1200 "-12.00"
+    if quote > 0 and line[quote - 1] == " " and line.find('"', quote + 1) == len(line) - 1:
+        tokens = line[: quote - 1].split(" ")
+        tokens.append(line[quote + 1 : -1])
+        return tokens
+
+    # Splitting on quotes leaves the quoted strings at odd indexes. The parts in between are space-separated
+    # tokens, surrounded by the spaces that separate them from the quoted strings.
+    parts = line.split('"')
+    last = len(parts) - 1
+    tokens = []
+
+    for index, part in enumerate(parts):
+        if index % 2:
+            tokens.append(part)
+            continue
+
+        if index > 0:
+            part = part[1:]
+        if index < last:
+            part = part[:-1]
+        if part:
+            tokens.extend(part.split(" "))
+
+    return tokens
+
+
+@dataclass(slots=True)
 class Response:
     raw_response: str
     parsed_response: list[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class ValueResponse(Response):
     value: str
 
@@ -18,17 +53,17 @@ class ValueResponse(Response):
         return bool(self.get_int_value())
 
 
-@dataclass
+@dataclass(slots=True)
 class OkResponse(ValueResponse):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class NotifyResponse(ValueResponse):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorResponse(Response):
     command_name: str
     error_code: str
@@ -36,19 +71,18 @@ class ErrorResponse(Response):
 
 def parse_response(response: str) -> Response:
     raw_response = response.strip()
-    parsed_response = [part.strip('"') for part in raw_response.split(" ")]
+    parsed_response = tokenize(raw_response)
 
     match parsed_response[0]:
         case "OK" | "OKm":
-            value = parsed_response[-1]
-            return OkResponse(raw_response, parsed_response, value)
+            return OkResponse(raw_response, parsed_response, parsed_response[-1])
         case "NOTIFY":
-            value = parsed_response[-1]
-            return NotifyResponse(raw_response, parsed_response, value)
+            return NotifyResponse(raw_response, parsed_response, parsed_response[-1])
         case "ERROR":
-            command_name = parsed_response[1]
-            error_code = parsed_response[2]
-            return ErrorResponse(raw_response, parsed_response, command_name, error_code)
+            if len(parsed_response) < 3:
+                raise ValueError("Malformed error response")
+
+            return ErrorResponse(raw_response, parsed_response, parsed_response[1], parsed_response[2])
         case _:
             raise ValueError("Unknown response type")
 
@@ -0,0 +1,112 @@
+import asyncio
+import itertools
+
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+
+
+class CommandPriority(IntEnum):
+    # Something a user just did, e.g. pressing mute or dragging a volume slider
+    INTERACTIVE = 0
+    # Reads whose result someone is waiting to see
+    STATE = 1
+    # Polling, product information, keepalive probes and the like
+    BACKGROUND = 2
+
+
+@dataclass(eq=False)
+class Waiter:
+    priority: CommandPriority
+    enqueued_at: float
+    sequence: int
+    future: asyncio.Future[None]
+
+
+class PriorityWindow:
+    """
+    Limits how many commands can be in flight at once, like a semaphore, but hands free slots to the most important
+    waiting command first. Commands of the same priority are served in order. A waiting command is promoted by one
+    priority class for every aging_interval seconds it has waited, so background traffic can't be starved forever.
+    One slot is reserved for interactive commands, so that they never have to wait for a full window of polls.
+    """
+
+    def __init__(self, size: int, aging_interval: float = 1.0, reserved_interactive: int = 1):
+        self._size = size
+        self._reserved_interactive = min(reserved_interactive, size - 1)
+        self._aging_interval = aging_interval
+        self._in_use = 0
+        self._waiters: dict[CommandPriority, deque[Waiter]] = {priority: deque() for priority in CommandPriority}
+        self._sequence = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    @asynccontextmanager
+    async def slot(self, priority: CommandPriority) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: CommandPriority):
+        # Waiters are granted slots as soon as they can use one, so if there's a slot for us nobody is ahead of us
+        if self._can_use_slot(priority):
+            self._in_use += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = Waiter(priority, loop.time(), next(self._sequence), loop.create_future())
+        self._waiters[priority].append(waiter)
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # We were given a slot just as we were cancelled, pass it on
+                self.release()
+            elif waiter in self._waiters[priority]:
+                self._waiters[priority].remove(waiter)
+            raise
+
+    def release(self):
+        self._in_use -= 1
+        self._grant()
+
+    def _can_use_slot(self, priority: CommandPriority) -> bool:
+        reserved = 0 if priority is CommandPriority.INTERACTIVE else self._reserved_interactive
+
+        return self._in_use < self._size - reserved
+
+    def _grant(self):
+        while (waiter := self._next_waiter()) is not None:
+            self._waiters[waiter.priority].popleft()
+
+            # Cancelled, but its task hasn't had the chance to remove it yet
+            if waiter.future.done():
+                continue
+
+            self._in_use += 1
+            waiter.future.set_result(None)
+
+    def _next_waiter(self) -> Waiter | None:
+        now = asyncio.get_running_loop().time()
+        best: tuple[int, int] | None = None
+        best_waiter: Waiter | None = None
+
+        # Only the oldest waiter of each class can be next
+        for priority, waiters in self._waiters.items():
+            if not waiters or not self._can_use_slot(priority):
+                continue
+
+            waiter = waiters[0]
+            promotion = int((now - waiter.enqueued_at) / self._aging_interval)
+            key = (max(priority - promotion, 0), waiter.sequence)
+            if best is None or key < best:
+                best, best_waiter = key, waiter
+
+        return best_waiter
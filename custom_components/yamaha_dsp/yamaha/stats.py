@@ -0,0 +1,138 @@
+import bisect
+
+from dataclasses import dataclass, field
+
+# Upper bounds of the latency histogram buckets in milliseconds, anything slower ends up in the last bucket
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+@dataclass
+class LatencyHistogram:
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def record(self, latency_ms: float):
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def merge(self, other: "LatencyHistogram"):
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets, strict=True)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    @property
+    def mean_ms(self) -> float | None:
+        return self.total_ms / self.count if self.count else None
+
+    def percentile_ms(self, percentile: float) -> float | None:
+        """The upper bound of the bucket the percentile falls in, or the max if it falls in the last bucket."""
+        if not self.count:
+            return None
+
+        rank = self.count * percentile / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return float(LATENCY_BUCKETS_MS[index]) if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+
+        return self.max_ms
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": self.mean_ms,
+            "p95_ms": self.percentile_ms(95),
+            "max_ms": self.max_ms,
+            "buckets": {
+                f"<={bound}ms" if index < len(LATENCY_BUCKETS_MS) else f">{LATENCY_BUCKETS_MS[-1]}ms": count
+                for index, (bound, count) in enumerate(zip((*LATENCY_BUCKETS_MS, None), self.buckets, strict=True))
+            },
+        }
+
+
+@dataclass
+class CommandStatistics:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    timeouts: int = 0
+    # ERROR responses from the device
+    errors: int = 0
+    # The connection was closed or reset while waiting for a response
+    connection_failures: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "latency": self.latency.as_dict(),
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "connection_failures": self.connection_failures,
+        }
+
+
+class DeviceStatistics:
+    """Counters for the commands sent to the device, per command verb (get, setn, devinfo, ...)."""
+
+    def __init__(self):
+        self.commands: dict[str, CommandStatistics] = {}
+        self.connects = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _command(self, verb: str) -> CommandStatistics:
+        if (statistics := self.commands.get(verb)) is None:
+            statistics = self.commands[verb] = CommandStatistics()
+
+        return statistics
+
+    def record_in_flight(self, in_flight: int):
+        self.in_flight = in_flight
+        self.max_in_flight = max(self.max_in_flight, in_flight)
+
+    def record_response(self, verb: str, latency_ms: float, error: bool = False):
+        statistics = self._command(verb)
+        statistics.latency.record(latency_ms)
+        if error:
+            statistics.errors += 1
+
+    def record_timeout(self, verb: str):
+        self._command(verb).timeouts += 1
+
+    def record_connection_failure(self, verb: str):
+        self._command(verb).connection_failures += 1
+
+    def record_connect(self):
+        self.connects += 1
+
+    @property
+    def reconnects(self) -> int:
+        return max(self.connects - 1, 0)
+
+    @property
+    def latency(self) -> LatencyHistogram:
+        # All commands combined
+        latency = LatencyHistogram()
+        for statistics in self.commands.values():
+            latency.merge(statistics.latency)
+
+        return latency
+
+    @property
+    def timeouts(self) -> int:
+        return sum(statistics.timeouts for statistics in self.commands.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(statistics.errors for statistics in self.commands.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "reconnects": self.reconnects,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "commands": {verb: statistics.as_dict() for verb, statistics in sorted(self.commands.items())},
+        }
@@ -0,0 +1,61 @@
+import unittest
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.yamaha_dsp import create_dsp_configuration
+from custom_components.yamaha_dsp.entity import ConfiguredEntities
+from custom_components.yamaha_dsp.switch import RouteSwitchEntity
+
+
+def create_options(*routes: tuple[str, int]) -> dict:
+    return {"route_configuration": [f'{{"name": "{name}", "index_mute": {index}}}' for name, index in routes]}
+
+
+class ConfiguredEntitiesTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        coordinator = SimpleNamespace(device=AsyncMock(), data={})
+
+        def create_entities(dsp_configuration):
+            entities = [
+                RouteSwitchEntity(config, coordinator, SimpleNamespace()) for config in dsp_configuration.routes
+            ]
+            for entity in entities:
+                entity.async_remove = AsyncMock()
+
+            return entities
+
+        self.async_add_entities = MagicMock()
+        self.entities = ConfiguredEntities(self.async_add_entities, create_entities)
+        self.entities.async_setup(MagicMock(), MagicMock(), create_dsp_configuration(create_options(("Mics", 2))))
+
+    def added_names(self, call_index: int) -> list[str]:
+        return [entity.name for entity in self.async_add_entities.call_args_list[call_index].args[0]]
+
+    async def test_only_changed_entities_are_replaced(self):
+        await self.entities.async_update(create_dsp_configuration(create_options(("Mics", 2), ("Bar", 3))))
+        mics = self.async_add_entities.call_args_list[0].args[0][0]
+        bar = self.async_add_entities.call_args_list[1].args[0][0]
+
+        await self.entities.async_update(create_dsp_configuration(create_options(("Mics", 2), ("Bar", 4), ("DJ", 5))))
+
+        mics.async_remove.assert_not_awaited()
+        bar.async_remove.assert_awaited_once()
+        self.assertEqual(["Bar route", "DJ route"], self.added_names(2))
+
+    async def test_removed_entities_are_removed(self):
+        mics = self.async_add_entities.call_args.args[0][0]
+
+        await self.entities.async_update(create_dsp_configuration(create_options()))
+
+        mics.async_remove.assert_awaited_once()
+        self.assertEqual(1, self.async_add_entities.call_count)
+
+    async def test_unchanged_configuration_does_nothing(self):
+        await self.entities.async_update(create_dsp_configuration(create_options(("Mics", 2))))
+
+        self.assertEqual(1, self.async_add_entities.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.yamaha_dsp import create_dsp_configuration
+from custom_components.yamaha_dsp.coordinator import YamahaDspCoordinator
+from custom_components.yamaha_dsp.yamaha.cache import ParameterCache
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.response import ResponseError
+
+OPTIONS = {
+    "default_speaker_sources": ["Spotify", "Radio"],
+    "speaker_configuration": [
+        '{"name": "Kitchen", "index_source": 33, "index_volume": 47, "index_mute": 48}',
+        '{"name": "Bar", "index_source": 33, "index_volume": 49, "index_mute": 50}',
+    ],
+    "route_configuration": ['{"name": "Mics to kitchen", "index_mute": 48}'],
+}
+
+SOURCE = (ParameterValueType.RAW, "MTX:Index_33")
+KITCHEN_VOLUME = (ParameterValueType.NORMALIZED, "MTX:Index_47")
+KITCHEN_MUTE = (ParameterValueType.RAW, "MTX:Index_48")
+BAR_VOLUME = (ParameterValueType.NORMALIZED, "MTX:Index_49")
+BAR_MUTE = (ParameterValueType.RAW, "MTX:Index_50")
+
+VALUES = {SOURCE: "1", KITCHEN_VOLUME: "700", KITCHEN_MUTE: "1", BAR_VOLUME: "500", BAR_MUTE: "0"}
+
+
+class CoordinatorTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.values = dict(VALUES)
+        self.device = SimpleNamespace(
+            connected=True,
+            parameter_cache=ParameterCache(),
+            query_parameters=AsyncMock(side_effect=self.query_parameters),
+        )
+        self.store = MagicMock()
+        self.coordinator = YamahaDspCoordinator(
+            MagicMock(), MagicMock(), self.device, create_dsp_configuration(OPTIONS), self.store
+        )
+
+    async def query_parameters(self, parameters, _priority):
+        return [
+            SimpleNamespace(value=self.values[parameter])
+            if parameter in self.values
+            else ResponseError("UnknownAddress")
+            for parameter in parameters
+        ]
+
+    def polled(self) -> list:
+        return self.device.query_parameters.await_args.args[0]
+
+    async def test_shared_indexes_are_polled_once(self):
+        data = await self.coordinator._async_update_data()
+
+        self.assertEqual([SOURCE, KITCHEN_VOLUME, KITCHEN_MUTE, BAR_VOLUME, BAR_MUTE], self.polled())
+        self.assertEqual(VALUES, data)
+        self.store.async_save_parameters.assert_called_with(data)
+
+    async def test_only_due_parameters_are_polled_after_the_first_update(self):
+        self.coordinator.data = await self.coordinator._async_update_data()
+        self.device.query_parameters.reset_mock()
+
+        # Nothing is due right after everything has been polled, the previous values are kept
+        self.assertEqual(VALUES, await self.coordinator._async_update_data())
+        self.device.query_parameters.assert_not_awaited()
+
+    async def test_failed_parameters_are_left_out(self):
+        del self.values[BAR_MUTE]
+
+        data = await self.coordinator._async_update_data()
+
+        self.assertNotIn(BAR_MUTE, data)
+        self.assertEqual("700", data[KITCHEN_VOLUME])
+
+    async def test_failed_poll_polls_everything_again(self):
+        self.device.query_parameters.side_effect = RuntimeError("Command timed out")
+        with self.assertRaises(UpdateFailed):
+            await self.coordinator._async_update_data()
+
+        self.device.query_parameters.side_effect = self.query_parameters
+        await self.coordinator._async_update_data()
+        self.assertEqual(5, len(self.polled()))
+
+    async def test_not_connected_fails_the_update(self):
+        self.device.connected = False
+
+        with self.assertRaisesRegex(UpdateFailed, "Not connected"):
+            await self.coordinator._async_update_data()
+
+    async def test_newer_cached_value_wins_over_the_poll(self):
+        # A set that completed while the poll was in flight
+        self.device.parameter_cache.update(("MTX:Index_47", "0", "0"), ParameterValueType.NORMALIZED, "800")
+
+        data = await self.coordinator._async_update_data()
+
+        self.assertEqual("800", data[KITCHEN_VOLUME])
+
+    async def test_restore_keeps_configured_parameters(self):
+        self.coordinator.async_restore({KITCHEN_VOLUME: "600", (ParameterValueType.RAW, "MTX:Index_99"): "1"})
+
+        self.assertEqual({KITCHEN_VOLUME: "600"}, self.coordinator.data)
+
+    async def test_pushed_parameter_changes_reach_the_poll_schedule(self):
+        self.device.parameter_cache.update(("MTX:Index_48", "0", "0"), ParameterValueType.RAW, "0")
+        self.coordinator.async_handle_parameter_change("MTX:Index_48", True)
+        # A NOTIFY only carries the raw value, it doesn't cover the normalized level
+        self.device.parameter_cache.update(("MTX:Index_47", "0", "0"), ParameterValueType.RAW, "-1200")
+        self.coordinator.async_handle_parameter_change("MTX:Index_47", True)
+
+        self.assertEqual(1, self.coordinator.poll_schedule.pushed_parameters)
+
+    async def test_configuration_change_polls_everything(self):
+        self.coordinator.data = await self.coordinator._async_update_data()
+
+        options = OPTIONS | {"route_configuration": ['{"name": "Mics to bar", "index_mute": 51}']}
+        self.values[(ParameterValueType.RAW, "MTX:Index_51")] = "1"
+        self.coordinator.set_dsp_configuration(create_dsp_configuration(options))
+        data = await self.coordinator._async_update_data()
+
+        self.assertEqual(6, len(self.polled()))
+        self.assertEqual("1", data[(ParameterValueType.RAW, "MTX:Index_51")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import unittest
+
+from custom_components.yamaha_dsp import create_dsp_configuration
+from custom_components.yamaha_dsp.importer import MAX_REPORTED_ERRORS, ImportRowError, decode_import, parse_import
+
+# Spreadsheet exports often start with a byte order mark
+CSV = """\ufefftype,name,index_source,index_volume,index_mute,index,sources,speakers,channels,signal_threshold
+speaker,Kitchen,33,47,48,,Spotify;Radio,,,
+speaker,Bar,34,49,50,,,,,
+speaker_group,Downstairs,,,,,,Kitchen;Bar,,
+source,Spotify,,51,52,,,,,
+route,Mic to bar,,,53,,,,,
+router,Classroom sink,20019,,,,NONE=0;Mic bus=3,,,
+meter,Lobby,,,,120,,,1;2,-50
+"""
+
+
+class ImporterTests(unittest.TestCase):
+    def test_csv_import(self):
+        result = parse_import(CSV)
+
+        self.assertEqual([], result.errors)
+        self.assertEqual(7, result.rows)
+        self.assertEqual(
+            {
+                "name": "Kitchen",
+                "index_source": 33,
+                "index_volume": 47,
+                "index_mute": 48,
+                "sources": ["Spotify", "Radio"],
+            },
+            result.configuration["speaker_configuration"][0],
+        )
+        self.assertNotIn("sources", result.configuration["speaker_configuration"][1])
+        self.assertEqual(
+            [{"label": "NONE", "value": 0}, {"label": "Mic bus", "value": 3}],
+            result.configuration["router_configuration"][0]["sources"],
+        )
+        self.assertEqual(
+            {"name": "Lobby", "index": 120, "channels": [1, 2], "signal_threshold": -50.0},
+            result.configuration["meter_configuration"][0],
+        )
+
+    def test_imported_configuration_is_combined_with_configured_entities(self):
+        options = {
+            "default_speaker_sources": ["Radio"],
+            "route_configuration": ['{"name": "Mics", "index_mute": 60}'],
+            "imported_configuration": parse_import(CSV).configuration,
+        }
+
+        dsp_configuration = create_dsp_configuration(options)
+
+        self.assertEqual(["Kitchen", "Bar"], [speaker.name for speaker in dsp_configuration.speakers])
+        self.assertEqual(["Radio"], dsp_configuration.speakers[1].available_inputs)
+        self.assertEqual(["Kitchen", "Bar"], [s.name for s in dsp_configuration.speaker_groups[0].speakers])
+        self.assertEqual(["Mics", "Mic to bar"], [route.name for route in dsp_configuration.routes])
+        self.assertEqual([1, 2], dsp_configuration.meters[0].channels)
+
+    def test_json_import(self):
+        rows = [
+            {"type": "source", "name": "Spotify", "index_volume": 51, "index_mute": 52},
+            {"type": "router", "name": "Sink", "index_source": 20019, "sources": [{"label": "NONE", "value": 0}]},
+        ]
+
+        result = parse_import(json.dumps(rows))
+
+        self.assertEqual([], result.errors)
+        self.assertEqual(
+            [{"name": "Spotify", "index_volume": 51, "index_mute": 52}], result.configuration["source_configuration"]
+        )
+        self.assertEqual([{"label": "NONE", "value": 0}], result.configuration["router_configuration"][0]["sources"])
+
+    def test_errors_are_reported_per_row(self):
+        content = "\n".join(
+            [
+                "type,name,index_source,index_volume,index_mute,sources",
+                "speaker,Kitchen,33,47,48,",
+                "speaker,Bar,34,abc,50,",
+                "amplifier,Amp,,,,",
+                "router,Sink,20019,,,Mic bus",
+                "route,,,,53,",
+            ]
+        )
+
+        result = parse_import(content)
+
+        self.assertEqual(
+            [
+                "Row 3: index_volume must be a whole number, got 'abc'",
+                "Row 4: unknown type 'amplifier', expected one of speaker, speaker_group, source, route, router, meter",
+                "Row 5: router sources must be given as label=value, got 'Mic bus'",
+                "Row 6: name is required",
+            ],
+            [str(error) for error in result.errors],
+        )
+        # Valid rows are still parsed
+        self.assertEqual(1, len(result.configuration["speaker_configuration"]))
+
+    def test_unreadable_file(self):
+        self.assertEqual([ImportRowError(None, "A JSON import must be a list of rows")], parse_import("{}").errors)
+        self.assertIn("type column", str(parse_import("name,index\nKitchen,1").errors[0]))
+
+    def test_files_are_decoded_as_utf8_or_windows_code_page(self):
+        self.assertEqual(CSV.removeprefix("\ufeff"), decode_import(CSV.encode("utf-8")))
+        self.assertEqual("type,name\nspeaker,Café", decode_import("\ufefftype,name\nspeaker,Café".encode()))
+        self.assertEqual("type,name\nspeaker,Café", decode_import("type,name\nspeaker,Café".encode("cp1252")))
+
+    def test_long_error_lists_are_truncated(self):
+        result = parse_import("type,name\n" + "speaker,\n" * 15)
+
+        lines = result.format_errors().splitlines()
+        self.assertEqual(MAX_REPORTED_ERRORS + 1, len(lines))
+        self.assertEqual("... and 5 more", lines[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+
+from custom_components.yamaha_dsp.poll_schedule import (
+    POLL_ACTIVE_PERIOD,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+    PollSchedule,
+)
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+
+LEVEL = (ParameterValueType.NORMALIZED, "MTX:Index_47")
+MUTE = (ParameterValueType.RAW, "MTX:Index_48")
+SOURCE = (ParameterValueType.RAW, "MTX:Index_33")
+
+
+class PollScheduleTests(unittest.TestCase):
+    def setUp(self):
+        self.schedule = PollSchedule(30, budget=10)
+        self.schedule.set_parameters([LEVEL, MUTE, SOURCE], 0)
+
+    def poll(self, now: float, values: dict) -> list:
+        due = self.schedule.due(now)
+        for parameter in due:
+            self.schedule.record_poll(parameter, values[parameter], now)
+
+        return due
+
+    def test_new_parameters_are_due_right_away(self):
+        self.assertEqual([LEVEL, MUTE, SOURCE], self.schedule.due(0))
+
+    def test_stable_parameters_back_off(self):
+        values = {LEVEL: "500", MUTE: "0", SOURCE: "1"}
+        times = []
+        now = 0.0
+        while now < 3600:
+            if LEVEL in self.poll(now, values):
+                times.append(now)
+            now += 5
+
+        intervals = [b - a for a, b in zip(times, times[1:], strict=False)]
+        self.assertEqual(30, intervals[0])
+        self.assertEqual(sorted(intervals), intervals)
+        self.assertEqual(POLL_MAX_INTERVAL, intervals[-1])
+
+    def test_changing_parameters_are_polled_often(self):
+        values = {LEVEL: "500", MUTE: "0", SOURCE: "1"}
+        self.poll(0, values)
+        self.poll(30, values)
+
+        values[LEVEL] = "600"
+        self.assertIn(LEVEL, self.poll(90, values))
+        self.assertIn(LEVEL, self.poll(90 + POLL_MIN_INTERVAL, values))
+
+        # Once it has settled down, it backs off again
+        now = 90 + POLL_MIN_INTERVAL
+        while now < 90 + POLL_ACTIVE_PERIOD:
+            now += POLL_MIN_INTERVAL
+            self.poll(now, values)
+        self.assertNotIn(LEVEL, self.poll(now + POLL_MIN_INTERVAL, values))
+
+    def test_changes_made_by_sets_make_parameters_due_sooner(self):
+        values = {LEVEL: "500", MUTE: "0", SOURCE: "1"}
+        self.poll(0, values)
+
+        self.schedule.record_change("MTX:Index_48", set(), 1)
+
+        self.assertEqual([MUTE], self.schedule.due(1 + POLL_MIN_INTERVAL))
+
+    def test_pushed_parameters_are_only_polled_as_a_safety_net(self):
+        values = {LEVEL: "500", MUTE: "0", SOURCE: "1"}
+        self.schedule.record_change("MTX:Index_48", {ParameterValueType.RAW}, 0)
+
+        self.assertEqual([LEVEL, SOURCE], self.poll(0, values))
+        self.assertEqual(1, self.schedule.pushed_parameters)
+        self.assertNotIn(MUTE, self.poll(POLL_MAX_INTERVAL - 1, values))
+        self.assertIn(MUTE, self.poll(POLL_MAX_INTERVAL, values))
+        self.assertNotIn(MUTE, self.poll(POLL_MAX_INTERVAL + 30, values))
+
+        self.schedule.reset(400)
+        self.assertEqual(0, self.schedule.pushed_parameters)
+        self.assertIn(MUTE, self.schedule.due(400))
+
+    def test_push_without_the_polled_value_type_does_not_count(self):
+        # A NOTIFY only has the raw value, the level is polled as a normalized value
+        self.schedule.record_change("MTX:Index_47", {ParameterValueType.RAW}, 0)
+
+        self.assertEqual(0, self.schedule.pushed_parameters)
+        self.assertIn(LEVEL, self.schedule.due(POLL_MIN_INTERVAL))
+
+    def test_budget_limits_polls_to_the_most_overdue(self):
+        self.schedule.budget = 0.2
+        values = {LEVEL: "500", MUTE: "0", SOURCE: "1"}
+        self.schedule.record_change("MTX:Index_48", set(), -10)
+
+        # 0.2 commands per second over 5 seconds
+        self.assertEqual([MUTE], self.poll(0, values))
+        self.assertEqual([LEVEL], self.poll(5, values))
+        self.assertEqual([SOURCE], self.poll(10, values))
+
+    def test_known_parameters_keep_their_schedule(self):
+        values = {LEVEL: "500", MUTE: "0", SOURCE: "1"}
+        self.poll(0, values)
+
+        self.schedule.set_parameters([LEVEL, (ParameterValueType.RAW, "MTX:Index_50")], 1)
+
+        self.assertEqual([(ParameterValueType.RAW, "MTX:Index_50")], self.schedule.due(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from custom_components.yamaha_dsp import create_dsp_configuration
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+
+OPTIONS = {
+    "default_speaker_sources": ["Spotify", "Radio"],
+    "speaker_configuration": [
+        '{"name": "Kitchen", "index_source": 33, "index_volume": 47, "index_mute": 48}',
+        '{"name": "Bar", "index_source": 33, "index_volume": 49, "index_mute": 50}',
+    ],
+    "route_configuration": ['{"name": "Mics to kitchen", "index_mute": 48}'],
+}
+
+
+class ParameterRegistryTests(unittest.TestCase):
+    def test_shared_indexes_are_polled_once(self):
+        registry = create_dsp_configuration(OPTIONS).registry
+
+        self.assertEqual(
+            [
+                (ParameterValueType.RAW, "MTX:Index_33"),
+                (ParameterValueType.NORMALIZED, "MTX:Index_47"),
+                (ParameterValueType.RAW, "MTX:Index_48"),
+                (ParameterValueType.NORMALIZED, "MTX:Index_49"),
+                (ParameterValueType.RAW, "MTX:Index_50"),
+            ],
+            registry.polled_parameters,
+        )
+
+    def test_shared_source_lists_share_a_map(self):
+        dsp_configuration = create_dsp_configuration(OPTIONS)
+        kitchen, bar = dsp_configuration.speakers
+
+        source_map = dsp_configuration.registry.source_map(kitchen.available_inputs)
+
+        self.assertIs(source_map, dsp_configuration.registry.source_map(bar.available_inputs))
+        self.assertEqual({1: "Spotify", 2: "Radio"}, dict(source_map))
+
+    def test_index_used_in_different_roles_is_rejected(self):
+        options = OPTIONS | {"route_configuration": ['{"name": "Mics to kitchen", "index_mute": 47}']}
+
+        with self.assertRaisesRegex(ValueError, "Index 47 is used as mute"):
+            create_dsp_configuration(options)
+
+    def test_duplicate_names_are_rejected(self):
+        options = OPTIONS | {
+            "route_configuration": ['{"name": "Mics", "index_mute": 2}', '{"name": "Mics", "index_mute": 3}']
+        }
+
+        with self.assertRaisesRegex(ValueError, "Duplicate entity 'mics_route'"):
+            create_dsp_configuration(options)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 import unittest
 
 from types import SimpleNamespace
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 from custom_components.yamaha_dsp import RouterConfiguration, RouterSourceConfiguration
 from custom_components.yamaha_dsp.select import RouterSelectEntity
+from custom_components.yamaha_dsp.yamaha.cache import ParameterState
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
 
 
 class RouterSelectEntityTests(unittest.IsolatedAsyncioTestCase):
@@ -19,20 +21,42 @@ class RouterSelectEntityTests(unittest.IsolatedAsyncioTestCase):
             ],
         )
         self.device = AsyncMock()
-        self.entity = RouterSelectEntity(self.config, self.device, SimpleNamespace())
+        self.coordinator = SimpleNamespace(device=self.device, data={}, last_update_success=True)
+        self.entity = RouterSelectEntity(self.config, self.coordinator, SimpleNamespace())
 
-    async def test_async_update_reads_selected_option(self):
-        self.device.query_parameter_raw.return_value = SimpleNamespace(get_int_value=lambda: 17)
+    async def test_coordinator_update_reads_selected_option(self):
+        self.entity.async_write_ha_state = MagicMock()
+        self.coordinator.data = {(ParameterValueType.RAW, "MTX:Index_20019"): "17"}
 
-        await self.entity.async_update()
+        self.entity._handle_coordinator_update()
 
-        self.device.query_parameter_raw.assert_awaited_once_with("MTX:Index_20019")
         self.assertEqual("YDIF IN 1", self.entity.current_option)
+        self.entity.async_write_ha_state.assert_called_once()
+
+    async def test_unchanged_coordinator_update_is_not_written(self):
+        self.entity.async_write_ha_state = MagicMock()
+        self.coordinator.data = {(ParameterValueType.RAW, "MTX:Index_20019"): "17"}
+
+        self.entity._handle_coordinator_update()
+        self.entity._handle_coordinator_update()
+        self.coordinator.last_update_success = False
+        self.entity._handle_coordinator_update()
+
+        # Once for the value, once for becoming unavailable
+        self.assertEqual(2, self.entity.async_write_ha_state.call_count)
+
+    async def test_parameter_update_sets_option(self):
+        self.entity.async_write_ha_state = MagicMock()
+
+        self.entity._handle_parameter_update(("MTX:Index_20019", "0", "0"), ParameterState(raw="3"))
+
+        self.assertEqual("Mic bus", self.entity.current_option)
+        self.entity.async_write_ha_state.assert_called_once()
 
     async def test_async_select_option_sets_parameter(self):
         await self.entity.async_select_option("Mic bus")
 
-        self.device.set_parameter_raw.assert_awaited_once_with("MTX:Index_20019", "0", "0", "3")
+        self.device.set_parameter_raw.assert_awaited_once_with("MTX:Index_20019", "0", "0", "3", coalesce=True)
 
     async def test_async_select_option_rejects_invalid_value(self):
         with self.assertRaises(ValueError):
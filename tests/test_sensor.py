@@ -0,0 +1,55 @@
+import unittest
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from custom_components.yamaha_dsp.const import POLL_TICK
+from custom_components.yamaha_dsp.sensor import STATISTICS_SENSORS, StatisticsSensorEntity
+from custom_components.yamaha_dsp.yamaha.stats import DeviceStatistics
+
+RECONNECTS = next(description for description in STATISTICS_SENSORS if description.key == "reconnects")
+
+
+class StatisticsSensorEntityTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.statistics = DeviceStatistics()
+        self.coordinator = SimpleNamespace(
+            device=SimpleNamespace(statistics=self.statistics),
+            data={},
+            last_update_success=True,
+            async_add_listener=MagicMock(),
+        )
+        self.entity = StatisticsSensorEntity(RECONNECTS, self.coordinator, SimpleNamespace(), "ABC123")
+        self.entity.async_write_ha_state = MagicMock(side_effect=lambda: self.states.append(self.entity.native_value))
+        self.states = []
+
+    async def test_state_is_written_on_every_coordinator_update(self):
+        self.statistics.record_connect()
+        self.entity._handle_coordinator_update()
+        self.statistics.record_connect()
+        self.entity._handle_coordinator_update()
+        self.statistics.record_connect()
+        self.entity._handle_coordinator_update()
+
+        self.assertEqual([0, 1, 2], self.states)
+
+    async def test_state_is_refreshed_every_poll_tick(self):
+        self.entity.hass = MagicMock()
+        with patch("custom_components.yamaha_dsp.sensor.async_track_time_interval") as track_time_interval:
+            await self.entity.async_added_to_hass()
+
+        _hass, refresh, interval = track_time_interval.call_args.args
+        self.assertEqual(POLL_TICK, interval)
+
+        # The coordinator doesn't tell its entities about polls that changed nothing, the counters still advance
+        self.statistics.record_connect()
+        self.statistics.record_connect()
+        refresh(None)
+        self.statistics.record_connect()
+        refresh(None)
+
+        self.assertEqual([1, 2], self.states[-2:])
+
+
+if __name__ == "__main__":
+    unittest.main()
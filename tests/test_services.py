@@ -0,0 +1,43 @@
+import unittest
+
+import voluptuous as vol
+
+from custom_components.yamaha_dsp.services import APPLY_PARAMETERS_SCHEMA, result_as_dict
+from custom_components.yamaha_dsp.yamaha.batch import ParameterWrite, ParameterWriteResult
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.response import ResponseError
+
+
+class ApplyParametersTests(unittest.TestCase):
+    def test_schema_accepts_parameters(self):
+        data = APPLY_PARAMETERS_SCHEMA({"parameters": [{"index": "47", "value": 700, "type": "normalized"}]})
+
+        self.assertEqual([{"index": 47, "value": "700", "type": "normalized"}], data["parameters"])
+        self.assertFalse(data["rollback"])
+
+    def test_schema_requires_scene_or_parameters(self):
+        with self.assertRaises(vol.Invalid):
+            APPLY_PARAMETERS_SCHEMA({})
+
+        with self.assertRaises(vol.Invalid):
+            APPLY_PARAMETERS_SCHEMA({"scene": "Event mode", "parameters": [{"index": 47, "value": 0}]})
+
+    def test_result_as_dict(self):
+        write = ParameterWrite(ParameterValueType.RAW, "MTX:Index_99", "0")
+        result = ParameterWriteResult(write, error=ResponseError("ERROR set UnknownAddress"))
+
+        self.assertEqual(
+            {
+                "parameter": "MTX:Index_99",
+                "type": "raw",
+                "value": "0",
+                "success": False,
+                "error": "ERROR set UnknownAddress",
+                "rolled_back": False,
+            },
+            result_as_dict(result),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import unittest
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.yamaha_dsp import create_dsp_configuration
+from custom_components.yamaha_dsp.media_player import SpeakerGroupEntity, scale_member_volumes
+from custom_components.yamaha_dsp.yamaha.batch import ParameterWriteResult
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.fader import FADER_0DB, FADER_10DB
+
+OPTIONS = {
+    "default_speaker_sources": ["Spotify"],
+    "speaker_configuration": [
+        '{"name": "Kitchen", "index_source": 33, "index_volume": 47, "index_mute": 48}',
+        '{"name": "Bar", "index_source": 33, "index_volume": 49, "index_mute": 50}',
+        '{"name": "Terrace", "index_source": 33, "index_volume": 51, "index_mute": 52}',
+    ],
+    "speaker_group_configuration": ['{"name": "Downstairs", "speakers": ["Kitchen", "Bar", "Terrace"]}'],
+}
+
+
+def db(volume: int) -> float | None:
+    return FADER_10DB.db_from_normalized(volume)
+
+
+def volume(level_db: float) -> int:
+    return FADER_10DB.normalized_from_db(level_db)
+
+
+FADERS = {"MTX:Index_47": FADER_10DB, "MTX:Index_49": FADER_10DB}
+
+
+class ScaleMemberVolumesTests(unittest.TestCase):
+    def test_offsets_are_kept(self):
+        scaled = scale_member_volumes({"MTX:Index_47": 0, "MTX:Index_49": -10}, -5, FADERS)
+
+        self.assertAlmostEqual(-5, db(scaled["MTX:Index_47"]), delta=0.1)
+        self.assertAlmostEqual(-15, db(scaled["MTX:Index_49"]), delta=0.1)
+
+    def test_silent_members_stay_silent(self):
+        scaled = scale_member_volumes({"MTX:Index_47": 0, "MTX:Index_49": None}, 10, FADERS)
+
+        self.assertEqual({"MTX:Index_47": 1000, "MTX:Index_49": 0}, scaled)
+
+    def test_all_members_are_silenced_with_the_group(self):
+        scaled = scale_member_volumes({"MTX:Index_47": 0, "MTX:Index_49": -10}, None, FADERS)
+
+        self.assertEqual({"MTX:Index_47": 0, "MTX:Index_49": 0}, scaled)
+
+    def test_quiet_members_are_not_silenced(self):
+        scaled = scale_member_volumes({"MTX:Index_47": 0, "MTX:Index_49": -100}, db(50), FADERS)
+
+        self.assertIsNotNone(db(scaled["MTX:Index_49"]))
+
+    def test_members_with_different_faders_are_scaled_in_db(self):
+        scaled = scale_member_volumes(
+            {"MTX:Index_47": 0, "MTX:Index_49": -10}, -5, FADERS | {"MTX:Index_49": FADER_0DB}
+        )
+
+        self.assertAlmostEqual(-5, db(scaled["MTX:Index_47"]), delta=0.1)
+        self.assertAlmostEqual(-15, FADER_0DB.db_from_normalized(scaled["MTX:Index_49"]), delta=0.1)
+
+
+class SpeakerGroupEntityTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.device = AsyncMock()
+        self.device.cancel_fade = MagicMock()
+        self.device.set_parameters.side_effect = lambda writes, coalesce: [
+            ParameterWriteResult(write, SimpleNamespace(value=write.value)) for write in writes
+        ]
+        self.coordinator = SimpleNamespace(
+            device=self.device,
+            data={
+                (ParameterValueType.NORMALIZED, "MTX:Index_47"): str(volume(0)),
+                (ParameterValueType.NORMALIZED, "MTX:Index_49"): str(volume(-10)),
+                (ParameterValueType.NORMALIZED, "MTX:Index_51"): str(volume(-10)),
+                (ParameterValueType.RAW, "MTX:Index_48"): "0",
+                (ParameterValueType.RAW, "MTX:Index_50"): "0",
+                (ParameterValueType.RAW, "MTX:Index_52"): "1",
+            },
+        )
+        config = create_dsp_configuration(OPTIONS).speaker_groups[0]
+        self.entity = SpeakerGroupEntity(config, self.coordinator, SimpleNamespace())
+        self.entity._apply_coordinator_data()
+
+    def written(self) -> dict[str, str]:
+        writes = self.device.set_parameters.await_args.args[0]
+
+        return {write.parameter: write.value for write in writes}
+
+    def report(self, volumes: dict[str, str]):
+        # The device confirms the values, like the parameter cache would
+        for parameter, value in volumes.items():
+            self.entity._set_member_volume_from_value(parameter, value)
+
+    async def set_volume(self, level_db: float | None) -> dict[str, str]:
+        await self.entity.async_set_volume_level(FADER_10DB.normalized_from_db(level_db) / 1000)
+        written = self.written()
+        self.report(written)
+
+        return written
+
+    async def test_state_follows_members(self):
+        self.assertEqual(volume(0) / 1000, self.entity.volume_level)
+        # One of the members isn't muted
+        self.assertFalse(self.entity.is_volume_muted)
+
+    async def test_volume_is_written_to_all_members_in_one_batch(self):
+        await self.entity.async_set_volume_level(volume(-5) / 1000)
+
+        self.device.set_parameters.assert_awaited_once()
+        self.assertTrue(self.device.set_parameters.await_args.kwargs["coalesce"])
+        written = self.written()
+        self.assertAlmostEqual(-5, db(int(written["MTX:Index_47"])), delta=0.1)
+        self.assertAlmostEqual(-15, db(int(written["MTX:Index_49"])), delta=0.1)
+        self.assertAlmostEqual(-15, db(int(written["MTX:Index_51"])), delta=0.1)
+
+    async def test_balance_is_kept_when_the_group_is_turned_all_the_way_down(self):
+        self.assertEqual({"MTX:Index_47": "0", "MTX:Index_49": "0", "MTX:Index_51": "0"}, await self.set_volume(None))
+        self.assertIsNone(self.entity.extra_state_attributes["volume_db"])
+
+        written = await self.set_volume(-5)
+
+        self.assertAlmostEqual(-5, db(int(written["MTX:Index_47"])), delta=0.1)
+        self.assertAlmostEqual(-15, db(int(written["MTX:Index_49"])), delta=0.1)
+
+    async def test_balance_is_kept_when_quiet_members_hit_the_quietest_step(self):
+        minimum_db = FADER_10DB.minimum_raw / 100
+        written = await self.set_volume(minimum_db + 5)
+        self.assertEqual(written["MTX:Index_49"], str(FADER_10DB.normalized_from_db(minimum_db)))
+
+        written = await self.set_volume(0)
+
+        self.assertAlmostEqual(0, db(int(written["MTX:Index_47"])), delta=0.1)
+        self.assertAlmostEqual(-10, db(int(written["MTX:Index_49"])), delta=0.1)
+
+    async def test_members_changed_on_their_own_change_the_balance(self):
+        self.report({"MTX:Index_49": str(volume(-20))})
+
+        written = await self.set_volume(-5)
+
+        self.assertAlmostEqual(-25, db(int(written["MTX:Index_49"])), delta=0.1)
+        self.assertAlmostEqual(-15, db(int(written["MTX:Index_51"])), delta=0.1)
+
+    async def test_members_turned_up_above_the_group_raise_it(self):
+        self.report({"MTX:Index_49": str(volume(5))})
+
+        self.assertAlmostEqual(5, self.entity.extra_state_attributes["volume_db"], delta=0.1)
+        written = await self.set_volume(0)
+        self.assertAlmostEqual(-5, db(int(written["MTX:Index_47"])), delta=0.1)
+
+    async def test_all_members_follow_when_none_is_audible(self):
+        self.report({"MTX:Index_47": "0", "MTX:Index_49": "0", "MTX:Index_51": "0"})
+
+        self.assertEqual(
+            {"MTX:Index_47": "500", "MTX:Index_49": "500", "MTX:Index_51": "500"}, await self.set_volume(db(500))
+        )
+
+    async def test_fade_steps_do_not_change_the_balance(self):
+        async def fade_parameters(parameters, target, duration, curve):
+            self.report({parameters[0]: str(target // 2)})
+            self.report({parameters[0]: str(target)})
+
+        self.device.fade_parameters.side_effect = fade_parameters
+        await self.entity.async_fade_volume(volume(-5) / 1000, 1)
+
+        written = await self.set_volume(0)
+        self.assertAlmostEqual(-10, db(int(written["MTX:Index_49"])), delta=0.1)
+
+    async def test_failed_fade_is_reported(self):
+        self.device.fade_parameters.side_effect = RuntimeError("Not connected")
+
+        with self.assertRaisesRegex(HomeAssistantError, "Unable to fade Downstairs speaker group: Not connected"):
+            await self.entity.async_fade_volume(0.5, 1)
+
+    async def test_mute_is_written_to_all_members(self):
+        await self.entity.async_mute_volume(True)
+
+        self.assertEqual({"MTX:Index_48": "0", "MTX:Index_50": "0", "MTX:Index_52": "0"}, self.written())
+
+    async def test_failed_members_are_reported(self):
+        self.device.set_parameters.side_effect = lambda writes, coalesce: [
+            ParameterWriteResult(write, error=RuntimeError("Command timed out")) for write in writes
+        ]
+
+        with self.assertRaisesRegex(HomeAssistantError, "Unable to set 3 of 3"):
+            await self.entity.async_mute_volume(False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.yamaha_dsp.storage import YamahaDspStore
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.device import ProductInformation
+
+PRODUCT_INFORMATION = ProductInformation("3.1.0", "MTX:4.0.0", "4.0.0", "MRX7-D", "ABC123", "001", "Cafe and lobby")
+
+
+class YamahaDspStoreTest(unittest.IsolatedAsyncioTestCase):
+    def create_store(self, stored_data) -> tuple[YamahaDspStore, MagicMock]:
+        with patch("custom_components.yamaha_dsp.storage.Store") as store_class:
+            store = YamahaDspStore(MagicMock(), "entry_id")
+
+        ha_store = store_class.return_value
+        ha_store.async_load = AsyncMock(return_value=stored_data)
+
+        return store, ha_store
+
+    async def test_round_trip(self):
+        store, ha_store = self.create_store(None)
+        self.assertIsNone((await store.async_load()).product_information)
+
+        store.async_save_product_information(PRODUCT_INFORMATION)
+        store.async_save_parameters({(ParameterValueType.NORMALIZED, "MTX:Index_47"): "700"})
+        data_to_save = ha_store.async_delay_save.call_args.args[0]()
+
+        store, _ = self.create_store(data_to_save)
+        stored_state = await store.async_load()
+
+        self.assertEqual(PRODUCT_INFORMATION, stored_state.product_information)
+        self.assertEqual({(ParameterValueType.NORMALIZED, "MTX:Index_47"): "700"}, stored_state.parameters)
+
+    async def test_snapshots_are_stored(self):
+        store, ha_store = self.create_store(None)
+        await store.async_load()
+
+        store.async_save_snapshot("Before event", {"MTX:Index_47": "-1200", "MTX:Index_48": "1"})
+        data_to_save = ha_store.async_delay_save.call_args.args[0]()
+
+        store, ha_store = self.create_store(data_to_save)
+        stored_state = await store.async_load()
+        self.assertEqual({"Before event": {"MTX:Index_47": "-1200", "MTX:Index_48": "1"}}, stored_state.snapshots)
+
+        self.assertTrue(store.async_delete_snapshot("Before event"))
+        self.assertFalse(store.async_delete_snapshot("Before event"))
+        self.assertEqual({}, ha_store.async_delay_save.call_args.args[0]()["snapshots"])
+
+    async def test_unchanged_parameters_are_not_saved(self):
+        store, ha_store = self.create_store({"parameters": [["RAW", "MTX:Index_48", "1"]]})
+        await store.async_load()
+
+        store.async_save_parameters({(ParameterValueType.RAW, "MTX:Index_48"): "1"})
+
+        ha_store.async_delay_save.assert_not_called()
+
+    async def test_invalid_stored_state_is_ignored(self):
+        store, _ = self.create_store({"parameters": [["BOGUS", "MTX:Index_48", "1"]]})
+
+        stored_state = await store.async_load()
+
+        self.assertIsNone(stored_state.product_information)
+        self.assertEqual({}, stored_state.parameters)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 
 from custom_components.yamaha_dsp import EntityType, create_dsp_configuration, create_unique_id
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.fader import FADER_0DB, FADER_10DB
 
 
 class UtilsTests(unittest.TestCase):
@@ -55,6 +57,102 @@ class UtilsTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             create_dsp_configuration(options)
 
+    def test_scene_configuration_parsing(self):
+        options = {
+            "scene_configuration": [
+                """
+                {
+                  "name": "Event mode",
+                  "parameters": [
+                    { "index": 47, "value": 700, "type": "normalized" },
+                    { "index": 48, "value": 0 }
+                  ]
+                }
+                """
+            ]
+        }
+        config = create_dsp_configuration(options)
+
+        scene = config.scenes[0]
+        self.assertEqual("Event mode", scene.name)
+        self.assertEqual([47, 48], [parameter.index for parameter in scene.parameters])
+        self.assertEqual(["700", "0"], [parameter.value for parameter in scene.parameters])
+        self.assertEqual(
+            [ParameterValueType.NORMALIZED, ParameterValueType.RAW],
+            [parameter.value_type for parameter in scene.parameters],
+        )
+
+    def test_scene_configuration_rejects_invalid_type(self):
+        options = {
+            "scene_configuration": ['{"name": "Event mode", "parameters": [{"index": 47, "value": 1, "type": "dB"}]}']
+        }
+
+        with self.assertRaises(ValueError):
+            create_dsp_configuration(options)
+
+    def test_speaker_group_configuration_parsing(self):
+        options = {
+            "default_speaker_sources": ["Spotify"],
+            "speaker_configuration": [
+                '{"name": "Kitchen", "index_source": 33, "index_volume": 47, "index_mute": 48}',
+                '{"name": "Bar", "index_source": 33, "index_volume": 49, "index_mute": 50}',
+            ],
+            "speaker_group_configuration": ['{"name": "Downstairs", "speakers": ["Kitchen", "Bar"]}'],
+        }
+
+        group = create_dsp_configuration(options).speaker_groups[0]
+
+        self.assertEqual("Downstairs", group.name)
+        self.assertEqual([47, 49], [speaker.index_volume for speaker in group.speakers])
+
+    def test_fader_configuration_parsing(self):
+        options = {
+            "default_speaker_sources": ["Spotify"],
+            "speaker_configuration": [
+                '{"name": "Kitchen", "index_source": 33, "index_volume": 47, "index_mute": 48, "fader": "0db"}',
+                '{"name": "Bar", "index_source": 33, "index_volume": 49, "index_mute": 50}',
+            ],
+            "source_configuration": ['{"name": "Mixer", "index_volume": 11, "index_mute": 12, "fader": "0dB"}'],
+        }
+
+        config = create_dsp_configuration(options)
+
+        self.assertEqual([FADER_0DB, FADER_10DB], [speaker.fader for speaker in config.speakers])
+        self.assertEqual(FADER_0DB, config.sources[0].fader)
+
+        options["source_configuration"] = ['{"name": "Mixer", "index_volume": 11, "index_mute": 12, "fader": "6db"}']
+        with self.assertRaisesRegex(ValueError, "Unknown fader '6db'"):
+            create_dsp_configuration(options)
+
+    def test_speaker_group_configuration_rejects_unknown_speakers(self):
+        options = {"speaker_group_configuration": ['{"name": "Downstairs", "speakers": ["Kitchen"]}']}
+
+        with self.assertRaises(ValueError):
+            create_dsp_configuration(options)
+
+    def test_meter_configuration_parsing(self):
+        options = {
+            "meter_configuration": [
+                '{"name": "Lobby", "index": 120, "channels": [1, 2], "signal_threshold": -50}',
+                '{"name": "Bar", "index": 121}',
+            ],
+            "meter_update_interval": 2.0,
+        }
+
+        config = create_dsp_configuration(options)
+
+        self.assertEqual([1, 2], config.meters[0].channels)
+        self.assertEqual(-50, config.meters[0].signal_threshold)
+        self.assertEqual(list(range(1, 9)), config.meters[1].channels)
+        self.assertEqual(-60, config.meters[1].signal_threshold)
+        self.assertEqual(2.0, config.meter_update_interval)
+
+    def test_meter_configuration_rejects_invalid_channels(self):
+        options = {"meter_configuration": ['{"name": "Lobby", "index": 120, "channels": [0, 9]}']}
+
+        with self.assertRaises(ValueError):
+            create_dsp_configuration(options)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,300 @@
+"""
+An in-memory stand-in for an MRX7-D that speaks enough of the Remote Control Protocol to exercise
+YamahaDspDevice without hardware. Latency, jitter, dropped replies and connection resets can be injected
+to reproduce network problems. Run it directly to get a server you can point the integration at:
+
+    python -m tests.yamaha.fake_server --port 49280 --latency 0.005 --jitter 0.002
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+
+from dataclasses import dataclass, field
+
+from custom_components.yamaha_dsp.yamaha.fader import FADER_10DB, RAW_MINUS_INFINITY
+
+logger = logging.getLogger(__name__)
+
+# (address, x, y)
+ParameterKey = tuple[str, str, str]
+
+NORMALIZED_RESOLUTION = 1000
+
+
+@dataclass
+class FakeParameter:
+    minimum: int
+    maximum: int
+    value: int
+    # Raw values of level parameters are in 1/100 dB
+    divisor: int = 1
+
+    @property
+    def text(self) -> str:
+        return str(self.value) if self.divisor == 1 else f"{self.value / self.divisor:.2f}"
+
+    @property
+    def normalized(self) -> int:
+        return round((self.value - self.minimum) * NORMALIZED_RESOLUTION / (self.maximum - self.minimum))
+
+    def set_raw(self, value: int) -> bool:
+        """Sets the value, clamped to the parameter's range. Returns True if the value had to be clamped."""
+        self.value = min(max(value, self.minimum), self.maximum)
+        return self.value != value
+
+    def set_normalized(self, value: int) -> bool:
+        clamped = min(max(value, 0), NORMALIZED_RESOLUTION)
+        self.value = self.minimum + round(clamped * (self.maximum - self.minimum) / NORMALIZED_RESOLUTION)
+        return clamped != value
+
+
+class FakeFader(FakeParameter):
+    # Levels aren't linear, normalized values follow the fader table of the specification
+    def __init__(self, value: int):
+        super().__init__(RAW_MINUS_INFINITY, FADER_10DB.maximum_raw, value, divisor=100)
+
+    @property
+    def text(self) -> str:
+        return "-INFINITY" if self.value == RAW_MINUS_INFINITY else super().text
+
+    @property
+    def normalized(self) -> int:
+        return FADER_10DB.normalized_from_raw(self.value)
+
+    def set_normalized(self, value: int) -> bool:
+        clamped = min(max(value, 0), NORMALIZED_RESOLUTION)
+        self.value = FADER_10DB.raw_from_normalized(clamped)
+        return clamped != value
+
+
+@dataclass
+class FakeProductInformation:
+    protocolver: str = "3.1.0"
+    paramsetver: str = "MTX:4.0.0"
+    version: str = "4.0.0"
+    productname: str = "MRX7-D"
+    serialno: str = "FAKE0001"
+    deviceid: str = "001"
+    devicename: str = "FakeMRX7-D"
+
+
+@dataclass
+class FakeConnection:
+    writer: asyncio.StreamWriter
+    # Replies waiting to be written, as (due time, line). They are written in order, like the real device does.
+    replies: asyncio.Queue[tuple[float, str]] = field(default_factory=asyncio.Queue)
+    handshake_done: bool = False
+    # Meters the client has requested, as (address, meter type)
+    meters: set[tuple[str, str]] = field(default_factory=set)
+
+
+class FakeRcpServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        reset_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.host = host
+        self.port = port
+        # Seconds added to every reply, plus a random +/- jitter
+        self.latency = latency
+        self.jitter = jitter
+        # Probability that a command gets no reply at all, or that the connection is reset instead
+        self.drop_rate = drop_rate
+        self.reset_rate = reset_rate
+        self.product_information = FakeProductInformation()
+        self.parameters: dict[ParameterKey, FakeParameter] = {}
+        self.connections: list[FakeConnection] = []
+        # Every command received over any connection, in order
+        self.received_commands: list[str] = []
+        self._random = random.Random(seed)
+        self._server: asyncio.Server | None = None
+
+    def add_parameter(
+        self, address: str, minimum: int = 0, maximum: int = 1, value: int = 0, divisor: int = 1, x="0", y="0"
+    ) -> FakeParameter:
+        parameter = FakeParameter(minimum, maximum, value, divisor)
+        self.parameters[(address, x, y)] = parameter
+
+        return parameter
+
+    def add_fader(self, address: str, value: int = 0, x="0", y="0") -> FakeParameter:
+        parameter = FakeFader(value)
+        self.parameters[(address, x, y)] = parameter
+
+        return parameter
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Fake RCP server listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        self.reset_connections()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def reset_connections(self):
+        """Drops every client connection without a proper close, like a power-cycled device or a cut cable."""
+        for connection in list(self.connections):
+            connection.writer.transport.abort()
+
+    def change_parameter(self, address: str, value: int, x="0", y="0"):
+        """Changes a parameter as if from the front panel or another controller and notifies every client."""
+        parameter = self.parameters[(address, x, y)]
+        parameter.set_raw(value)
+        self._notify(None, address, x, y, parameter)
+
+    def send_meter(self, address: str, values: list[int], meter_type: str = "level"):
+        """Sends meter values, one per channel, to every client that has requested the meter."""
+        line = f"NOTIFY mtr {address} {meter_type} {' '.join(f'{value:02X}' for value in values)}"
+        for connection in self.connections:
+            if (address, meter_type) in connection.meters:
+                self._queue_reply(connection, line)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connection = FakeConnection(writer)
+        self.connections.append(connection)
+        reply_writer = asyncio.create_task(self._write_replies(connection))
+
+        try:
+            while line := await reader.readline():
+                command = line.decode().strip()
+                # A bare line feed is a valid heartbeat, it's not answered
+                if not command:
+                    continue
+
+                self.received_commands.append(command)
+
+                if self._random.random() < self.reset_rate:
+                    logger.info(f"Resetting connection on {command}")
+                    writer.transport.abort()
+                    break
+
+                reply = self._handle_command(connection, command)
+
+                if self._random.random() < self.drop_rate:
+                    logger.info(f"Dropping reply to {command}")
+                    continue
+
+                self._queue_reply(connection, reply)
+        except ConnectionError:
+            pass
+        finally:
+            reply_writer.cancel()
+            self.connections.remove(connection)
+            writer.close()
+
+    def _queue_reply(self, connection: FakeConnection, reply: str):
+        delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        connection.replies.put_nowait((asyncio.get_running_loop().time() + delay, reply))
+
+    async def _write_replies(self, connection: FakeConnection):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            due, reply = await connection.replies.get()
+            if (delay := due - loop.time()) > 0:
+                await asyncio.sleep(delay)
+
+            connection.writer.write(f"{reply}\n".encode())
+            await connection.writer.drain()
+
+    def _handle_command(self, connection: FakeConnection, command: str) -> str:
+        options = command.split(" ")
+
+        match options:
+            case ["devstatus", "runmode"]:
+                connection.handshake_done = True
+                return 'OK devstatus runmode "normal"'
+            case ["devinfo", name] if hasattr(self.product_information, name):
+                return f'OK devinfo {name} "{getattr(self.product_information, name)}"'
+            case ["scpmode", "keepalive", interval]:
+                return f"OK scpmode keepalive {interval}"
+            case ["mtrstart", address, meter_type, _interval]:
+                connection.meters.add((address, meter_type))
+                return f"OK mtrstart {address} {meter_type}"
+            case ["mtrstop", address, meter_type]:
+                connection.meters.discard((address, meter_type))
+                return f"OK mtrstop {address} {meter_type}"
+            case ["get" | "getn", address, x, y]:
+                return self._handle_get(options[0], address, x, y)
+            case ["set" | "setn", address, x, y, value]:
+                return self._handle_set(connection, options[0], address, x, y, value)
+            case ["get" | "getn" | "set" | "setn", *_]:
+                return f"ERROR {options[0]} WrongFormat"
+            case _:
+                return f"ERROR {options[0]} UnknownCommand"
+
+    def _handle_get(self, command: str, address: str, x: str, y: str) -> str:
+        parameter = self.parameters.get((address, x, y))
+        if parameter is None:
+            return f"ERROR {command} UnknownAddress"
+
+        value = parameter.value if command == "get" else parameter.normalized
+
+        return f"OK {command} {address} {x} {y} {value}"
+
+    def _handle_set(self, connection: FakeConnection, command: str, address: str, x: str, y: str, value: str) -> str:
+        parameter = self.parameters.get((address, x, y))
+        if parameter is None:
+            return f"ERROR {command} UnknownAddress"
+
+        try:
+            clamped = parameter.set_raw(int(value)) if command == "set" else parameter.set_normalized(int(value))
+        except ValueError:
+            return f"ERROR {command} InvalidArgument"
+
+        # The client that made the change gets the reply, everyone else gets notified
+        self._notify(connection, address, x, y, parameter)
+
+        status = "OKm" if clamped else "OK"
+        value = parameter.value if command == "set" else parameter.normalized
+
+        return f'{status} {command} {address} {x} {y} {value} "{parameter.text}"'
+
+    def _notify(self, origin: FakeConnection | None, address: str, x: str, y: str, parameter: FakeParameter):
+        for connection in self.connections:
+            if connection is not origin:
+                self._queue_reply(connection, f'NOTIFY set {address} {x} {y} {parameter.value} "{parameter.text}"')
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Fake Yamaha DSP speaking the Remote Control Protocol")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=49280)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every reply")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +/- seconds added to the latency")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probability of not replying to a command")
+    parser.add_argument("--reset-rate", type=float, default=0.0, help="probability of resetting the connection")
+    parser.add_argument("--faders", type=int, default=100, help="number of level parameters, from MTX:Index_1")
+    parser.add_argument("--notify-interval", type=float, help="seconds between random front panel changes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    server = FakeRcpServer(args.host, args.port, args.latency, args.jitter, args.drop_rate, args.reset_rate)
+    for index in range(1, args.faders + 1):
+        server.add_fader(f"MTX:Index_{index}", value=-2000)
+
+    await server.start()
+
+    if args.notify_interval is None:
+        await asyncio.Event().wait()
+
+    while True:
+        await asyncio.sleep(args.notify_interval)
+        address = f"MTX:Index_{random.randint(1, args.faders)}"
+        server.change_parameter(address, random.randint(-13800, 1000))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
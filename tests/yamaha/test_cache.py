@@ -0,0 +1,76 @@
+import unittest
+
+from unittest.mock import MagicMock
+
+from custom_components.yamaha_dsp.yamaha.cache import ParameterCache, ParameterState
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+
+
+class ParameterCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ParameterCache()
+        self.key = ("MTX:Index_47", "0", "0")
+
+    def test_update_notifies_subscribers(self):
+        callback = MagicMock()
+        self.cache.subscribe("MTX:Index_47", callback)
+
+        self.cache.update(self.key, ParameterValueType.RAW, "-1200", "-12.00")
+
+        callback.assert_called_once_with(self.key, ParameterState(raw="-1200", text="-12.00"))
+        self.assertEqual("-1200", self.cache.get("MTX:Index_47").raw)
+
+    def test_update_without_change_does_not_notify(self):
+        callback = MagicMock()
+        self.cache.update(self.key, ParameterValueType.NORMALIZED, "700")
+        self.cache.subscribe("MTX:Index_47", callback)
+
+        self.cache.update(self.key, ParameterValueType.NORMALIZED, "700")
+
+        callback.assert_not_called()
+
+    def test_changed_raw_value_invalidates_normalized_value(self):
+        self.cache.update(self.key, ParameterValueType.NORMALIZED, "700")
+        self.cache.update(self.key, ParameterValueType.RAW, "-1200")
+        self.assertEqual(ParameterState(raw="-1200"), self.cache.get("MTX:Index_47"))
+
+        self.cache.update(self.key, ParameterValueType.RAW, "-1000")
+        self.assertEqual(ParameterState(raw="-1000"), self.cache.get("MTX:Index_47"))
+
+    def test_first_raw_value_invalidates_polled_normalized_value(self):
+        # The coordinator polled the level normalized, then the fader was moved on a panel
+        self.cache.update(self.key, ParameterValueType.NORMALIZED, "700")
+
+        self.cache.update(self.key, ParameterValueType.RAW, "-1000", "-10.00")
+
+        self.assertEqual(ParameterState(raw="-1000", text="-10.00"), self.cache.get("MTX:Index_47"))
+
+    def test_first_normalized_value_invalidates_raw_value(self):
+        self.cache.update(self.key, ParameterValueType.RAW, "-1200")
+
+        self.cache.update(self.key, ParameterValueType.NORMALIZED, "700")
+
+        self.assertEqual(ParameterState(normalized="700"), self.cache.get("MTX:Index_47"))
+
+    def test_unsubscribe(self):
+        callback = MagicMock()
+        unsubscribe = self.cache.subscribe("MTX:Index_47", callback)
+        unsubscribe()
+
+        self.cache.update(self.key, ParameterValueType.RAW, "1")
+
+        callback.assert_not_called()
+
+    def test_invalidate_notifies_subscribers_with_empty_state(self):
+        callback = MagicMock()
+        self.cache.update(self.key, ParameterValueType.RAW, "1")
+        self.cache.subscribe("MTX:Index_47", callback)
+
+        self.cache.invalidate()
+
+        callback.assert_called_once_with(self.key, ParameterState())
+        self.assertIsNone(self.cache.get("MTX:Index_47"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+
+from custom_components.yamaha_dsp.yamaha.coalescer import WriteCoalescer
+from custom_components.yamaha_dsp.yamaha.scheduler import CommandPriority
+
+
+class WriteCoalescerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.sent_commands: list[str] = []
+        self.sent_priorities: list[CommandPriority] = []
+        self.release = asyncio.Event()
+
+        async def run_command(command: str, priority: CommandPriority) -> str:
+            self.sent_commands.append(command)
+            self.sent_priorities.append(priority)
+            await self.release.wait()
+            return f"OK {command}"
+
+        self.coalescer = WriteCoalescer(run_command)
+        self.key = ("MTX:Index_47", "0", "0")
+
+    async def test_only_latest_queued_value_is_sent(self):
+        first = asyncio.create_task(
+            self.coalescer.write(self.key, "setn MTX:Index_47 0 0 100", CommandPriority.INTERACTIVE)
+        )
+        await asyncio.sleep(0)
+        second = asyncio.create_task(
+            self.coalescer.write(self.key, "setn MTX:Index_47 0 0 200", CommandPriority.INTERACTIVE)
+        )
+        third = asyncio.create_task(
+            self.coalescer.write(self.key, "setn MTX:Index_47 0 0 300", CommandPriority.INTERACTIVE)
+        )
+        await asyncio.sleep(0)
+
+        self.release.set()
+        results = await asyncio.gather(first, second, third)
+
+        self.assertEqual(["setn MTX:Index_47 0 0 100", "setn MTX:Index_47 0 0 300"], self.sent_commands)
+        self.assertEqual("OK setn MTX:Index_47 0 0 100", results[0])
+        # Both replaced writes get the response of the write that replaced them
+        self.assertEqual("OK setn MTX:Index_47 0 0 300", results[1])
+        self.assertEqual("OK setn MTX:Index_47 0 0 300", results[2])
+
+    async def test_different_parameters_are_not_coalesced(self):
+        self.release.set()
+
+        await asyncio.gather(
+            self.coalescer.write(self.key, "setn MTX:Index_47 0 0 100", CommandPriority.INTERACTIVE),
+            self.coalescer.write(("MTX:Index_49", "0", "0"), "setn MTX:Index_49 0 0 200", CommandPriority.INTERACTIVE),
+        )
+
+        self.assertEqual(["setn MTX:Index_47 0 0 100", "setn MTX:Index_49 0 0 200"], self.sent_commands)
+
+    async def test_replaced_write_keeps_most_urgent_priority(self):
+        first = asyncio.create_task(self.coalescer.write(self.key, "setn MTX:Index_47 0 0 100", CommandPriority.STATE))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(
+            self.coalescer.write(self.key, "setn MTX:Index_47 0 0 200", CommandPriority.INTERACTIVE)
+        )
+        third = asyncio.create_task(self.coalescer.write(self.key, "setn MTX:Index_47 0 0 300", CommandPriority.STATE))
+        await asyncio.sleep(0)
+
+        self.release.set()
+        await asyncio.gather(first, second, third)
+
+        self.assertEqual([CommandPriority.STATE, CommandPriority.INTERACTIVE], self.sent_priorities)
+
+    async def test_errors_are_propagated(self):
+        async def run_command(_command: str, _priority: CommandPriority) -> str:
+            raise RuntimeError("Command timed out")
+
+        coalescer = WriteCoalescer(run_command)
+
+        with self.assertRaises(RuntimeError):
+            await coalescer.write(self.key, "setn MTX:Index_47 0 0 100", CommandPriority.INTERACTIVE)
+
+    async def test_cancelled_writes_do_not_hang(self):
+        first = asyncio.create_task(
+            self.coalescer.write(self.key, "setn MTX:Index_47 0 0 100", CommandPriority.INTERACTIVE)
+        )
+        await asyncio.sleep(0)
+        second = asyncio.create_task(
+            self.coalescer.write(self.key, "setn MTX:Index_47 0 0 200", CommandPriority.INTERACTIVE)
+        )
+        await asyncio.sleep(0)
+
+        self.coalescer.cancel_all()
+
+        async with asyncio.timeout(1):
+            results = await asyncio.gather(first, second, return_exceptions=True)
+        self.assertTrue(all(isinstance(result, asyncio.CancelledError) for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
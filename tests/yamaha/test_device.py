@@ -0,0 +1,260 @@
+import asyncio
+import unittest
+
+from custom_components.yamaha_dsp.yamaha.batch import ParameterWrite
+from custom_components.yamaha_dsp.yamaha.command import ParameterValueType
+from custom_components.yamaha_dsp.yamaha.device import RECONNECT_MAX_DELAY, YamahaDspDevice, reconnect_delay
+from custom_components.yamaha_dsp.yamaha.response import ResponseError
+
+from .fake_server import FakeRcpServer
+
+
+async def wait_for(predicate):
+    async with asyncio.timeout(2):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+class YamahaDspDeviceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = FakeRcpServer(seed=1)
+        self.server.add_fader("MTX:Index_47", value=-2000)
+        self.server.add_parameter("MTX:Index_48", value=1)
+        await self.server.start()
+
+        self.device = YamahaDspDevice(self.server.host, self.server.port, timeout=0.5, pipeline_window=8)
+        # Listeners are called once the connection has been fully set up, including clearing the cache
+        self.connection_changes: list[bool] = []
+        self.device.add_connection_listener(self.connection_changes.append)
+        self.device.start()
+        await wait_for(lambda: self.connection_changes)
+
+    async def asyncTearDown(self):
+        await self.device.stop()
+        await self.server.stop()
+
+    async def test_handshake_and_product_information(self):
+        product_information = await self.device.query_product_information()
+
+        self.assertEqual("devstatus runmode", self.server.received_commands[0])
+        self.assertEqual("MRX7-D", product_information.product_name)
+        self.assertEqual("FakeMRX7-D", product_information.device_name)
+
+    async def test_query_and_set_parameters(self):
+        self.assertEqual("-2000", (await self.device.query_parameter_raw("MTX:Index_47")).value)
+
+        response = await self.device.set_parameter_raw("MTX:Index_47", "0", "0", "-1200")
+        self.assertEqual('OK set MTX:Index_47 0 0 -1200 "-12.00"', response.raw_response)
+
+        response = await self.device.set_parameter_normalized("MTX:Index_47", "0", "0", "2000")
+        self.assertEqual('OKm setn MTX:Index_47 0 0 1000 "10.00"', response.raw_response)
+
+    async def test_set_updates_parameter_cache_before_returning(self):
+        updates = []
+        self.device.parameter_cache.subscribe("MTX:Index_47", lambda _key, state: updates.append(state.normalized))
+
+        await self.device.set_parameter_normalized("MTX:Index_47", "0", "0", "2000")
+
+        # The device clamped the value, the cache has the value it accepted
+        self.assertEqual(["1000"], updates)
+        self.assertEqual("10.00", self.device.parameter_cache.get("MTX:Index_47").text)
+        self.assertNotIn("getn MTX:Index_47 0 0", self.server.received_commands)
+
+    async def test_fade_parameters(self):
+        await self.device.fade_parameters(["MTX:Index_47"], 804, 0.2)
+
+        self.assertEqual(804, self.server.parameters[("MTX:Index_47", "0", "0")].normalized)
+        self.assertGreater(sum(command.startswith("setn MTX:Index_47") for command in self.server.received_commands), 1)
+
+    async def test_apply_parameters(self):
+        results = await self.device.apply_parameters(
+            [
+                ParameterWrite(ParameterValueType.NORMALIZED, "MTX:Index_47", "804"),
+                ParameterWrite(ParameterValueType.RAW, "MTX:Index_48", "0"),
+                ParameterWrite(ParameterValueType.RAW, "MTX:Index_99", "0"),
+            ]
+        )
+
+        self.assertEqual([True, True, False], [result.success for result in results])
+        self.assertEqual(0, self.server.parameters[("MTX:Index_48", "0", "0")].value)
+
+    async def test_apply_parameters_rolls_back_on_failure(self):
+        results = await self.device.apply_parameters(
+            [
+                ParameterWrite(ParameterValueType.RAW, "MTX:Index_47", "-1000"),
+                ParameterWrite(ParameterValueType.RAW, "MTX:Index_48", "0"),
+                ParameterWrite(ParameterValueType.RAW, "MTX:Index_99", "0"),
+            ],
+            rollback=True,
+        )
+
+        self.assertEqual([True, True, False], [result.success for result in results])
+        self.assertEqual([True, True, False], [result.rolled_back for result in results])
+        self.assertEqual(-2000, self.server.parameters[("MTX:Index_47", "0", "0")].value)
+        self.assertEqual(1, self.server.parameters[("MTX:Index_48", "0", "0")].value)
+
+    async def test_apply_changed_parameters_skips_unchanged(self):
+        snapshot = await self.device.query_parameters_raw(["MTX:Index_47", "MTX:Index_48", "MTX:Index_99"])
+        self.assertEqual({"MTX:Index_47": "-2000", "MTX:Index_48": "1"}, snapshot)
+
+        await self.device.set_parameter_raw("MTX:Index_48", "0", "0", "0")
+        results = await self.device.apply_changed_parameters(
+            [ParameterWrite(ParameterValueType.RAW, parameter, value) for parameter, value in snapshot.items()]
+        )
+
+        self.assertEqual(["MTX:Index_48"], [result.write.parameter for result in results])
+        self.assertEqual(1, self.server.parameters[("MTX:Index_48", "0", "0")].value)
+        self.assertNotIn("set MTX:Index_47 0 0 -2000", self.server.received_commands)
+
+    async def test_unknown_address_is_an_error(self):
+        with self.assertRaises(ResponseError):
+            await self.device.query_parameter_raw("MTX:Index_99")
+
+    async def test_notify_updates_parameter_cache(self):
+        self.server.change_parameter("MTX:Index_48", 0)
+
+        await wait_for(lambda: self.device.parameter_cache.get("MTX:Index_48") is not None)
+        self.assertEqual("0", self.device.parameter_cache.get("MTX:Index_48").raw)
+
+    async def test_notify_burst_updates_parameter_cache(self):
+        addresses = [f"MTX:Index_{index}" for index in range(100, 400)]
+        for address in addresses:
+            self.server.add_parameter(address, maximum=10)
+
+        # Like a scene recall, the lines arrive in large chunks
+        for address in addresses:
+            self.server.change_parameter(address, 5)
+
+        await wait_for(lambda: self.device.parameter_cache.get(addresses[-1]) is not None)
+        self.assertTrue(all(self.device.parameter_cache.get(address).raw == "5" for address in addresses))
+
+    async def test_parameter_listeners_are_told_about_changes(self):
+        changes = []
+        self.device.add_parameter_listener(lambda address, pushed: changes.append((address, pushed)))
+
+        await self.device.query_parameter_raw("MTX:Index_47")
+        await self.device.set_parameter_raw("MTX:Index_47", "0", "0", "-1200")
+        self.server.change_parameter("MTX:Index_48", 0)
+
+        await wait_for(lambda: len(changes) == 2)
+        self.assertEqual([("MTX:Index_47", False), ("MTX:Index_48", True)], changes)
+
+    async def test_dropped_reply_times_out(self):
+        self.server.drop_rate = 1.0
+
+        with self.assertRaisesRegex(RuntimeError, "timed out"):
+            await self.device.query_parameter_raw("MTX:Index_48")
+
+        # Once a later command has been answered the lost one is forgotten, and the parameter can be queried again
+        self.server.drop_rate = 0.0
+        self.assertEqual("-2000", (await self.device.query_parameter_raw("MTX:Index_47")).value)
+        self.assertEqual("1", (await self.device.query_parameter_raw("MTX:Index_48")).value)
+        self.assertEqual(1, self.device.statistics.commands["get"].timeouts)
+
+    async def test_reconnects_after_connection_reset(self):
+        self.server.latency = 0.2
+        query = asyncio.create_task(self.device.query_parameter_raw("MTX:Index_48"))
+        await asyncio.sleep(0.05)
+
+        self.server.reset_connections()
+
+        with self.assertRaisesRegex(RuntimeError, "reset"):
+            await query
+
+        # The supervisor reconnects in the background
+        self.server.latency = 0.0
+        await wait_for(lambda: self.device.connected)
+        self.assertEqual("1", (await self.device.query_parameter_raw("MTX:Index_48")).value)
+        self.assertEqual(2, self.server.received_commands.count("devstatus runmode"))
+        self.assertEqual(1, self.device.statistics.reconnects)
+
+    async def test_failed_handshake_is_not_counted_as_a_reconnect(self):
+        self.server.drop_rate = 1.0
+        self.server.reset_connections()
+        await wait_for(lambda: self.server.received_commands.count("devstatus runmode") == 2)
+        await wait_for(lambda: not self.device.connected)
+
+        self.assertEqual(0, self.device.statistics.reconnects)
+
+    async def test_error_during_handshake_is_retried(self):
+        handle_command = self.server._handle_command
+        self.server._handle_command = lambda connection, command: (
+            "ERROR devstatus NotReady" if command == "devstatus runmode" else handle_command(connection, command)
+        )
+        self.server.reset_connections()
+        await wait_for(lambda: self.server.received_commands.count("devstatus runmode") == 2)
+
+        self.server._handle_command = handle_command
+        await wait_for(lambda: self.server.received_commands.count("devstatus runmode") == 3)
+        await wait_for(lambda: self.device.connected)
+        self.assertEqual("1", (await self.device.query_parameter_raw("MTX:Index_48")).value)
+
+    async def test_commands_fail_fast_while_disconnected(self):
+        await self.server.stop()
+        await wait_for(lambda: not self.device.connected)
+
+        with self.assertRaisesRegex(RuntimeError, "Not connected"):
+            await self.device.query_parameter_raw("MTX:Index_48")
+
+        self.assertEqual(False, self.connection_changes[-1])
+
+    async def test_meter_subscription(self):
+        frames = []
+        unsubscribe = self.device.subscribe_meter("MTX:Index_2", frames.append, 0.1)
+        await wait_for(lambda: "mtrstart MTX:Index_2 level 100" in self.server.received_commands)
+        await wait_for(lambda: ("MTX:Index_2", "level") in self.server.connections[0].meters)
+
+        self.server.send_meter("MTX:Index_2", [0x71, 0x7F])
+        await wait_for(lambda: frames)
+        self.assertEqual(b"\x71\x7f", frames[0])
+
+        unsubscribe()
+        await wait_for(lambda: "mtrstop MTX:Index_2 level" in self.server.received_commands)
+
+    async def test_meters_are_requested_again_after_reconnecting(self):
+        self.device.subscribe_meter("MTX:Index_2", lambda _frame: None, 0.1)
+        await wait_for(lambda: "mtrstart MTX:Index_2 level 100" in self.server.received_commands)
+
+        self.server.reset_connections()
+        await wait_for(lambda: self.server.received_commands.count("mtrstart MTX:Index_2 level 100") == 2)
+
+
+class KeepaliveTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = FakeRcpServer(seed=1)
+        self.server.add_parameter("MTX:Index_48", value=1)
+        await self.server.start()
+
+        self.device = YamahaDspDevice(self.server.host, self.server.port, timeout=0.2, keepalive_interval=0.1)
+        self.device.start()
+        await wait_for(lambda: self.device.connected)
+
+    async def asyncTearDown(self):
+        await self.device.stop()
+        await self.server.stop()
+
+    async def test_idle_connection_is_probed(self):
+        await asyncio.sleep(0.35)
+
+        self.assertIn("scpmode keepalive 300", self.server.received_commands)
+        self.assertGreaterEqual(self.server.received_commands.count("devstatus runmode"), 3)
+
+    async def test_dead_link_is_detected_and_reconnected(self):
+        self.server.drop_rate = 1.0
+        await wait_for(lambda: not self.device.connected)
+
+        self.server.drop_rate = 0.0
+        await wait_for(lambda: self.device.connected)
+        self.assertEqual("1", (await self.device.query_parameter_raw("MTX:Index_48")).value)
+
+
+class ReconnectDelayTest(unittest.TestCase):
+    def test_backoff_is_exponential_and_capped(self):
+        self.assertLessEqual(reconnect_delay(0), 1)
+        self.assertGreaterEqual(reconnect_delay(3), 4)
+        self.assertLessEqual(reconnect_delay(3), 8)
+        self.assertLessEqual(reconnect_delay(20), RECONNECT_MAX_DELAY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+
+from custom_components.yamaha_dsp.yamaha.fade import FadeEngine
+from custom_components.yamaha_dsp.yamaha.fader import FADER_0DB, FADER_10DB
+
+
+class FadeEngineTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.levels = {"MTX:Index_47": 453, "MTX:Index_49": 677}
+        # Every level change, as (time, parameter, value)
+        self.changes: list[tuple[float, str, int]] = []
+
+        async def get_level(parameter: str) -> int:
+            return self.levels[parameter]
+
+        async def set_level(parameter: str, value: int):
+            self.changes.append((asyncio.get_running_loop().time(), parameter, value))
+            self.levels[parameter] = value
+
+        self.engine = FadeEngine(get_level, set_level)
+
+    async def asyncTearDown(self):
+        self.engine.cancel_all()
+
+    def values(self, parameter: str) -> list[int]:
+        return [value for _, changed_parameter, value in self.changes if changed_parameter == parameter]
+
+    async def test_fade_reaches_target_evenly_in_db(self):
+        await self.engine.fade(["MTX:Index_47"], 804, 0.3)
+
+        values = self.values("MTX:Index_47")
+        self.assertEqual(804, values[-1])
+        self.assertGreater(len(values), 2)
+        # -18 dB to 0 dB, steadily getting louder
+        steps = [
+            FADER_10DB.db_from_normalized(b) - FADER_10DB.db_from_normalized(a)
+            for a, b in zip(values, values[1:], strict=False)
+        ]
+        self.assertTrue(all(step > 0 for step in steps))
+
+    async def test_fade_follows_the_curve_of_the_fader(self):
+        # -30 dB to 0 dB on a fader with a 0 dB maximum, which would be -20 dB to 10 dB with the other curve
+        self.levels["MTX:Index_47"] = FADER_0DB.normalized_from_db(-30)
+        await self.engine.fade(["MTX:Index_47"], 1000, 0.3, FADER_0DB)
+
+        levels_db = [FADER_0DB.db_from_normalized(value) for value in self.values("MTX:Index_47")]
+        self.assertEqual(0, levels_db[-1])
+        self.assertTrue(all(-30 <= level_db <= 0 for level_db in levels_db))
+
+    async def test_zero_duration_sets_target(self):
+        await self.engine.fade(["MTX:Index_47"], 0, 0)
+
+        self.assertEqual([0], self.values("MTX:Index_47"))
+
+    async def test_faders_change_in_the_same_slots(self):
+        await self.engine.fade(["MTX:Index_47", "MTX:Index_49"], 1000, 0.2)
+
+        times_47 = [time for time, parameter, _ in self.changes if parameter == "MTX:Index_47"]
+        times_49 = [time for time, parameter, _ in self.changes if parameter == "MTX:Index_49"]
+        self.assertEqual(len(times_47), len(times_49))
+        self.assertTrue(all(abs(a - b) < 0.01 for a, b in zip(times_47, times_49, strict=True)))
+        self.assertEqual(1000, self.levels["MTX:Index_49"])
+
+    async def test_retarget_continues_from_current_level(self):
+        first = asyncio.create_task(self.engine.fade(["MTX:Index_47"], 1000, 1))
+        await asyncio.sleep(0.2)
+        level = self.levels["MTX:Index_47"]
+
+        await self.engine.fade(["MTX:Index_47"], 0, 0.2)
+        # The first fade is over as soon as it's replaced
+        await asyncio.wait_for(first, 0.1)
+
+        values = self.values("MTX:Index_47")
+        self.assertEqual(0, values[-1])
+        self.assertLess(max(values), level + 50)
+
+    async def test_cancel_leaves_fader_where_it_is(self):
+        fade = asyncio.create_task(self.engine.fade(["MTX:Index_47"], 1000, 1))
+        await asyncio.sleep(0.2)
+
+        self.engine.cancel("MTX:Index_47")
+        await asyncio.wait_for(fade, 0.1)
+        level = self.levels["MTX:Index_47"]
+        await asyncio.sleep(0.1)
+
+        self.assertLess(level, 1000)
+        self.assertEqual(level, self.levels["MTX:Index_47"])
+
+    async def test_errors_stop_the_fade(self):
+        async def set_level(_parameter: str, _value: int):
+            raise RuntimeError("Not connected")
+
+        engine = FadeEngine(lambda _parameter: asyncio.sleep(0, 453), set_level)
+
+        with self.assertRaisesRegex(RuntimeError, "Not connected"):
+            await engine.fade(["MTX:Index_47"], 804, 0.2)
+        self.assertFalse(engine.is_fading("MTX:Index_47"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from custom_components.yamaha_dsp.yamaha.fader import (
+    FADER_0DB,
+    FADER_10DB,
+    RAW_MINUS_INFINITY,
+    TABLE_RESOLUTION,
+    db_from_raw,
+)
+
+
+class FaderCurveTest(unittest.TestCase):
+    def test_table_matches_specification(self):
+        # Samples from the tables in section 6.1 of the protocol specification
+        for curve, position, raw in [
+            (FADER_0DB, 0, RAW_MINUS_INFINITY),
+            (FADER_0DB, 2, -13600),
+            (FADER_0DB, 64, -8750),
+            (FADER_0DB, 256, -4670),
+            (FADER_0DB, 1023, 0),
+            (FADER_10DB, 1, -13800),
+            (FADER_10DB, 16, -9500),
+            (FADER_10DB, 224, -3990),
+            (FADER_10DB, 450, -1865),
+            (FADER_10DB, 1023, 1000),
+        ]:
+            self.assertEqual(raw, curve.raw_from_normalized(position, TABLE_RESOLUTION))
+            self.assertEqual(position, curve.normalized_from_raw(raw, TABLE_RESOLUTION))
+
+    def test_default_resolution_matches_specification(self):
+        # The examples of normalized values for a level parameter in the specification
+        self.assertEqual(0, FADER_10DB.normalized_from_raw(RAW_MINUS_INFINITY))
+        self.assertEqual(453, FADER_10DB.normalized_from_db(-18))
+        self.assertEqual(677, FADER_10DB.normalized_from_db(-6.5))
+        self.assertEqual(804, FADER_10DB.normalized_from_db(0))
+        self.assertEqual(1000, FADER_10DB.normalized_from_db(10))
+
+    def test_db_conversion(self):
+        self.assertIsNone(db_from_raw(RAW_MINUS_INFINITY))
+        self.assertIsNone(FADER_10DB.db_from_normalized(0))
+        self.assertEqual(10.0, FADER_10DB.db_from_normalized(1000))
+        # Between two steps of the table
+        self.assertEqual(-4000, FADER_10DB.raw_from_db(-39.96))
+
+    def test_step_changes_level_in_db(self):
+        self.assertEqual(-17.0, FADER_10DB.db_from_normalized(FADER_10DB.step_normalized(453, 1)))
+        self.assertEqual(1000, FADER_10DB.step_normalized(1000, 1))
+        self.assertEqual(0, FADER_10DB.step_normalized(1, -1))
+
+    def test_step_never_gets_stuck(self):
+        volume = 1000
+        for _ in range(1000):
+            volume = FADER_10DB.step_normalized(volume, -1)
+
+        self.assertEqual(0, volume)
+        self.assertEqual(1, FADER_10DB.step_normalized(0, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
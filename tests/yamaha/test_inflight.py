@@ -0,0 +1,110 @@
+import asyncio
+import unittest
+
+from custom_components.yamaha_dsp.yamaha.inflight import InFlightTable, create_pending_command
+from custom_components.yamaha_dsp.yamaha.response import parse_response
+
+
+class PendingCommandTest(unittest.IsolatedAsyncioTestCase):
+    def create_pending_command(self, command: str):
+        return create_pending_command(command, asyncio.get_running_loop().create_future())
+
+    async def test_matches_command_and_parameter(self):
+        pending = self.create_pending_command("get MTX:Index_47 0 0")
+
+        self.assertTrue(pending.matches(parse_response("OK get MTX:Index_47 0 0 900")))
+        self.assertFalse(pending.matches(parse_response("OK get MTX:Index_48 0 0 1")))
+        self.assertFalse(pending.matches(parse_response("OK get MTX:Index_47 1 0 900")))
+        self.assertFalse(pending.matches(parse_response("OK getn MTX:Index_47 0 0 700")))
+
+    async def test_matches_errors_by_command_name(self):
+        pending = self.create_pending_command("get MTX:Index_47 0 0")
+
+        self.assertTrue(pending.matches(parse_response("ERROR get UnknownAddress")))
+        self.assertFalse(pending.matches(parse_response("ERROR set UnknownAddress")))
+
+    async def test_matches_devinfo_responses(self):
+        pending = self.create_pending_command("devinfo productname")
+
+        self.assertTrue(pending.matches(parse_response('OK devinfo productname "MRX7-D"')))
+        self.assertFalse(pending.matches(parse_response('OK devinfo serialno "ABC123"')))
+
+
+class InFlightTableTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.table = InFlightTable(abandoned_grace_period=5)
+
+    async def test_resolves_out_of_order_responses(self):
+        volume = self.table.register("getn MTX:Index_47 0 0")
+        mute = self.table.register("get MTX:Index_48 0 0")
+
+        self.assertTrue(self.table.resolve(parse_response("OK get MTX:Index_48 0 0 1")))
+        self.assertTrue(self.table.resolve(parse_response("OK getn MTX:Index_47 0 0 700")))
+
+        self.assertEqual("1", mute.future.result().value)
+        self.assertEqual("700", volume.future.result().value)
+        self.assertEqual(0, len(self.table))
+
+    async def test_late_response_to_abandoned_command_is_drained(self):
+        timed_out = self.table.register("getn MTX:Index_47 0 0")
+        self.table.abandon(timed_out)
+        retry = self.table.register("getn MTX:Index_47 0 0")
+
+        # The late response belongs to the abandoned command, not to the retry
+        self.assertTrue(self.table.resolve(parse_response("OK getn MTX:Index_47 0 0 500")))
+        self.assertFalse(retry.future.done())
+
+        self.assertTrue(self.table.resolve(parse_response("OK getn MTX:Index_47 0 0 700")))
+        self.assertEqual("700", retry.future.result().value)
+
+    async def test_pipelined_error_goes_to_the_command_it_answers(self):
+        volume = self.table.register("get MTX:Index_47 0 0")
+        lost = self.table.register("get MTX:Index_48 0 0")
+        self.table.abandon(lost)
+        unknown = self.table.register("get MTX:Index_99 0 0")
+
+        self.assertTrue(self.table.resolve(parse_response("OK get MTX:Index_47 0 0 900")))
+        self.assertTrue(self.table.resolve(parse_response("ERROR get UnknownAddress")))
+
+        self.assertEqual("900", volume.future.result().value)
+        self.assertEqual("UnknownAddress", unknown.future.result().error_code)
+        self.assertEqual(0, len(self.table))
+
+    async def test_late_error_to_abandoned_command_is_drained(self):
+        timed_out = self.table.register("get MTX:Index_99 0 0")
+        self.table.abandon(timed_out)
+        retry = self.table.register("get MTX:Index_99 0 0")
+
+        self.assertTrue(self.table.resolve(parse_response("ERROR get UnknownAddress")))
+        self.assertFalse(retry.future.done())
+
+        self.assertTrue(self.table.resolve(parse_response("ERROR get UnknownAddress")))
+        self.assertTrue(retry.future.done())
+
+    async def test_abandoned_commands_before_a_response_are_dropped(self):
+        lost = self.table.register("get MTX:Index_48 0 0")
+        self.table.abandon(lost)
+        volume = self.table.register("getn MTX:Index_47 0 0")
+
+        self.table.resolve(parse_response("OK getn MTX:Index_47 0 0 700"))
+
+        self.assertTrue(volume.future.done())
+        self.assertEqual(0, len(self.table))
+
+    async def test_unknown_response_is_not_handed_to_anyone(self):
+        pending = self.table.register("getn MTX:Index_47 0 0")
+
+        self.assertFalse(self.table.resolve(parse_response("OK getn MTX:Index_99 0 0 700")))
+        self.assertFalse(pending.future.done())
+
+    async def test_fail_all(self):
+        pending = self.table.register("getn MTX:Index_47 0 0")
+
+        self.table.fail_all(ConnectionAbortedError())
+
+        self.assertIsInstance(pending.future.exception(), ConnectionAbortedError)
+        self.assertEqual(0, len(self.table))
+
+
+if __name__ == "__main__":
+    unittest.main()
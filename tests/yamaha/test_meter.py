@@ -0,0 +1,74 @@
+import unittest
+
+from custom_components.yamaha_dsp.yamaha.meter import (
+    MeterBuffer,
+    MeterSubscriptions,
+    db_from_meter,
+    parse_meter_notify,
+)
+
+
+class MeterTest(unittest.TestCase):
+    def test_parse_meter_notify(self):
+        key, frame = parse_meter_notify("NOTIFY mtr MTX:Index_2 level 71 71 71 71 71 71 69 68")
+
+        self.assertEqual(("MTX:Index_2", "level"), key)
+        self.assertEqual(bytes([0x71] * 6 + [0x69, 0x68]), frame)
+
+    def test_db_from_meter(self):
+        self.assertEqual(-126, db_from_meter(0x00))
+        self.assertEqual(-13, db_from_meter(0x71))
+        self.assertEqual(0, db_from_meter(0x7E))
+        # Over is reported as full scale, the clipping flag tells them apart
+        self.assertEqual(0, db_from_meter(0x7F))
+
+    def test_summary_of_selected_channels(self):
+        buffer = MeterBuffer(10)
+        buffer.append(bytes([0x6E, 0x6E, 0x10, 0x7F]))
+        buffer.append(bytes([0x64, 0x64, 0x10, 0x7F]))
+
+        summary = buffer.summary([1, 2])
+
+        self.assertEqual(-16, summary.peak_db)
+        # The average of the power of -16 dB and -26 dB
+        self.assertAlmostEqual(-18.6, summary.rms_db, places=1)
+        self.assertFalse(summary.clipping)
+        self.assertEqual(2, summary.frames)
+        self.assertTrue(buffer.summary([4]).clipping)
+
+    def test_oldest_frames_are_overwritten(self):
+        buffer = MeterBuffer(3)
+        buffer.append(bytes([0x7E]))
+        for _ in range(3):
+            buffer.append(bytes([0x40]))
+
+        self.assertEqual(3, len(buffer))
+        self.assertEqual(-62, buffer.summary([1]).peak_db)
+
+    def test_empty_buffer_has_no_summary(self):
+        buffer = MeterBuffer(3)
+        buffer.append(bytes([0x40]))
+        buffer.clear()
+
+        self.assertIsNone(buffer.summary([1]))
+
+    def test_subscriptions_use_the_shortest_interval(self):
+        changes = []
+        subscriptions = MeterSubscriptions(lambda: changes.append(True))
+        frames = []
+
+        unsubscribe = subscriptions.subscribe(("MTX:Index_2", "level"), frames.append, 1000)
+        subscriptions.subscribe(("MTX:Index_2", "level"), lambda _frame: None, 100)
+        subscriptions.dispatch("NOTIFY mtr MTX:Index_2 level 7F")
+        subscriptions.dispatch("NOTIFY mtr MTX:Index_3 level 10")
+
+        self.assertEqual({("MTX:Index_2", "level"): 100}, subscriptions.intervals)
+        self.assertEqual([b"\x7f"], frames)
+
+        unsubscribe()
+        self.assertEqual({("MTX:Index_2", "level"): 100}, subscriptions.intervals)
+        self.assertEqual(3, len(changes))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from custom_components.yamaha_dsp.yamaha.reader import LineBuffer
+
+
+class LineBufferTest(unittest.TestCase):
+    def test_splits_chunk_into_lines(self):
+        line_buffer = LineBuffer()
+
+        lines = line_buffer.feed(b'NOTIFY set MTX:Index_47 0 0 -1200 "-12.00"\nOK get MTX:Index_48 0 0 1\n')
+
+        self.assertEqual(['NOTIFY set MTX:Index_47 0 0 -1200 "-12.00"', "OK get MTX:Index_48 0 0 1"], lines)
+
+    def test_partial_lines_are_carried_over(self):
+        line_buffer = LineBuffer()
+
+        self.assertEqual(["OK get MTX:Index_48 0 0 1"], line_buffer.feed(b"OK get MTX:Index_48 0 0 1\nOK get MTX"))
+        self.assertEqual([], line_buffer.feed(b":Index_47 0 0"))
+        self.assertEqual(["OK get MTX:Index_47 0 0 -1200"], line_buffer.feed(b" -1200\n"))
+
+    def test_skips_empty_lines_and_carriage_returns(self):
+        line_buffer = LineBuffer()
+
+        self.assertEqual(["OK get MTX:Index_48 0 0 1"], line_buffer.feed(b"\n\r\nOK get MTX:Index_48 0 0 1\r\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,12 @@
 import unittest
 
-from custom_components.yamaha_dsp.yamaha.response import ErrorResponse, NotifyResponse, OkResponse, parse_response
+from custom_components.yamaha_dsp.yamaha.response import (
+    ErrorResponse,
+    NotifyResponse,
+    OkResponse,
+    parse_response,
+    tokenize,
+)
 
 
 class YamahaResponseTest(unittest.TestCase):
@@ -29,6 +35,25 @@ class YamahaResponseTest(unittest.TestCase):
         self.assertEqual("event", error_response.command_name)
         self.assertEqual("WrongFormat", error_response.error_code)
 
+    def test_parse_quoted_strings_with_spaces(self):
+        response = parse_response('OK devinfo devicename "Cafe and lobby"\n')
+        self.assertEqual("Cafe and lobby", response.value)
+        self.assertEqual(["OK", "devinfo", "devicename", "Cafe and lobby"], response.parsed_response)
+
+        response = parse_response('NOTIFY event MTX:AbsoluteTime "2024/01/02 03:04:05"')
+        self.assertEqual(["NOTIFY", "event", "MTX:AbsoluteTime", "2024/01/02 03:04:05"], response.parsed_response)
+
+    def test_tokenize(self):
+        self.assertEqual(["OK", "get", "MTX:Index_47", "0", "0", "-1200"], tokenize("OK get MTX:Index_47 0 0 -1200"))
+        self.assertEqual(["OK", "set", "a b", "", "c"], tokenize('OK set "a b" "" c'))
+        self.assertEqual(["OK", "name", "unterminated string"], tokenize('OK name "unterminated string'))
+
+    def test_responses_are_slotted(self):
+        response = parse_response('OK set MTX:Index_47 0 0 -1200 "-12.00"')
+
+        self.assertFalse(hasattr(response, "__dict__"))
+        self.assertEqual(parse_response('OK set MTX:Index_47 0 0 -1200 "-12.00"'), response)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+
+from custom_components.yamaha_dsp.yamaha.scheduler import CommandPriority, PriorityWindow
+
+
+class PriorityWindowTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # The order in which the waiters were given a slot
+        self.order: list[CommandPriority] = []
+
+    async def wait_in_order(self, window: PriorityWindow, priorities: list[CommandPriority]) -> list[asyncio.Task]:
+        async def acquire(priority: CommandPriority):
+            await window.acquire(priority)
+            self.order.append(priority)
+            window.release()
+
+        tasks = []
+        for priority in priorities:
+            tasks.append(asyncio.create_task(acquire(priority)))
+            # Make sure the waiters are queued in the given order
+            await asyncio.sleep(0)
+
+        return tasks
+
+    async def test_free_slots_are_used_immediately(self):
+        window = PriorityWindow(2, reserved_interactive=0)
+
+        await window.acquire(CommandPriority.BACKGROUND)
+        await window.acquire(CommandPriority.BACKGROUND)
+
+        self.assertEqual(0, window.waiting)
+
+    async def test_most_important_waiter_goes_first(self):
+        window = PriorityWindow(1)
+        await window.acquire(CommandPriority.BACKGROUND)
+
+        tasks = await self.wait_in_order(
+            window,
+            [
+                CommandPriority.BACKGROUND,
+                CommandPriority.STATE,
+                CommandPriority.INTERACTIVE,
+                CommandPriority.BACKGROUND,
+            ],
+        )
+        window.release()
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(
+            [
+                CommandPriority.INTERACTIVE,
+                CommandPriority.STATE,
+                CommandPriority.BACKGROUND,
+                CommandPriority.BACKGROUND,
+            ],
+            self.order,
+        )
+
+    async def test_interactive_slot_is_reserved(self):
+        window = PriorityWindow(3)
+        await window.acquire(CommandPriority.BACKGROUND)
+        await window.acquire(CommandPriority.BACKGROUND)
+
+        background = asyncio.create_task(window.acquire(CommandPriority.BACKGROUND))
+        await asyncio.sleep(0)
+        self.assertFalse(background.done())
+
+        # The interactive command doesn't have to wait for the polls to complete
+        await asyncio.wait_for(window.acquire(CommandPriority.INTERACTIVE), 0.1)
+
+        background.cancel()
+
+    async def test_waiting_commands_are_promoted(self):
+        window = PriorityWindow(1, aging_interval=0.01)
+        await window.acquire(CommandPriority.INTERACTIVE)
+
+        tasks = await self.wait_in_order(window, [CommandPriority.BACKGROUND])
+        await asyncio.sleep(0.05)
+        tasks += await self.wait_in_order(window, [CommandPriority.STATE])
+        window.release()
+        await asyncio.gather(*tasks)
+
+        # The background command has waited long enough to go before the newer one
+        self.assertEqual([CommandPriority.BACKGROUND, CommandPriority.STATE], self.order)
+
+    async def test_cancelled_waiter_gives_up_its_place(self):
+        window = PriorityWindow(1)
+        await window.acquire(CommandPriority.STATE)
+
+        cancelled = asyncio.create_task(window.acquire(CommandPriority.INTERACTIVE))
+        tasks = await self.wait_in_order(window, [CommandPriority.BACKGROUND])
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        window.release()
+        await asyncio.gather(*tasks)
+
+        self.assertEqual([CommandPriority.BACKGROUND], self.order)
+        self.assertEqual(0, window.waiting)
+
+
+if __name__ == "__main__":
+    unittest.main()
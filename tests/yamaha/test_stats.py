@@ -0,0 +1,40 @@
+import unittest
+
+from custom_components.yamaha_dsp.yamaha.stats import DeviceStatistics, LatencyHistogram
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for latency_ms in [3] * 90 + [40] * 9 + [7000]:
+            histogram.record(latency_ms)
+
+        self.assertEqual(5, histogram.percentile_ms(50))
+        self.assertEqual(50, histogram.percentile_ms(95))
+        self.assertEqual(7000, histogram.percentile_ms(100))
+        self.assertAlmostEqual(76.3, histogram.mean_ms)
+
+    def test_empty_histogram(self):
+        self.assertIsNone(LatencyHistogram().mean_ms)
+        self.assertIsNone(LatencyHistogram().percentile_ms(95))
+
+
+class DeviceStatisticsTest(unittest.TestCase):
+    def test_counters_per_verb(self):
+        statistics = DeviceStatistics()
+        statistics.record_response("get", 4)
+        statistics.record_response("get", 12, error=True)
+        statistics.record_response("setn", 8)
+        statistics.record_timeout("setn")
+        statistics.record_connect()
+        statistics.record_connect()
+
+        self.assertEqual(3, statistics.latency.count)
+        self.assertEqual(1, statistics.errors)
+        self.assertEqual(1, statistics.timeouts)
+        self.assertEqual(1, statistics.reconnects)
+        self.assertEqual(["get", "setn"], list(statistics.as_dict()["commands"]))
+
+
+if __name__ == "__main__":
+    unittest.main()